@@ -1,12 +1,9 @@
 import os
-import re
 import sys
-import string
 import pandas as pd
-import nltk
-from nltk.corpus import stopwords
-nltk.download('stopwords')
-from sklearn.model_selection import train_test_split
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.text_cleaning import clean_in_chunks
+from Sentiment_Analysis.ml.cleaned_text_cache import CleanedTextCache
 from Sentiment_Analysis.logger import logging 
 from Sentiment_Analysis.exception import CustomException
 from Sentiment_Analysis.entity.config_entity import DataTransformationConfig
@@ -17,6 +14,9 @@ class DataTransformation:
     def __init__(self,data_transformation_config: DataTransformationConfig,data_validation_artifacts:DataValidationArtifact):
         self.data_validation_artifacts = data_validation_artifacts
         self.data_transformation_config = data_transformation_config
+        self.text_normalizer = TextNormalizer()
+        self.cached_rows = 0
+        self.cleaned_rows = 0
 
     
 
@@ -44,11 +44,12 @@ class DataTransformation:
 
             raw_data[raw_data[self.data_transformation_config.CLASS]==0][self.data_transformation_config.CLASS]=1
             
-            # replace the value of 0 to 1
-            raw_data[self.data_transformation_config.CLASS].replace({0:1},inplace=True)
+            # replace the value of 0 to 1 (assigned back: with copy-on-write an inplace
+            # replace on the selected column would leave the frame unchanged)
+            raw_data[self.data_transformation_config.CLASS] = raw_data[self.data_transformation_config.CLASS].replace({0:1})
 
             # Let's replace the value of 2 to 0.
-            raw_data[self.data_transformation_config.CLASS].replace({2:0}, inplace = True)
+            raw_data[self.data_transformation_config.CLASS] = raw_data[self.data_transformation_config.CLASS].replace({2:0})
 
             # Let's change the name of the 'class' to label
             raw_data.rename(columns={self.data_transformation_config.CLASS:self.data_transformation_config.LABEL},inplace =True)
@@ -79,23 +80,8 @@ class DataTransformation:
     def concat_data_cleaning(self, words):
 
         try:
-            
             # Let's apply stemming and stopwords on the data
-            stemmer = nltk.SnowballStemmer("english")
-            stopword = set(stopwords.words('english'))
-            words = str(words).lower()
-            words = re.sub(r'\[.*?\]', '', words)
-            words = re.sub(r'https?://\S+|www\.\S+', '', words)
-            words = re.sub(r'<.*?>+', '', words)
-            words = re.sub(r'[%s]' % re.escape(string.punctuation), '', words)
-            words = re.sub(r'\n', '', words)
-            words = re.sub(r'\w*\d\w*', '', words)
-            words = [word for word in words.split(' ') if word not in stopword]
-            words=" ".join(words)
-            words = [stemmer.stem(word) for word in words.split(' ')]
-            words=" ".join(words)
-            
-            return words 
+            return self.text_normalizer.normalize(words)
 
         except Exception as e:
             raise CustomException(e, sys) from e
@@ -103,6 +89,57 @@ class DataTransformation:
 
     
 
+    def clean_tweets(self, tweets) -> list:
+        """
+        concat_data_cleaning over a whole column, reusing the cleaned text of every tweet
+        already seen by an earlier run with the same cleaning logic.
+
+        Sets ``cached_rows`` and ``cleaned_rows`` to how many rows came from the cache and
+        how many had to be cleaned.
+        """
+        tweets = list(tweets)
+        cache_path = self.data_transformation_config.CLEANED_TEXT_CACHE_PATH
+        if not cache_path:
+            self.cached_rows, self.cleaned_rows = 0, len(tweets)
+            return self._clean_uncached(tweets)
+
+        with CleanedTextCache(cache_path, self.text_normalizer.fingerprint) as cache:
+            if cache.stale_rows_dropped:
+                logging.info(f"Cleaning logic changed, dropped {cache.stale_rows_dropped} cached rows")
+            keys = [CleanedTextCache.key(tweet) for tweet in tweets]
+            cleaned_by_key = cache.get_many(set(keys))
+
+            # Every distinct unseen text is cleaned once, however often it repeats
+            unseen = {}
+            for key, tweet in zip(keys, tweets):
+                if key not in cleaned_by_key:
+                    unseen.setdefault(key, tweet)
+            if unseen:
+                cleaned = self._clean_uncached(list(unseen.values()))
+                cache.put_many(zip(unseen, cleaned))
+                cleaned_by_key.update(zip(unseen, cleaned))
+
+        self.cleaned_rows = sum(1 for key in keys if key in unseen)
+        self.cached_rows = len(tweets) - self.cleaned_rows
+        logging.info(f"Cleaned text cache: {self.cached_rows} rows cached, {self.cleaned_rows} rows cleaned "
+                     f"({len(unseen)} distinct texts)")
+        return [cleaned_by_key[key] for key in keys]
+
+
+
+    def _clean_uncached(self, tweets: list) -> list:
+        """
+        Clean in chunks of CHUNK_SIZE texts spread over CLEAN_WORKERS spawned processes.
+        Chunks come back in submission order, so the result is the same as cleaning row
+        by row.
+        """
+        logging.info(f"Cleaning {len(tweets)} tweets in chunks of {self.data_transformation_config.CHUNK_SIZE} "
+                     f"across up to {self.data_transformation_config.CLEAN_WORKERS} processes")
+        return clean_in_chunks(tweets, self.data_transformation_config.CHUNK_SIZE,
+                               self.data_transformation_config.CLEAN_WORKERS, self.text_normalizer)
+
+
+
     def initiate_data_transformation(self) -> DataTransformationArtifacts:
         try:
             logging.info("Entered the initiate_data_transformation method of Data transformation class")
@@ -110,14 +147,16 @@ class DataTransformation:
             self.raw_data_cleaning()
             df = self.concat_dataframe()
             logging.info("Starting tweet text preprocessing...")
-            df[self.data_transformation_config.TWEET] = df[self.data_transformation_config.TWEET].apply(self.concat_data_cleaning)
+            df[self.data_transformation_config.TWEET] = self.clean_tweets(df[self.data_transformation_config.TWEET])
             logging.info("Completed tweet text preprocessing.")
 
             os.makedirs(self.data_transformation_config.DATA_TRANSFORMATION_ARTIFACTS_DIR, exist_ok=True)
             df.to_csv(self.data_transformation_config.TRANSFORMED_FILE_PATH,index=False,header=True)
 
             data_transformation_artifact = DataTransformationArtifacts(
-                transformed_data_path = self.data_transformation_config.TRANSFORMED_FILE_PATH
+                transformed_data_path = self.data_transformation_config.TRANSFORMED_FILE_PATH,
+                cached_rows = self.cached_rows,
+                cleaned_rows = self.cleaned_rows
             )
             logging.info("returning the DataTransformationArtifacts")
             return data_transformation_artifact
@@ -2,12 +2,12 @@ import os
 import sys
 import tensorflow
 from tensorflow import keras
-import pickle
 import numpy as np
 import pandas as pd
 from Sentiment_Analysis.logger import logging
 from Sentiment_Analysis.exception import CustomException
-from tensorflow.keras.utils import pad_sequences
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.ml.test_matrix import TestMatrix
 from Sentiment_Analysis.constants import *
 from Sentiment_Analysis.configuration.gcloud_syncer import GCloudSync
 from sklearn.metrics import confusion_matrix, classification_report
@@ -32,6 +32,7 @@ class ModelEvaluation:
         self.model_trainer_artifacts = model_trainer_artifacts
         self.data_transformation_artifacts = data_transformation_artifacts
         self.gcloud = GCloudSync()
+        self._test_set = None
 
     def get_best_model_from_gcloud(self) -> str:
         """
@@ -58,6 +59,22 @@ class ModelEvaluation:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def load_test_set(self):
+        """
+        The padded test ids and labels, memory-mapped from the matrix ModelTrainer saved for
+        the current vocabulary. Tokenized here only when that matrix is missing, and shared
+        by every model this evaluation scores.
+        """
+        if self._test_set is None:
+            vocabulary = Vocabulary.load(self.data_transformation_artifacts.vocabulary_path)
+            x_test_path = self.model_trainer_artifacts.x_test_path[0]
+            test_matrix = TestMatrix(os.path.dirname(x_test_path), vocabulary.fingerprint)
+            if not test_matrix.exists():
+                logging.info("No test matrix for this vocabulary, tokenizing the test split")
+                test_matrix.build(x_test_path, self.model_trainer_artifacts.y_test_path[0], vocabulary)
+            self._test_set = test_matrix.load()
+        return self._test_set
+
     def evaluate(self, model_path: str) -> float:
         """
         Evaluate a model against the test dataset.
@@ -68,15 +85,7 @@ class ModelEvaluation:
         try:
             logging.info(f"Evaluating model at: {model_path}")
 
-            x_test = pd.read_csv(self.model_trainer_artifacts.x_test_path[0], index_col=0)
-            y_test = pd.read_csv(self.model_trainer_artifacts.y_test_path[0], index_col=0)
-
-            with open(self.data_transformation_artifacts.tokenizer_path, 'rb') as handle:
-                tokenizer = pickle.load(handle)
-
-            x_test = x_test['tweet'].astype(str)
-            test_sequences = tokenizer.texts_to_sequences(x_test)
-            test_sequences_matrix = pad_sequences(test_sequences, maxlen=MAX_LEN)
+            test_sequences_matrix, y_test = self.load_test_set()
 
             model = keras.models.load_model(model_path)
             evaluation_result = model.evaluate(test_sequences_matrix, y_test)
@@ -0,0 +1,52 @@
+import os
+import sys
+from tensorflow import keras
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.ml.tflite_backend import model_version, save_tflite, tflite_file_name
+from Sentiment_Analysis.entity.config_entity import ModelExporterConfig
+from Sentiment_Analysis.entity.artifact_entity import ModelExporterArtifacts, ModelTrainerArtifacts
+
+
+class ModelExporter:
+    def __init__(self, model_exporter_config: ModelExporterConfig,
+                 model_trainer_artifacts: ModelTrainerArtifacts):
+        """
+        :param model_exporter_config: Configuration for model exporter
+        :param model_trainer_artifacts: Output reference of model trainer artifact stage
+        """
+        self.model_exporter_config = model_exporter_config
+        self.model_trainer_artifacts = model_trainer_artifacts
+
+
+
+    def initiate_model_exporter(self) -> ModelExporterArtifacts:
+        """
+            Method Name :   initiate_model_exporter
+            Description :   Converts the accepted model to one TFLite flatbuffer per configured quantization,
+                            named by the model version so serving finds the files pushed for its model.h5.
+
+            Output      :   Model exporter artifact
+        """
+        logging.info("Entered initiate_model_exporter method of ModelExporter class")
+        try:
+            os.makedirs(self.model_exporter_config.MODEL_EXPORTER_ARTIFACTS_DIR, exist_ok=True)
+            version = model_version(self.model_trainer_artifacts.trained_model_path)
+            model = keras.models.load_model(self.model_trainer_artifacts.trained_model_path)
+
+            tflite_model_paths = {}
+            for quantization in self.model_exporter_config.QUANTIZATIONS:
+                path = os.path.join(self.model_exporter_config.MODEL_EXPORTER_ARTIFACTS_DIR,
+                                    tflite_file_name(version, quantization))
+                tflite_model_paths[quantization] = save_tflite(model, path, quantization)
+                logging.info(f"Exported {quantization} TFLite model to {path} ({os.path.getsize(path)} bytes)")
+
+            model_exporter_artifacts = ModelExporterArtifacts(
+                model_version=version,
+                tflite_model_paths=tflite_model_paths
+            )
+            logging.info("Exited the initiate_model_exporter method of ModelExporter class")
+            return model_exporter_artifacts
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
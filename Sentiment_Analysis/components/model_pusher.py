@@ -1,16 +1,21 @@
+import os
 import sys
+from typing import Optional
 from Sentiment_Analysis.logger import logging
 from Sentiment_Analysis.exception import CustomException
 from Sentiment_Analysis.configuration.gcloud_syncer import GCloudSync
 from Sentiment_Analysis.entity.config_entity import ModelPusherConfig
-from Sentiment_Analysis.entity.artifact_entity import ModelPusherArtifacts
+from Sentiment_Analysis.entity.artifact_entity import ModelExporterArtifacts, ModelPusherArtifacts
 
 class ModelPusher:
-    def __init__(self, model_pusher_config: ModelPusherConfig):
+    def __init__(self, model_pusher_config: ModelPusherConfig,
+                 model_exporter_artifacts: Optional[ModelExporterArtifacts] = None):
         """
         :param model_pusher_config: Configuration for model pusher
+        :param model_exporter_artifacts: Output reference of model exporter artifact stage
         """
         self.model_pusher_config = model_pusher_config
+        self.model_exporter_artifacts = model_exporter_artifacts
         self.gcloud = GCloudSync()
 
     
@@ -24,6 +29,13 @@ class ModelPusher:
         """
         logging.info("Entered initiate_model_pusher method of ModelTrainer class")
         try:
+            # The TFLite files go first, so a server reloading the new model.h5 finds them
+            if self.model_exporter_artifacts is not None:
+                for path in self.model_exporter_artifacts.tflite_model_paths.values():
+                    self.gcloud.sync_folder_to_gcloud(self.model_pusher_config.BUCKET_NAME,
+                                                      os.path.dirname(path), os.path.basename(path))
+                    logging.info(f"Uploaded {os.path.basename(path)} to gcloud storage")
+
             # Uploading the model to gcloud storage
 
             self.gcloud.sync_folder_to_gcloud(self.model_pusher_config.BUCKET_NAME,
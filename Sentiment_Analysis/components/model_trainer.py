@@ -1,16 +1,29 @@
 import os 
 import sys
+import json
+import math
 import pickle
+import shutil
+import numpy as np
 import pandas as pd
 from Sentiment_Analysis.logger import logging
 from Sentiment_Analysis.constants import *
 from Sentiment_Analysis.exception import CustomException
 from sklearn.model_selection import train_test_split
-from tensorflow.keras.preprocessing.text import Tokenizer
 from tensorflow.keras.utils import pad_sequences
 from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig
 from Sentiment_Analysis.entity.artifact_entity import ModelTrainerArtifacts,DataTransformationArtifacts
 from Sentiment_Analysis.ml.model import ModelArchitecture
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.ml.vocabulary_builder import VocabularyBuilder
+from Sentiment_Analysis.ml.sequence_cache import SequenceCache
+from Sentiment_Analysis.ml.test_matrix import TestMatrix
+from Sentiment_Analysis.ml.length_buckets import LengthBucketedSequence
+from Sentiment_Analysis.ml.resumable_training import ResumableTraining
+
+
+# Row roles in the streaming input mode
+_TRAIN, _VALIDATION, _TEST = 0, 1, 2
 
 
 
@@ -32,7 +45,7 @@ class ModelTrainer:
             y = df[LABEL]
 
             logging.info("Applying train_test_split on the data")
-            x_train,x_test,y_train,y_test = train_test_split(x,y, test_size=0.3,random_state = 42)
+            x_train,x_test,y_train,y_test = train_test_split(x,y, test_size=self.model_trainer_config.TEST_SIZE,random_state = self.model_trainer_config.RANDOM_STATE)
             print(len(x_train),len(y_train))
             print(len(x_test),len(y_test))
             print(type(x_train),type(y_train))
@@ -44,13 +57,23 @@ class ModelTrainer:
         
 
     
+    def fit_vocabulary(self, x_train):
+        """Fit the MAX_WORDS vocabulary on cleaned training texts. Returns it and the equivalent Keras tokenizer."""
+        vocabulary_builder = VocabularyBuilder(num_words=self.model_trainer_config.MAX_WORDS,
+                                               workers=self.model_trainer_config.VOCABULARY_WORKERS,
+                                               shard_size=self.model_trainer_config.VOCABULARY_SHARD_SIZE)
+        vocabulary = vocabulary_builder.fit(x_train)
+        logging.info(f"Counted {len(vocabulary_builder.word_counts)} distinct words in {len(x_train)} tweets")
+        return vocabulary, vocabulary_builder.to_tokenizer()
+
+
+
     def tokenizing(self,x_train):
         try:
             logging.info("Applying tokenization on the data")
             x_train = x_train.fillna("").astype(str)
-            tokenizer = Tokenizer(num_words=self.model_trainer_config.MAX_WORDS)
-            tokenizer.fit_on_texts(x_train)
-            sequences = tokenizer.texts_to_sequences(x_train)
+            vocabulary, tokenizer = self.fit_vocabulary(x_train)
+            sequences = vocabulary.texts_to_sequences(x_train)
             #logging.info(f"converting text to sequences: {sequences}")
             sequences_matrix = pad_sequences(sequences,maxlen=self.model_trainer_config.MAX_LEN)
             logging.info(f" The sequence matrix is: {sequences_matrix}")
@@ -61,25 +84,10 @@ class ModelTrainer:
 
     
 
-    def initiate_model_trainer(self,) -> ModelTrainerArtifacts:
-        logging.info("Entered initiate_model_trainer method of ModelTrainer class")
-
-        """
-        Method Name :   initiate_model_trainer
-        Description :   This function initiates a model trainer steps
-        
-        Output      :   Returns model trainer artifact
-        On Failure  :   Write an exception log and then raise an exception
-        """
-
+    def train_in_memory(self, model, callbacks=None, initial_epoch=0):
+        """Fit on one padded matrix of the whole training split. Returns the fitted tokenizer."""
         try:
-            logging.info("Entered the initiate_model_trainer function ")
             x_train,x_test,y_train,y_test = self.spliting_data(csv_path=self.data_transformation_artifacts.transformed_data_path)
-            model_architecture = ModelArchitecture()   
-
-            model = model_architecture.get_model()
-
-
 
             logging.info(f"Xtrain size is : {x_train.shape}")
 
@@ -92,32 +100,267 @@ class ModelTrainer:
             model.fit(sequences_matrix, y_train, 
                         batch_size=self.model_trainer_config.BATCH_SIZE, 
                         epochs = self.model_trainer_config.EPOCH, 
+                        initial_epoch=initial_epoch,
                         validation_split=self.model_trainer_config.VALIDATION_SPLIT, 
+                        callbacks=callbacks,
                         )
             logging.info("Model training finished")
 
+            x_test.to_csv(self.model_trainer_config.X_TEST_DATA_PATH)
+            y_test.to_csv(self.model_trainer_config.Y_TEST_DATA_PATH)
+
+            x_train.to_csv(self.model_trainer_config.X_TRAIN_DATA_PATH)
+            return tokenizer
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+
+    def read_chunks(self, csv_path, roles):
+        """Stream the transformed CSV in chunks of READ_CHUNK_SIZE rows, each with its slice of ``roles``."""
+        offset = 0
+        for chunk in pd.read_csv(csv_path, index_col=False, chunksize=self.model_trainer_config.READ_CHUNK_SIZE):
+            yield chunk, roles[offset:offset + len(chunk)]
+            offset += len(chunk)
+
+
+
+    def sequence_cache(self, csv_path) -> SequenceCache:
+        """The cache entry for this CSV under every setting that shapes the cached sequences."""
+        config = self.model_trainer_config
+        fingerprint = SequenceCache.make_fingerprint(
+            csv_path, tweet=config.TWEET, label=config.LABEL, max_words=config.MAX_WORDS, max_len=config.MAX_LEN,
+            test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE, validation_split=config.VALIDATION_SPLIT)
+        return SequenceCache(config.SEQUENCE_CACHE_DIR, fingerprint)
+
+
+
+    def build_sequence_cache(self, csv_path, cache: SequenceCache):
+        """
+        Split, fit the vocabulary, tokenize and pad while holding one chunk of the CSV at a
+        time, writing train/validation shards and the test CSVs into ``cache``.
+
+        The split is taken on row positions only: train_test_split permutes by row count
+        and random state alone, and validation_split holds out the tail of the permuted
+        training rows, so every row lands in the same split as in the in-memory mode.
+        The vocabulary is counted in file order rather than permuted order, so words with
+        equal counts can get other ids than in the in-memory mode.
+        """
+        try:
+            config = self.model_trainer_config
+            rows = sum(len(chunk) for chunk in pd.read_csv(csv_path, index_col=False, usecols=[config.LABEL],
+                                                           chunksize=config.READ_CHUNK_SIZE))
+            train_rows, _ = train_test_split(np.arange(rows), test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE)
+            split_at = int(math.floor(len(train_rows) * (1.0 - config.VALIDATION_SPLIT)))
+            roles = np.full(rows, _TEST, dtype=np.int8)
+            roles[train_rows[:split_at]] = _TRAIN
+            roles[train_rows[split_at:]] = _VALIDATION
+            logging.info(f"Building the sequence cache at {cache.path} from {rows} rows")
+
+            vocabulary_builder = VocabularyBuilder(num_words=config.MAX_WORDS, workers=config.VOCABULARY_WORKERS,
+                                                   shard_size=config.VOCABULARY_SHARD_SIZE)
+            vocabulary = vocabulary_builder.fit_shards(
+                chunk[config.TWEET][chunk_roles != _TEST].fillna("").astype(str).tolist()
+                for chunk, chunk_roles in self.read_chunks(csv_path, roles))
+            logging.info(f"Counted {len(vocabulary_builder.word_counts)} distinct words in "
+                         f"{vocabulary_builder.document_count} tweets")
+
+            cache.start()
+            dtype = "uint16" if vocabulary.num_words <= np.iinfo(np.uint16).max + 1 else "int32"
+            writers = {role: cache.writer(split, dtype, config.SEQUENCE_CACHE_SHARD_ROWS)
+                       for role, split in ((_TRAIN, "train"), (_VALIDATION, "validation"))}
+            for number, (chunk, chunk_roles) in enumerate(self.read_chunks(csv_path, roles)):
+                tweets = chunk[config.TWEET].fillna("").astype(str)
+                for role, writer in writers.items():
+                    in_role = chunk_roles == role
+                    if in_role.any():
+                        padded = pad_sequences(vocabulary.texts_to_sequences(tweets[in_role]),
+                                               maxlen=config.MAX_LEN, dtype=dtype)
+                        writer.write(padded, chunk[config.LABEL][in_role].to_numpy())
+                mode, header = ("w", True) if number == 0 else ("a", False)
+                in_test = chunk_roles == _TEST
+                chunk[config.TWEET][in_test].to_csv(cache.file(X_TEST_FILE_NAME), mode=mode, header=header)
+                chunk[config.LABEL][in_test].to_csv(cache.file(Y_TEST_FILE_NAME), mode=mode, header=header)
+                chunk[config.TWEET][~in_test].to_csv(cache.file(X_TRAIN_FILE_NAME), mode=mode, header=header)
+
+            with open(cache.file(TOKENIZER_PATH), 'wb') as handle:
+                pickle.dump(vocabulary_builder.to_tokenizer(), handle, protocol=pickle.HIGHEST_PROTOCOL)
+            manifest = cache.finish(list(writers.values()), max_len=config.MAX_LEN, dtype=dtype,
+                                    num_words=vocabulary.num_words)
+            logging.info(f"Sequence cache written: {manifest['rows']}")
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+
+    def train_streaming(self, model, callbacks=None, initial_epoch=0):
+        """
+        Fit on padded batches streamed from the sequence cache through tf.data, building the
+        cache first unless this data was already cached with the same settings. Memory stays
+        bounded by the read chunk, the shuffle buffer and the prefetched batches. Returns the
+        fitted tokenizer.
+        """
+        try:
+            config = self.model_trainer_config
+            csv_path = self.data_transformation_artifacts.transformed_data_path
+            cache = self.sequence_cache(csv_path)
+            if cache.manifest is None:
+                self.build_sequence_cache(csv_path, cache)
+            else:
+                logging.info(f"Reusing the sequence cache at {cache.path}")
+
+            for name, path in ((X_TEST_FILE_NAME, config.X_TEST_DATA_PATH), (Y_TEST_FILE_NAME, config.Y_TEST_DATA_PATH),
+                               (X_TRAIN_FILE_NAME, config.X_TRAIN_DATA_PATH)):
+                shutil.copyfile(cache.file(name), path)
+            with open(cache.file(TOKENIZER_PATH), 'rb') as handle:
+                tokenizer = pickle.load(handle)
+
+            rows = cache.manifest["rows"]
+            logging.info(f"Entered into model training, streaming {rows['train']} training and "
+                         f"{rows['validation']} validation rows")
+            model.fit(cache.dataset("train", config.BATCH_SIZE, shuffle_buffer=config.SHUFFLE_BUFFER),
+                      epochs=config.EPOCH, initial_epoch=initial_epoch,
+                      validation_data=cache.dataset("validation", config.BATCH_SIZE),
+                      callbacks=callbacks)
+            logging.info("Model training finished")
+            return tokenizer
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    
+
+    def train_bucketed(self, model, callbacks=None, initial_epoch=0):
+        """
+        Fit on batches padded only to the bound of their length bucket. The model must take
+        any sequence length and mask the padding id, so it scores the same on the MAX_LEN
+        rows evaluation and serving pad to. Validation holds out the same tail of the
+        training split as validation_split does. Returns the fitted tokenizer.
+        """
+        try:
+            config = self.model_trainer_config
+            x_train,x_test,y_train,y_test = self.spliting_data(csv_path=self.data_transformation_artifacts.transformed_data_path)
+            texts = x_train.fillna("").astype(str)
+            vocabulary, tokenizer = self.fit_vocabulary(texts)
+            sequences = vocabulary.texts_to_sequences(texts)
+            labels = y_train.to_numpy()
+
+            split_at = int(math.floor(len(sequences) * (1.0 - config.VALIDATION_SPLIT)))
+            train = LengthBucketedSequence(sequences[:split_at], labels[:split_at], buckets=config.LENGTH_BUCKETS,
+                                           max_len=config.MAX_LEN, seed=config.RANDOM_STATE)
+            validation = None
+            if split_at < len(sequences):
+                validation = LengthBucketedSequence(sequences[split_at:], labels[split_at:], buckets=config.LENGTH_BUCKETS,
+                                                    max_len=config.MAX_LEN, shuffle=False)
+            logging.info(f"Entered into model training, {len(train)} length-bucketed batches holding "
+                         f"{train.padded_ids} ids instead of {split_at * config.MAX_LEN}")
+            model.fit(train.dataset(), epochs=config.EPOCH, initial_epoch=initial_epoch,
+                      validation_data=None if validation is None else validation.dataset(), callbacks=callbacks)
+            logging.info("Model training finished")
+
+            x_test.to_csv(config.X_TEST_DATA_PATH)
+            y_test.to_csv(config.Y_TEST_DATA_PATH)
+
+            x_train.to_csv(config.X_TRAIN_DATA_PATH)
+            return tokenizer
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    
+
+    def resumable_training(self) -> ResumableTraining:
+        """
+        Checkpoints for training on this data with these settings. A restart under a different
+        configuration gets a different directory, so it starts over instead of resuming.
+        """
+        config = self.model_trainer_config
+        fingerprint = SequenceCache.make_fingerprint(
+            self.data_transformation_artifacts.transformed_data_path, input_mode=config.INPUT_MODE,
+            architecture=config.ARCHITECTURE, max_words=config.MAX_WORDS, max_len=config.MAX_LEN,
+            embedding_dim=config.EMBEDDING_DIM, units=config.UNITS, batch_size=config.BATCH_SIZE,
+            length_buckets=config.LENGTH_BUCKETS, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE,
+            validation_split=config.VALIDATION_SPLIT)
+        return ResumableTraining(os.path.join(config.CHECKPOINT_DIR, fingerprint),
+                                 patience=config.EARLY_STOPPING_PATIENCE, min_delta=config.EARLY_STOPPING_MIN_DELTA,
+                                 save_freq=config.CHECKPOINT_SAVE_FREQ)
+
+    
+
+    def initiate_model_trainer(self,) -> ModelTrainerArtifacts:
+        logging.info("Entered initiate_model_trainer method of ModelTrainer class")
+
+        """
+        Method Name :   initiate_model_trainer
+        Description :   This function initiates a model trainer steps
+        
+        Output      :   Returns model trainer artifact
+        On Failure  :   Write an exception log and then raise an exception
+        """
+
+        try:
+            logging.info("Entered the initiate_model_trainer function ")
+            model_architecture = ModelArchitecture(self.model_trainer_config.ARCHITECTURE,
+                                                   max_words=self.model_trainer_config.MAX_WORDS,
+                                                   embedding_dim=self.model_trainer_config.EMBEDDING_DIM,
+                                                   units=self.model_trainer_config.UNITS)
+            logging.info(f"Building the {self.model_trainer_config.ARCHITECTURE} architecture")
+
+            if self.model_trainer_config.INPUT_MODE == "bucketed":
+                model = model_architecture.get_model(input_length=None, mask_zero=True)
+            else:
+                model = model_architecture.get_model(input_length=self.model_trainer_config.MAX_LEN)
+            os.makedirs(self.model_trainer_config.TRAINED_MODEL_DIR,exist_ok=True)
+
+            resumable_training = self.resumable_training()
+            if resumable_training.load_state() is not None:
+                logging.info(f"Resuming training from the checkpoint in {resumable_training.directory}")
+            callbacks = resumable_training.callbacks()
+            initial_epoch = resumable_training.initial_epoch(self.model_trainer_config.EPOCH)
+            if self.model_trainer_config.INPUT_MODE == "tf_data":
+                tokenizer = self.train_streaming(model, callbacks=callbacks, initial_epoch=initial_epoch)
+            elif self.model_trainer_config.INPUT_MODE == "bucketed":
+                tokenizer = self.train_bucketed(model, callbacks=callbacks, initial_epoch=initial_epoch)
+            elif self.model_trainer_config.INPUT_MODE == "in_memory":
+                tokenizer = self.train_in_memory(model, callbacks=callbacks, initial_epoch=initial_epoch)
+            else:
+                raise ValueError(f"Unknown training input mode {self.model_trainer_config.INPUT_MODE!r}")
+
             
             with open('tokenizer.pickle', 'wb') as handle:
                 pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            os.makedirs(self.model_trainer_config.TRAINED_MODEL_DIR,exist_ok=True)
+            # Only the MAX_WORDS ids the model uses; serving and evaluation read this instead of the pickle
+            vocabulary = Vocabulary.from_tokenizer(tokenizer)
+            vocabulary.save(VOCABULARY_PATH)
+
+            logging.info("Saving the padded test matrix for evaluation")
+            TestMatrix(self.model_trainer_config.TRAINED_MODEL_DIR, vocabulary.fingerprint).build(
+                self.model_trainer_config.X_TEST_DATA_PATH, self.model_trainer_config.Y_TEST_DATA_PATH, vocabulary,
+                max_len=self.model_trainer_config.MAX_LEN, chunk_size=self.model_trainer_config.READ_CHUNK_SIZE)
 
 
 
             logging.info("saving the model")
             model.save(self.model_trainer_config.TRAINED_MODEL_PATH)
-            x_test.to_csv(self.model_trainer_config.X_TEST_DATA_PATH)
-            y_test.to_csv(self.model_trainer_config.Y_TEST_DATA_PATH)
 
-            x_train.to_csv(self.model_trainer_config.X_TRAIN_DATA_PATH)
+            report = resumable_training.report(self.model_trainer_config.EPOCH)
+            with open(self.model_trainer_config.TRAINING_REPORT_PATH, "w") as handle:
+                json.dump(report, handle, indent=2)
+            logging.info(f"Trained {report['epochs_completed']} of {report['epochs_requested']} epochs, "
+                         f"{report['seconds_saved_by_resume']:.0f}s saved by resuming and "
+                         f"{report['seconds_saved_by_early_stopping']:.0f}s by early stopping")
+            # The model is saved, so a later run trains afresh
+            resumable_training.clear()
 
             model_trainer_artifacts = ModelTrainerArtifacts(
                 trained_model_path = self.model_trainer_config.TRAINED_MODEL_PATH,
                 x_test_path = [self.model_trainer_config.X_TEST_DATA_PATH],
-                y_test_path = [self.model_trainer_config.Y_TEST_DATA_PATH])
+                y_test_path = [self.model_trainer_config.Y_TEST_DATA_PATH],
+                training_report_path = self.model_trainer_config.TRAINING_REPORT_PATH)
             logging.info("Returning the ModelTrainerArtifacts")
             return model_trainer_artifacts
 
         except Exception as e:
             raise CustomException(e, sys) from e
-
-
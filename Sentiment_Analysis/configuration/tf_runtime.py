@@ -0,0 +1,22 @@
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+
+
+def configure_tf_threads(intra_op_threads: int = TF_INTRA_OP_THREADS,
+                         inter_op_threads: int = TF_INTER_OP_THREADS) -> bool:
+    """
+    Pin TensorFlow's intra/inter-op thread pools.
+
+    TensorFlow only accepts this before its runtime has executed anything, so this must
+    run before the first model is loaded. Returns False if the pools were already fixed.
+    """
+    import tensorflow as tf
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        logging.info(f"TensorFlow threads set to intra_op={intra_op_threads} inter_op={inter_op_threads}")
+        return True
+    except RuntimeError as e:
+        logging.warning(f"TensorFlow threads already initialized, keeping current pools: {e}")
+        return False
@@ -28,6 +28,10 @@ AXIS = 1
 INPLACE = True
 DROP_COLUMNS = ['Unnamed: 0','count','hate_speech','offensive_language','neither']
 CLASS = 'class'
+STEM_CACHE_SIZE = 200000
+DATA_TRANSFORMATION_CLEAN_WORKERS = os.cpu_count() or 1
+DATA_TRANSFORMATION_CHUNK_SIZE = 5000
+CLEANED_TEXT_CACHE_PATH = os.path.join("artifacts", "cache", "cleaned_text.sqlite")
 
 
 # Model training constants
@@ -38,20 +42,57 @@ X_TEST_FILE_NAME = 'x_test.csv'
 Y_TEST_FILE_NAME = 'y_test.csv'
 
 X_TRAIN_FILE_NAME = 'x_train.csv'
+# Padded test split, keyed by the fingerprint of the vocabulary that produced the ids
+TEST_MATRIX_FILE_NAME = 'x_test_{}.npy'
+TEST_LABELS_FILE_NAME = 'y_test_{}.npy'
 
 RANDOM_STATE = 42
 EPOCH = 1
 BATCH_SIZE = 128
 VALIDATION_SPLIT = 0.2
+# Keras Tokenizer defaults, which the vocabulary builder reproduces
+TOKENIZER_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+VOCABULARY_WORKERS = os.cpu_count() or 1
+VOCABULARY_SHARD_SIZE = 200000
+
+# Training input: "in_memory" passes one padded matrix to fit, "tf_data" streams
+# batches from a sharded TFRecord cache of the padded sequences, "bucketed" pads each
+# batch only to the TRAINING_LENGTH_BUCKETS bound of its length and masks the padding
+# (recurrent architectures only)
+TRAINING_INPUT_MODE = 'in_memory'
+TEST_SIZE = 0.3
+TRAINING_READ_CHUNK_SIZE = 50000
+SEQUENCE_CACHE_DIR = os.path.join("artifacts", "cache", "sequences")
+SEQUENCE_CACHE_SHARD_ROWS = 100000
+TF_DATA_SHUFFLE_BUFFER = 20000
+
+# Checkpoints sit outside the timestamped ARTIFACTS_DIR so a restarted run finds them.
+# Save frequency is "epoch" or a number of batches; a resume restarts the interrupted epoch
+TRAINING_CHECKPOINT_DIR = os.path.join("artifacts", "checkpoints")
+TRAINING_CHECKPOINT_SAVE_FREQ = 'epoch'
+EARLY_STOPPING_PATIENCE = 2
+EARLY_STOPPING_MIN_DELTA = 0.001
+TRAINING_REPORT_FILE_NAME = 'training_report.json'
 
 # Model Architecture constants
 MAX_WORDS = 50000
 MAX_LEN = 300
+# (length bound, batch size) pairs for the bucketed training input, about 2-5k ids per batch
+TRAINING_LENGTH_BUCKETS = ((8, 256), (16, 128), (32, 128), (64, 64), (128, 32), (MAX_LEN, 16))
+# One of ml.model.ARCHITECTURES: lstm, fused_lstm, fused_gru, cnn1d, pooled_embedding
+MODEL_ARCHITECTURE = 'lstm'
+EMBEDDING_DIM = 100
+MODEL_UNITS = 100
 LOSS = 'binary_crossentropy'
 METRICS = ['accuracy']
 ACTIVATION = 'sigmoid'
 
 
+# Model exporter constants
+MODEL_EXPORTER_ARTIFACTS_DIR = 'ModelExporterArtifacts'
+TFLITE_EXPORT_QUANTIZATIONS = ['float16', 'int8']
+
+
 # Model  Evaluation constants
 MODEL_EVALUATION_ARTIFACTS_DIR = 'ModelEvaluationArtifacts'
 BEST_MODEL_DIR = "best_Model"
@@ -63,4 +104,72 @@ APP_HOST = "0.0.0.0"
 APP_PORT = 8080
 
 
+# Prediction constants
+PREDICTION_MODEL_DIR = os.path.join("artifacts", "PredictModel")
+PREDICTION_STAGING_DIR = "staging"
+TOKENIZER_PATH = 'tokenizer.pickle'
+VOCABULARY_PATH = 'vocabulary.npy'
+NUMPY_MODEL_DIR = os.path.join("artifacts", "NumpyModel")
+PREDICTION_BATCH_SIZE = 256
+PREDICTION_THRESHOLD = 0.5
+HATE_LABEL = "hate and abusive"
+NO_HATE_LABEL = "no hate"
+INFERENCE_BACKEND = 'keras'
+TFLITE_QUANTIZATION = 'int8'
+INFERENCE_LENGTH_BUCKETING = True
+INFERENCE_LENGTH_BUCKETS = (16, 32, 64, 128, MAX_LEN)
+PREDICTION_CACHE_SIZE = 100000
+PREDICTION_CACHE_TTL = 3600
+STREAM_BATCH_SIZE = 256
+STREAM_MAX_LINE_BYTES = 1 << 20
+
+# Offline batch scoring constants
+BATCH_SCORING_CHUNK_SIZE = 50000
+BATCH_SCORING_CLEAN_WORKERS = os.cpu_count() or 1
+BATCH_SCORING_INFERENCE_BATCH_SIZE = 1024
+BATCH_SCORING_PROGRESS_FILE_NAME = "_progress.json"
+
+# Hyperparameter sweep constants
+SWEEP_ARTIFACTS_DIR = os.path.join("artifacts", "sweeps")
+# ModelTrainerConfig attribute -> values to try; trials are drawn from the grid
+SWEEP_SEARCH_SPACE = {
+    "MAX_WORDS": [20000, 50000],
+    "MAX_LEN": [50, 150, 300],
+    "BATCH_SIZE": [128, 256],
+    "EMBEDDING_DIM": [64, 100],
+    "UNITS": [64, 100],
+}
+SWEEP_TRIALS = 9
+SWEEP_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+SWEEP_THREADS_PER_TRIAL = max(1, (os.cpu_count() or 1) // SWEEP_WORKERS)
+# Successive halving: rung r trains survivors to SWEEP_MIN_EPOCHS * SWEEP_REDUCTION_FACTOR ** r
+# epochs, then keeps the best 1 / SWEEP_REDUCTION_FACTOR by val_loss
+SWEEP_MIN_EPOCHS = 1
+SWEEP_REDUCTION_FACTOR = 3
+SWEEP_RUNGS = 3
+SWEEP_RESULTS_FILE_NAME = "results.csv"
+
+# Micro-batching constants
+SCHEDULER_MAX_BATCH_SIZE = 64
+SCHEDULER_MAX_WAIT_MS = 5
+
+# Warm-up constants
+WARMUP_BATCH_SIZES = tuple(sorted({1, 8, SCHEDULER_MAX_BATCH_SIZE, PREDICTION_BATCH_SIZE, STREAM_BATCH_SIZE}))
+WARMUP_RETRY_SECONDS = 30
+
+# Serving concurrency constants
+INFERENCE_WORKERS = 2
+TF_INTRA_OP_THREADS = max(1, (os.cpu_count() or 1) // INFERENCE_WORKERS)
+TF_INTER_OP_THREADS = 1
+
+# Pre-fork serving constants
+SERVING_WORKERS = 1
+SHARED_WEIGHTS_DIR = os.path.join("artifacts", "SharedWeights")
+PREFORK_REPORT_PATH = os.path.join("artifacts", "reports", "prefork_startup.json")
+PREFORK_STARTUP_TIMEOUT = 300
+# A model reloaded by one worker is published here; the other workers poll it and follow
+SERVED_VERSION_FILE = os.path.join(PREDICTION_MODEL_DIR, "served_version")
+MODEL_VERSION_POLL_SECONDS = 5
+
+
 
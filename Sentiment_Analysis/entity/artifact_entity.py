@@ -23,6 +23,9 @@ class DataValidationArtifact:
 class DataTransformationArtifacts:
     transformed_data_path: str
     tokenizer_path: str = 'tokenizer.pickle'
+    vocabulary_path: str = 'vocabulary.npy'
+    cached_rows: int = 0
+    cleaned_rows: int = 0
 
 
 @dataclass
@@ -30,6 +33,13 @@ class ModelTrainerArtifacts:
     trained_model_path:str
     x_test_path: list
     y_test_path: list
+    training_report_path: str = None
+
+@dataclass
+class ModelExporterArtifacts:
+    model_version: str
+    tflite_model_paths: dict
+
 
 @dataclass
 class ModelEvaluationArtifacts:
@@ -37,4 +47,20 @@ class ModelEvaluationArtifacts:
 
 @dataclass
 class ModelPusherArtifacts:
-    bucket_name: str
\ No newline at end of file
+    bucket_name: str
+
+
+@dataclass
+class BatchScoringArtifacts:
+    output_dir: str
+    rows_scored: int
+    chunks_written: int
+    chunks_skipped: int
+    rows_per_second: dict
+
+
+@dataclass
+class SweepArtifacts:
+    results_path: str
+    best_trial: dict
+    trials_run: int
@@ -34,6 +34,9 @@ class DataTransformationConfig:
         self.CLASS = CLASS 
         self.LABEL = LABEL
         self.TWEET = TWEET
+        self.CLEAN_WORKERS = DATA_TRANSFORMATION_CLEAN_WORKERS
+        self.CHUNK_SIZE = DATA_TRANSFORMATION_CHUNK_SIZE
+        self.CLEANED_TEXT_CACHE_PATH = CLEANED_TEXT_CACHE_PATH
 
 
 @dataclass
@@ -55,6 +58,30 @@ class ModelTrainerConfig:
         self.EPOCH = EPOCH
         self.BATCH_SIZE = BATCH_SIZE
         self.VALIDATION_SPLIT = VALIDATION_SPLIT
+        self.VOCABULARY_WORKERS = VOCABULARY_WORKERS
+        self.VOCABULARY_SHARD_SIZE = VOCABULARY_SHARD_SIZE
+        self.INPUT_MODE = TRAINING_INPUT_MODE
+        self.TEST_SIZE = TEST_SIZE
+        self.READ_CHUNK_SIZE = TRAINING_READ_CHUNK_SIZE
+        self.SEQUENCE_CACHE_DIR = SEQUENCE_CACHE_DIR
+        self.SEQUENCE_CACHE_SHARD_ROWS = SEQUENCE_CACHE_SHARD_ROWS
+        self.SHUFFLE_BUFFER = TF_DATA_SHUFFLE_BUFFER
+        self.LENGTH_BUCKETS = TRAINING_LENGTH_BUCKETS
+        self.ARCHITECTURE = MODEL_ARCHITECTURE
+        self.EMBEDDING_DIM = EMBEDDING_DIM
+        self.UNITS = MODEL_UNITS
+        self.CHECKPOINT_DIR = TRAINING_CHECKPOINT_DIR
+        self.CHECKPOINT_SAVE_FREQ = TRAINING_CHECKPOINT_SAVE_FREQ
+        self.EARLY_STOPPING_PATIENCE = EARLY_STOPPING_PATIENCE
+        self.EARLY_STOPPING_MIN_DELTA = EARLY_STOPPING_MIN_DELTA
+        self.TRAINING_REPORT_PATH = os.path.join(self.TRAINED_MODEL_DIR, TRAINING_REPORT_FILE_NAME)
+
+
+@dataclass
+class ModelExporterConfig:
+    def __init__(self):
+        self.MODEL_EXPORTER_ARTIFACTS_DIR: str = os.path.join(os.getcwd(),ARTIFACTS_DIR,MODEL_EXPORTER_ARTIFACTS_DIR)
+        self.QUANTIZATIONS = TFLITE_EXPORT_QUANTIZATIONS
 
 
 @dataclass
@@ -75,4 +102,40 @@ class ModelPusherConfig:
         self.MODEL_NAME = MODEL_NAME
 
 
+@dataclass
+class BatchScoringConfig:
+
+    def __init__(self, input_path: str, output_dir: str, text_column: str = TWEET,
+                 chunk_size: int = BATCH_SCORING_CHUNK_SIZE,
+                 clean_workers: int = BATCH_SCORING_CLEAN_WORKERS,
+                 inference_batch_size: int = BATCH_SCORING_INFERENCE_BATCH_SIZE,
+                 resume: bool = True):
+        self.INPUT_PATH = input_path
+        self.OUTPUT_DIR = output_dir
+        self.TEXT_COLUMN = text_column
+        self.CHUNK_SIZE = chunk_size
+        self.CLEAN_WORKERS = clean_workers
+        self.INFERENCE_BATCH_SIZE = inference_batch_size
+        self.RESUME = resume
+        self.PROGRESS_FILE_PATH = os.path.join(output_dir, BATCH_SCORING_PROGRESS_FILE_NAME)
+
+
+@dataclass
+class SweepConfig:
 
+    def __init__(self, search_space: dict = None, transformed_data_path: str = None, output_dir: str = None,
+                 trials: int = SWEEP_TRIALS, workers: int = SWEEP_WORKERS,
+                 threads_per_trial: int = SWEEP_THREADS_PER_TRIAL, min_epochs: int = SWEEP_MIN_EPOCHS,
+                 reduction_factor: int = SWEEP_REDUCTION_FACTOR, rungs: int = SWEEP_RUNGS):
+        self.SEARCH_SPACE = search_space or SWEEP_SEARCH_SPACE
+        # None runs ingestion, validation and transformation once for the whole sweep
+        self.TRANSFORMED_DATA_PATH = transformed_data_path
+        self.OUTPUT_DIR = output_dir or os.path.join(os.getcwd(), SWEEP_ARTIFACTS_DIR, TIMESTAMP)
+        self.DATA_DIR = os.path.join(self.OUTPUT_DIR, "data")
+        self.RESULTS_PATH = os.path.join(self.OUTPUT_DIR, SWEEP_RESULTS_FILE_NAME)
+        self.TRIALS = trials
+        self.WORKERS = workers
+        self.THREADS_PER_TRIAL = threads_per_trial
+        self.MIN_EPOCHS = min_epochs
+        self.REDUCTION_FACTOR = reduction_factor
+        self.RUNGS = rungs
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import hashlib
+from typing import Dict, Iterable, Tuple
+
+
+# SQLite's default limit on host parameters per statement is 999
+_LOOKUP_BATCH = 900
+
+
+class CleanedTextCache:
+    """
+    Persistent map from raw tweet text to its cleaned form, shared across training runs.
+
+    Rows are keyed by a hash of the raw text and stored under the normalizer fingerprint
+    they were produced with. Opening the cache with a different fingerprint drops every
+    row of the old one, so a change to the cleaning logic never serves stale output.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cleaned_text ("
+            "fingerprint TEXT NOT NULL, key BLOB NOT NULL, cleaned TEXT NOT NULL, "
+            "PRIMARY KEY (fingerprint, key)) WITHOUT ROWID")
+        stale = self.connection.execute("DELETE FROM cleaned_text WHERE fingerprint != ?", (fingerprint,)).rowcount
+        self.connection.commit()
+        self.stale_rows_dropped = stale
+
+    @staticmethod
+    def key(text) -> bytes:
+        # str() like concat_data_cleaning, so NaN and non-string cells hash as they are cleaned
+        return hashlib.blake2b(str(text).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, str]:
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[start:start + _LOOKUP_BATCH]
+            rows = self.connection.execute(
+                f"SELECT key, cleaned FROM cleaned_text WHERE fingerprint = ? AND key IN ({','.join('?' * len(batch))})",
+                [self.fingerprint] + batch)
+            found.update(rows)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, str]]) -> None:
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO cleaned_text (fingerprint, key, cleaned) VALUES (?, ?, ?)",
+            ((self.fingerprint, key, cleaned) for key, cleaned in items))
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "CleanedTextCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,198 @@
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.shared_weights import SharedWeightModel
+from Sentiment_Analysis.ml.sequence import pad_sequences
+
+
+_PASS_THROUGH_LAYERS = (keras.layers.SpatialDropout1D, keras.layers.Dropout, keras.layers.Masking)
+_RECURRENT_LAYERS = (keras.layers.LSTM, keras.layers.GRU)
+
+
+class LengthBucketedPredictor:
+    """
+    Score token sequences padded only to the bound of their length bucket.
+
+    The served models are trained on sequences pre-padded to MAX_LEN and the padding id
+    has a learned embedding, so the recurrent layer's state after the padding is not
+    zero. That state does not depend on the text though: it is computed once per bucket
+    by running ``MAX_LEN - bound`` padding steps, and used as the initial state for the
+    bucket. Scores therefore match full MAX_LEN pre-padding while the recurrent layer
+    only runs ``bound`` steps. Models with a masked embedding (trained with length
+    buckets) skip padding altogether: they start every bucket from zero states and the
+    padding left inside a bucket is masked.
+    """
+
+    def __init__(self, model, max_len: int = MAX_LEN, bounds=INFERENCE_LENGTH_BUCKETS):
+        self.max_len = max_len
+        self.bounds = sorted({bound for bound in bounds if bound < max_len} | {max_len})
+
+        if isinstance(model, SharedWeightModel):
+            embeddings = model.embeddings
+            self._embed = lambda ids: np.take(embeddings, ids, axis=0)
+            self.mask_zero = model.mask_zero
+            layers = list(model.model.layers)
+        else:
+            layers = list(model.layers)
+            embedding = layers.pop(0)
+            self._embed = lambda ids: embedding(ids)
+            self.mask_zero = bool(embedding.mask_zero)
+
+        recurrent_index = next(i for i, layer in enumerate(layers) if isinstance(layer, _RECURRENT_LAYERS))
+        # The padding mask is passed to the recurrent layer directly
+        self._pre_layers = [layer for layer in layers[:recurrent_index] if not isinstance(layer, keras.layers.Masking)]
+        self._recurrent = layers[recurrent_index]
+        self._head = layers[recurrent_index + 1:]
+
+        zero_input = self._embed(np.zeros((1, 1), dtype="int32"))
+        state_layer = type(self._recurrent).from_config({**self._recurrent.get_config(), "return_state": True})
+        state_layer.build((None, None, zero_input.shape[-1]))
+        state_layer.set_weights(self._recurrent.get_weights())
+
+        zero_states = [tf.zeros_like(state) for state in state_layer(zero_input)[1:]]
+        self._initial_states = {}
+        for bound in self.bounds:
+            pad_steps = max_len - bound
+            if pad_steps and not self.mask_zero:
+                self._initial_states[bound] = list(state_layer(self._embed(np.zeros((1, pad_steps), dtype="int32")))[1:])
+            else:
+                self._initial_states[bound] = zero_states
+
+        self._forward = tf.function(self._forward_eager, reduce_retracing=True)
+
+    @staticmethod
+    def supports(model) -> bool:
+        """True for Embedding -> (dropout) -> LSTM/GRU -> head models this class can bucket."""
+        layers = list(model.model.layers) if isinstance(model, SharedWeightModel) else list(getattr(model, "layers", []))
+        if not isinstance(model, SharedWeightModel):
+            if not layers or not isinstance(layers[0], keras.layers.Embedding):
+                return False
+            layers = layers[1:]
+        for layer in layers:
+            if isinstance(layer, _RECURRENT_LAYERS):
+                config = layer.get_config()
+                return not (config.get("return_sequences") or config.get("go_backwards") or config.get("stateful"))
+            if not isinstance(layer, _PASS_THROUGH_LAYERS):
+                return False
+        return False
+
+    def _forward_eager(self, inputs, mask, states):
+        x = inputs
+        for layer in self._pre_layers:
+            x = layer(x, training=False)
+        batch = tf.shape(x)[0]
+        x = self._recurrent(x, mask=mask, initial_state=[tf.tile(state, [batch, 1]) for state in states],
+                            training=False)
+        for layer in self._head:
+            x = layer(x, training=False)
+        return x
+
+    def predict_sequences(self, sequences) -> np.ndarray:
+        """
+        :param sequences: token id lists as returned by ``texts_to_sequences``
+        :return: float scores, one per sequence, in input order
+        """
+        return self.predict_padded(pad_sequences(sequences, maxlen=self.max_len))
+
+    def predict_padded(self, padded) -> np.ndarray:
+        """
+        :param padded: (n, max_len) pre-padded ids, e.g. from ``TextEncoder``. Leading
+            zeros are padding; treating them so is exact, since the bucket's initial state
+            is the state after that many padding steps, or a masked model ignores them.
+        :return: float scores, one per row, in input order
+        """
+        padded = np.asarray(padded)
+        non_pad = padded != 0
+        lengths = np.where(non_pad.any(axis=1), self.max_len - non_pad.argmax(axis=1), 0)
+        bucket_of = np.searchsorted(self.bounds, lengths)
+        scores = np.empty(len(padded), dtype=np.float32)
+
+        for bucket, bound in enumerate(self.bounds):
+            rows = np.flatnonzero(bucket_of == bucket)
+            if rows.size == 0:
+                continue
+            ids = padded[rows, self.max_len - bound:].astype(np.int32)
+            embedded = tf.convert_to_tensor(self._embed(ids), dtype=tf.float32)
+            mask = tf.convert_to_tensor(ids != 0) if self.mask_zero else None
+            scores[rows] = self._forward(embedded, mask, self._initial_states[bound]).numpy()[:, 0]
+
+        return scores
+
+
+class LengthBucketedSequence:
+    """
+    Training batches grouped by sequence length.
+
+    Each example is pre-padded only to the bound of its length bucket and every bucket
+    has its own batch size, so a batch of short tweets unrolls the recurrent layer for
+    ``bound`` steps instead of MAX_LEN. With ``shuffle``, rows are reshuffled within their
+    bucket and the batch order across buckets is reshuffled after every epoch. The model
+    should mask the padding id, so a row scores the same at any padded length.
+
+    ``dataset()`` is what goes to ``fit`` and ``evaluate``.
+    """
+
+    def __init__(self, sequences, labels, buckets=TRAINING_LENGTH_BUCKETS, max_len: int = MAX_LEN,
+                 shuffle: bool = True, seed: int = RANDOM_STATE):
+        """
+        :param sequences: token id lists as returned by ``texts_to_sequences``
+        :param labels: one label per sequence
+        :param buckets: (length bound, batch size) pairs; the first bound >= max_len is
+            clipped to max_len and takes every longer sequence, pre-truncated
+        """
+        buckets = sorted(buckets)
+        covering = [batch_size for bound, batch_size in buckets if bound >= max_len]
+        if not covering:
+            raise ValueError(f"No length bucket holds sequences of {max_len} ids")
+        self.buckets = [(bound, batch_size) for bound, batch_size in buckets if bound < max_len] + [(max_len, covering[0])]
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+
+        bounds = [bound for bound, _ in self.buckets]
+        lengths = np.fromiter((len(sequence) for sequence in sequences), dtype=np.int64, count=len(sequences))
+        bucket_of = np.searchsorted(bounds, np.minimum(lengths, max_len))
+        labels = np.asarray(labels, dtype=np.float32)
+        self._arrays = []
+        for bucket, (bound, _) in enumerate(self.buckets):
+            rows = np.flatnonzero(bucket_of == bucket)
+            self._arrays.append((pad_sequences([sequences[row] for row in rows], maxlen=bound), labels[rows]))
+        self._batches = []
+        self.on_epoch_end()
+
+    @property
+    def padded_ids(self) -> int:
+        """Ids per epoch including padding, to compare with ``rows * MAX_LEN`` of fixed-length batches."""
+        return sum(ids.size for ids, _ in self._arrays)
+
+    def on_epoch_end(self):
+        batches = []
+        for bucket, ((ids, _), (_, batch_size)) in enumerate(zip(self._arrays, self.buckets)):
+            order = self._rng.permutation(len(ids)) if self.shuffle else np.arange(len(ids))
+            batches.extend((bucket, order[start:start + batch_size]) for start in range(0, len(ids), batch_size))
+        if self.shuffle:
+            batches = [batches[index] for index in self._rng.permutation(len(batches))]
+        self._batches = batches
+
+    def __len__(self):
+        return len(self._batches)
+
+    def __getitem__(self, index):
+        bucket, rows = self._batches[index]
+        ids, labels = self._arrays[bucket]
+        return ids[rows], labels[rows]
+
+    def _epoch(self):
+        for index in range(len(self)):
+            yield self[index]
+        self.on_epoch_end()
+
+    def dataset(self):
+        """
+        The batches as a tf.data.Dataset, regenerated in a new order on every iteration.
+        Its signature leaves the length dimension variable, so a single traced training
+        step serves every bucket.
+        """
+        signature = (tf.TensorSpec(shape=(None, None), dtype=tf.int32), tf.TensorSpec(shape=(None,), dtype=tf.float32))
+        dataset = tf.data.Dataset.from_generator(self._epoch, output_signature=signature)
+        return dataset.apply(tf.data.experimental.assert_cardinality(len(self))).prefetch(tf.data.AUTOTUNE)
@@ -2,25 +2,98 @@
 from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.optimizers import RMSprop
-from tensorflow.keras.callbacks import EarlyStopping, ModelCheckpoint
-from tensorflow.keras.layers import LSTM,Activation,Dense,Dropout,Input,Embedding,SpatialDropout1D
+from tensorflow.keras.layers import (LSTM, GRU, Activation, Dense, Dropout, Input, Embedding, SpatialDropout1D, Conv1D,
+                                     GlobalMaxPooling1D)
 from Sentiment_Analysis.constants import *
 
+
+# Named architectures for ModelTrainerConfig.ARCHITECTURE. A builder returns the layers
+# up to the sigmoid output, which get_model adds for all of them; get_model also fixes the
+# input length when it builds the model. With mask_zero the padding id is masked out, so
+# the output does not depend on how much padding a row has.
+ARCHITECTURES = {}
+
+
+def register_architecture(name):
+    def register(builder):
+        ARCHITECTURES[name] = builder
+        return builder
+    return register
+
+
+@register_architecture("lstm")
+def lstm(max_words, embedding_dim, units, mask_zero=False):
+    """The original model. Its recurrent_dropout rules out the fused LSTM kernel."""
+    return [Embedding(max_words, embedding_dim, mask_zero=mask_zero),
+            SpatialDropout1D(0.2),
+            LSTM(units, dropout=0.2, recurrent_dropout=0.2)]
+
+
+@register_architecture("fused_lstm")
+def fused_lstm(max_words, embedding_dim, units, mask_zero=False):
+    """No recurrent dropout and default activations, so Keras can use the fused (cuDNN) kernel."""
+    return [Embedding(max_words, embedding_dim, mask_zero=mask_zero),
+            SpatialDropout1D(0.2),
+            LSTM(units, dropout=0.2)]
+
+
+@register_architecture("fused_gru")
+def fused_gru(max_words, embedding_dim, units, mask_zero=False):
+    """Like fused_lstm with three gates instead of four."""
+    return [Embedding(max_words, embedding_dim, mask_zero=mask_zero),
+            SpatialDropout1D(0.2),
+            GRU(units, dropout=0.2)]
+
+
+@register_architecture("cnn1d")
+def cnn1d(max_words, embedding_dim, units, mask_zero=False):
+    """One convolution over 5-word windows, max-pooled over time: no sequential steps at all."""
+    if mask_zero:
+        raise ValueError("cnn1d can't mask padding: its windows and pooling span the padded positions")
+    return [Embedding(max_words, embedding_dim),
+            SpatialDropout1D(0.2),
+            Conv1D(units, 5, padding="same", activation="relu"),
+            GlobalMaxPooling1D()]
+
+
+@register_architecture("pooled_embedding")
+def pooled_embedding(max_words, embedding_dim, units, mask_zero=False):
+    """Elementwise max over the word embeddings followed by one hidden layer. Unlike an average,
+    the max is not diluted by the padding, which would need masking."""
+    if mask_zero:
+        raise ValueError("pooled_embedding can't mask padding: the max is taken over the padded positions")
+    return [Embedding(max_words, embedding_dim),
+            GlobalMaxPooling1D(),
+            Dense(units, activation="relu"),
+            Dropout(0.2)]
+
+
 class ModelArchitecture:
 
-    def __init__(self):
-        pass
+    def __init__(self, architecture: str = MODEL_ARCHITECTURE, max_words: int = MAX_WORDS,
+                 embedding_dim: int = EMBEDDING_DIM, units: int = MODEL_UNITS):
+        if architecture not in ARCHITECTURES:
+            raise ValueError(f"Unknown model architecture {architecture!r}, expected one of {sorted(ARCHITECTURES)}")
+        self.architecture = architecture
+        self.max_words = max_words
+        self.embedding_dim = embedding_dim
+        self.units = units
+
 
-    
-    def get_model(self):
+    def get_model(self, input_length=MAX_LEN, mask_zero=False):
+        """
+        :param input_length: None for a model that takes batches of any sequence length
+        :param mask_zero: mask the padding id, so scores don't depend on the padded length;
+            only the recurrent architectures support it
+        """
         model = Sequential()
-        model.add(Embedding(MAX_WORDS, 100,input_length=MAX_LEN))
-        model.add(SpatialDropout1D(0.2))
-        model.add(LSTM(100,dropout=0.2,recurrent_dropout=0.2))
+        for layer in ARCHITECTURES[self.architecture](self.max_words, self.embedding_dim, self.units, mask_zero=mask_zero):
+            model.add(layer)
         model.add(Dense(1,activation=ACTIVATION))
-        #model.build(input_shape=(None, MAX_LEN))
+        # Built up front: resuming from a checkpoint loads weights before fit
+        model.build(input_shape=(None, input_length))
         model.summary()
 
         model.compile(loss=LOSS,optimizer=RMSprop(),metrics=METRICS)
 
-        return model
\ No newline at end of file
+        return model
@@ -0,0 +1,137 @@
+import os
+import json
+import numpy as np
+from Sentiment_Analysis.ml.shared_weights import SHARED_WEIGHTS_MANIFEST
+
+
+_PASS_THROUGH_LAYERS = ("SpatialDropout1D", "Dropout")
+
+
+def _sigmoid(x):
+    # tanh form never overflows in float32, unlike 1 / (1 + exp(-x))
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+_ACTIVATIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0),
+    "linear": lambda x: x,
+}
+
+
+def _activation(name: str):
+    if name not in _ACTIVATIONS:
+        raise ValueError(f"Activation '{name}' is not supported by the NumPy engine")
+    return _ACTIVATIONS[name]
+
+
+class NumpyLSTMClassifier:
+    """
+    TensorFlow-free forward pass of the Embedding -> LSTM -> Dense classifier.
+
+    Reads an ``export_shared_weights`` directory; the embedding table stays a read-only
+    memory map. Rows are pre-padded, and the LSTM state after ``p`` padding steps does
+    not depend on the text, so those states are computed once and every row only runs
+    the recurrence over its own tokens (for a masked embedding the state after padding
+    is zero). Scores match ``keras.models.load_model`` on the same MAX_LEN pre-padded
+    input up to float32 rounding.
+    """
+
+    def __init__(self, weights_dir: str):
+        with open(os.path.join(weights_dir, SHARED_WEIGHTS_MANIFEST)) as handle:
+            manifest = json.load(handle)
+        self.weights_dir = weights_dir
+        self.version = manifest["version"]
+
+        def load(spec, mmap_mode=None):
+            return [np.load(os.path.join(weights_dir, file_name), mmap_mode=mmap_mode) for file_name in spec["weights"]]
+
+        specs = [spec for spec in manifest["layers"] if spec["class_name"] not in _PASS_THROUGH_LAYERS]
+        names = [spec["class_name"] for spec in specs]
+        if len(specs) < 3 or names[0] != "Embedding" or names[1] != "LSTM" or set(names[2:]) != {"Dense"}:
+            raise ValueError(f"NumPy engine expects Embedding -> LSTM -> Dense layers, got {names}")
+        # A masked embedding skips the padding, so the state after it stays zero
+        self.mask_zero = bool(specs[0]["config"].get("mask_zero"))
+
+        self.embeddings = load(specs[0], mmap_mode="r")[0]
+
+        lstm = specs[1]["config"]
+        if lstm.get("return_sequences") or lstm.get("go_backwards") or lstm.get("stateful"):
+            raise ValueError("NumPy engine only supports a forward LSTM returning its last state")
+        weights = load(specs[1])
+        self.kernel = weights[0].astype(np.float32)
+        self.recurrent_kernel = weights[1].astype(np.float32)
+        self.bias = weights[2].astype(np.float32) if len(weights) > 2 else np.zeros(self.kernel.shape[1], np.float32)
+        self.units = self.recurrent_kernel.shape[0]
+        self._recurrent_activation = _activation(lstm.get("recurrent_activation", "sigmoid"))
+        self._cell_activation = _activation(lstm.get("activation", "tanh"))
+
+        self.head = []
+        for spec in specs[2:]:
+            weights = load(spec)
+            bias = weights[1] if len(weights) > 1 else np.zeros(weights[0].shape[1], np.float32)
+            self.head.append((weights[0].astype(np.float32), bias.astype(np.float32),
+                              _activation(spec["config"].get("activation", "linear"))))
+
+        # (h, c) after 0, 1, ... padding steps
+        zeros = np.zeros((1, self.units), np.float32)
+        self._pad_states_hc = (zeros, zeros)
+
+    def _step(self, x, h, c):
+        z = x @ self.kernel + h @ self.recurrent_kernel + self.bias
+        # Keras gate order: input, forget, cell candidate, output
+        i, f, g, o = np.split(z, 4, axis=1)
+        c = self._recurrent_activation(f) * c + self._recurrent_activation(i) * self._cell_activation(g)
+        h = self._recurrent_activation(o) * self._cell_activation(c)
+        return h, c
+
+    def _pad_states(self, steps: int):
+        """(h, c) after 0..steps padding tokens, extended on demand."""
+        pad_h, pad_c = self._pad_states_hc
+        known = len(pad_h) - 1
+        if steps <= known:
+            return pad_h, pad_c
+        if self.mask_zero:
+            zeros = np.zeros((steps + 1, self.units), np.float32)
+            pad_states = (zeros, zeros)
+        else:
+            pad_x = np.asarray(self.embeddings[0:1], dtype=np.float32)
+            h, c = pad_h[-1:], pad_c[-1:]
+            hs, cs = [pad_h], [pad_c]
+            for _ in range(steps - known):
+                h, c = self._step(pad_x, h, c)
+                hs.append(h)
+                cs.append(c)
+            pad_states = (np.concatenate(hs), np.concatenate(cs))
+        # Rebinding (never mutating) one tuple keeps concurrent readers safe
+        self._pad_states_hc = pad_states
+        return pad_states
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        """
+        :param padded: (n, max_len) int array of pre-padded token ids
+        :return: (n, 1) float32 scores, the same shape ``keras.Model.predict`` returns
+        """
+        ids = np.asarray(padded)
+        n, steps = ids.shape
+        non_pad = ids != 0
+        starts = np.where(non_pad.any(axis=1), non_pad.argmax(axis=1), steps)
+
+        # Sorted by first real token, the rows still inside their padding are always a suffix
+        order = np.argsort(starts, kind="stable")
+        ids, starts = ids[order], starts[order]
+        pad_h, pad_c = self._pad_states(steps)
+        h, c = pad_h[starts], pad_c[starts]
+
+        for t in range(int(starts[0]) if n else steps, steps):
+            active = int(np.searchsorted(starts, t, side="right"))
+            x = np.take(self.embeddings, ids[:active, t], axis=0)
+            h[:active], c[:active] = self._step(x, h[:active], c[:active])
+
+        x = h
+        for kernel, bias, activation in self.head:
+            x = activation(x @ kernel + bias)
+        scores = np.empty_like(x)
+        scores[order] = x
+        return scores
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import shutil
+from typing import Dict, List, Optional
+from tensorflow.keras.callbacks import BackupAndRestore, Callback, EarlyStopping, ModelCheckpoint
+from Sentiment_Analysis.constants import *
+
+
+class ResumableTraining(Callback):
+    """
+    Checkpointing, automatic resume and early stopping for one training run.
+
+    ``callbacks()`` and ``initial_epoch(epochs)`` go to ``fit``. After every epoch the model and optimizer are backed
+    up to ``directory`` together with the early-stopping state, the best val_loss
+    weights and the time each epoch took. A later ``fit`` with the same directory, after
+    a crash or an eviction, restores all of it and carries on from the next epoch, or
+    does nothing if the run had already finished. At the end the model is left with its
+    best val_loss weights, as EarlyStopping(restore_best_weights=True) would.
+
+    The directory is only removed by ``clear()``, once the trained model has been saved.
+    """
+
+    def __init__(self, directory: str, patience: int = EARLY_STOPPING_PATIENCE,
+                 min_delta: float = EARLY_STOPPING_MIN_DELTA, save_freq=TRAINING_CHECKPOINT_SAVE_FREQ):
+        super().__init__()
+        self.directory = directory
+        self.state_path = os.path.join(directory, "run_state.json")
+        self.best_weights_path = os.path.join(directory, "best.weights.h5")
+        self.early_stopping = EarlyStopping(monitor="val_loss", patience=patience, min_delta=min_delta, verbose=1)
+        self.best_checkpoint = ModelCheckpoint(self.best_weights_path, monitor="val_loss", save_best_only=True,
+                                               save_weights_only=True)
+        # double_checkpoint keeps the previous backup, so a kill while writing one is not fatal
+        self.backup = BackupAndRestore(os.path.join(directory, "backup"), save_freq=save_freq,
+                                       double_checkpoint=True, delete_checkpoint=False)
+        self.resumed_epoch = 0
+        self.epoch_seconds: List[float] = []
+        self.history: List[Dict] = []
+        self.stopped_early = False
+
+    def callbacks(self) -> list:
+        # Last, so on_epoch_end records the early-stopping state of the epoch just finished
+        callbacks = [self.backup, self.early_stopping, self.best_checkpoint, self]
+        state = self.load_state()
+        if state is not None and state["stopped_early"]:
+            # Restoring the backup would restart the finished run at its last epoch
+            callbacks.remove(self.backup)
+        return callbacks
+
+    def load_state(self) -> Optional[Dict]:
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as handle:
+            return json.load(handle)
+
+    def initial_epoch(self, epochs: int) -> int:
+        """
+        The epoch ``fit`` carries on from: the one after the last finished epoch, or
+        ``epochs`` when the run had stopped early and has none left.
+        """
+        state = self.load_state()
+        if state is None:
+            return 0
+        return epochs if state["stopped_early"] else state["epoch"]
+
+    def on_train_begin(self, logs=None):
+        state = self.load_state()
+        if state is None:
+            return
+        self.resumed_epoch = state["epoch"]
+        self.epoch_seconds = state["epoch_seconds"]
+        self.history = state["history"]
+        self.stopped_early = state["stopped_early"]
+        self.early_stopping.wait = state["wait"]
+        self.early_stopping.best = state["best"]
+        self.early_stopping.best_epoch = state["best_epoch"]
+        self.best_checkpoint.best = state["best"]
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_seconds.append(time.perf_counter() - self._started)
+        self.history.append({name: float(value) for name, value in (logs or {}).items()})
+        self.stopped_early = bool(self.model.stop_training)
+        state = {"epoch": epoch + 1, "epoch_seconds": self.epoch_seconds, "history": self.history,
+                 "stopped_early": self.stopped_early, "wait": self.early_stopping.wait,
+                 "best": None if self.early_stopping.best is None else float(self.early_stopping.best),
+                 "best_epoch": self.early_stopping.best_epoch}
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump(state, handle, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def on_train_end(self, logs=None):
+        if os.path.exists(self.best_weights_path):
+            self.model.load_weights(self.best_weights_path)
+
+    def report(self, epochs: int) -> Dict:
+        """What the run did, and the training time that resuming and early stopping saved."""
+        completed = len(self.epoch_seconds)
+        mean_epoch_seconds = sum(self.epoch_seconds) / completed if completed else 0.0
+        return {"epochs_requested": epochs, "epochs_completed": completed, "resumed_at_epoch": self.resumed_epoch,
+                "stopped_early": self.stopped_early,
+                "best_epoch": None if self.early_stopping.best is None else self.early_stopping.best_epoch + 1,
+                "best_val_loss": None if self.early_stopping.best is None else float(self.early_stopping.best),
+                "epoch_seconds": self.epoch_seconds,
+                "history": self.history,
+                # Epochs a restart did not have to train again
+                "seconds_saved_by_resume": sum(self.epoch_seconds[:self.resumed_epoch]),
+                # Epochs left unrun after the plateau, at the mean epoch time
+                "seconds_saved_by_early_stopping": (epochs - completed) * mean_epoch_seconds if self.stopped_early else 0.0}
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,15 @@
+import numpy as np
+
+
+def pad_sequences(sequences, maxlen: int, dtype="int32", value: int = 0) -> np.ndarray:
+    """
+    NumPy equivalent of ``keras.utils.pad_sequences`` with the defaults the models are
+    trained with: pre-padding and pre-truncation, i.e. every row keeps its last
+    ``maxlen`` ids and is left-filled with ``value``.
+    """
+    padded = np.full((len(sequences), maxlen), value, dtype=dtype)
+    for row, sequence in enumerate(sequences):
+        if len(sequence):
+            tail = sequence[-maxlen:]
+            padded[row, maxlen - len(tail):] = tail
+    return padded
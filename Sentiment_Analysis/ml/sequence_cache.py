@@ -0,0 +1,134 @@
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, List, Optional
+import numpy as np
+
+
+# Bump when the record layout changes so older cache entries are not read
+_FORMAT_VERSION = 1
+
+
+class SequenceShardWriter:
+    """Appends (label, padded ids) rows to consecutive TFRecord shards of ``shard_rows`` rows."""
+
+    def __init__(self, directory: str, split: str, dtype: str, shard_rows: int):
+        self.directory = directory
+        self.split = split
+        self.dtype = np.dtype(dtype)
+        self.shard_rows = shard_rows
+        self.shards: List[str] = []
+        self.rows = 0
+        self._writer = None
+        self._rows_in_shard = 0
+
+    def write(self, padded: np.ndarray, labels) -> None:
+        import tensorflow as tf
+
+        # One record per row: the label followed by the ids, all in the id dtype, so a
+        # batch of records decodes with a single decode_raw
+        records = np.column_stack([np.asarray(labels), padded]).astype(self.dtype)
+        for record in records:
+            if self._writer is None or self._rows_in_shard == self.shard_rows:
+                self.close()
+                name = f"{self.split}-{len(self.shards):05d}.tfrecord"
+                self._writer = tf.io.TFRecordWriter(os.path.join(self.directory, name))
+                self.shards.append(name)
+            self._writer.write(record.tobytes())
+            self._rows_in_shard += 1
+        self.rows += len(records)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._rows_in_shard = 0
+
+
+class SequenceCache:
+    """
+    Padded training sequences stored as sharded TFRecord files, so training can stream
+    batches through ``tf.data`` and later runs on the same data skip tokenizing and
+    padding altogether.
+
+    Each entry is a directory named after a fingerprint of the input file and of every
+    setting that shapes the sequences. The manifest is written last, so an entry without
+    one is an interrupted build and is rebuilt from scratch.
+    """
+
+    def __init__(self, cache_dir: str, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.path = os.path.join(cache_dir, fingerprint)
+        self.manifest_path = os.path.join(self.path, "manifest.json")
+
+    @staticmethod
+    def make_fingerprint(csv_path: str, **settings) -> str:
+        digest = hashlib.blake2b(digest_size=8)
+        with open(csv_path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(json.dumps({"format": _FORMAT_VERSION, **settings}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    @property
+    def manifest(self) -> Optional[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as handle:
+            return json.load(handle)
+
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def start(self) -> None:
+        """Clear whatever a previous, interrupted build left behind."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+
+    def writer(self, split: str, dtype: str, shard_rows: int) -> SequenceShardWriter:
+        return SequenceShardWriter(self.path, split, dtype, shard_rows)
+
+    def finish(self, writers: List[SequenceShardWriter], **manifest) -> Dict:
+        for writer in writers:
+            writer.close()
+        manifest = dict(manifest, fingerprint=self.fingerprint,
+                        shards={writer.split: writer.shards for writer in writers},
+                        rows={writer.split: writer.rows for writer in writers})
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump(manifest, handle, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        return manifest
+
+    def dataset(self, split: str, batch_size: int, shuffle_buffer: Optional[int] = None):
+        """
+        Batches of (int32 ids, float32 labels) read from the shards of ``split``, or None when
+        the split is empty. Shards are read and decoded in parallel and prefetched, so input
+        preparation overlaps with the training step; with ``shuffle_buffer`` the shard order
+        and the rows within the buffer are reshuffled every epoch.
+        """
+        import tensorflow as tf
+
+        manifest = self.manifest
+        files = [self.file(name) for name in manifest["shards"][split]]
+        if not files:
+            return None
+        width = manifest["max_len"] + 1
+        dtype = tf.as_dtype(manifest["dtype"])
+
+        def parse(records):
+            rows = tf.reshape(tf.io.decode_raw(records, dtype), [-1, width])
+            return tf.cast(rows[:, 1:], tf.int32), tf.cast(rows[:, 0], tf.float32)
+
+        dataset = tf.data.Dataset.from_tensor_slices(files)
+        if shuffle_buffer:
+            dataset = dataset.shuffle(len(files), reshuffle_each_iteration=True)
+        dataset = dataset.interleave(tf.data.TFRecordDataset, cycle_length=min(len(files), 4),
+                                     num_parallel_calls=tf.data.AUTOTUNE, deterministic=not shuffle_buffer)
+        if shuffle_buffer:
+            dataset = dataset.shuffle(shuffle_buffer, reshuffle_each_iteration=True)
+        dataset = dataset.batch(batch_size).map(parse, num_parallel_calls=tf.data.AUTOTUNE)
+        # The row count is known, so fit can show progress and end the epoch cleanly
+        batches = -(-manifest["rows"][split] // batch_size)
+        return dataset.apply(tf.data.experimental.assert_cardinality(batches)).prefetch(tf.data.AUTOTUNE)
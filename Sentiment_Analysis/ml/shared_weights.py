@@ -0,0 +1,112 @@
+import os
+import json
+import shutil
+import tempfile
+import h5py
+import numpy as np
+
+
+SHARED_WEIGHTS_MANIFEST = "manifest.json"
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def export_shared_weights(model_path: str, shared_weights_dir: str, version: str) -> str:
+    """
+    Dump the layer configs and weights of a Keras .h5 model as one .npy file per weight.
+
+    Only h5py is used, so this never initialises the TensorFlow runtime and is safe to
+    call in a process that forks afterwards. The export is written to a temporary
+    directory and renamed into ``<shared_weights_dir>/<version>``, which makes
+    concurrent exports of the same version race-free.
+
+    :return: directory holding the exported version
+    """
+    target_dir = os.path.join(shared_weights_dir, version)
+    if os.path.isfile(os.path.join(target_dir, SHARED_WEIGHTS_MANIFEST)):
+        return target_dir
+
+    os.makedirs(shared_weights_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{version}-", dir=shared_weights_dir)
+    try:
+        with h5py.File(model_path, "r") as handle:
+            model_config = json.loads(_decode(handle.attrs["model_config"]))
+            weights_group = handle["model_weights"] if "model_weights" in handle else handle
+
+            layers = []
+            for layer_config in model_config["config"]["layers"]:
+                if layer_config["class_name"] == "InputLayer":
+                    continue
+                name = layer_config["config"]["name"]
+                weight_names = weights_group[name].attrs.get("weight_names", []) if name in weights_group else []
+                weight_files = []
+                for index, weight_name in enumerate(weight_names):
+                    file_name = f"{name}__{index}.npy"
+                    np.save(os.path.join(tmp_dir, file_name), np.asarray(weights_group[name][_decode(weight_name)]))
+                    weight_files.append(file_name)
+                layers.append({
+                    "class_name": layer_config["class_name"],
+                    "config": layer_config["config"],
+                    "weights": weight_files,
+                })
+
+        with open(os.path.join(tmp_dir, SHARED_WEIGHTS_MANIFEST), "w") as handle:
+            json.dump({"version": version, "layers": layers}, handle)
+
+        try:
+            os.rename(tmp_dir, target_dir)
+        except OSError:
+            # Another process exported the same version first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return target_dir
+
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+class SharedWeightModel:
+    """
+    Inference model built from an ``export_shared_weights`` directory.
+
+    The embedding table, which is nearly all of the parameters, stays a read-only
+    memory map, so every process attached to the same export shares its pages. The
+    lookup runs in NumPy and only the layers after the embedding are built in Keras.
+    For a masked embedding the padding rows are zeroed and a Masking layer passes the
+    same mask on.
+    """
+
+    def __init__(self, weights_dir: str):
+        from tensorflow import keras
+
+        with open(os.path.join(weights_dir, SHARED_WEIGHTS_MANIFEST)) as handle:
+            manifest = json.load(handle)
+        self.weights_dir = weights_dir
+        self.version = manifest["version"]
+
+        layer_specs = manifest["layers"]
+        self.mask_zero = False
+        if layer_specs and layer_specs[0]["class_name"] == "Embedding":
+            self.embeddings = np.load(os.path.join(weights_dir, layer_specs[0]["weights"][0]), mmap_mode="r")
+            self.mask_zero = bool(layer_specs[0]["config"].get("mask_zero"))
+            layer_specs = layer_specs[1:]
+            input_layer = keras.Input(shape=(None, self.embeddings.shape[1]))
+        else:
+            self.embeddings = None
+            input_layer = keras.Input(shape=(None,))
+
+        layers = [getattr(keras.layers, spec["class_name"]).from_config(spec["config"]) for spec in layer_specs]
+        masking = [keras.layers.Masking(mask_value=0.0)] if self.mask_zero else []
+        self.model = keras.Sequential([input_layer] + masking + layers)
+        for layer, spec in zip(layers, layer_specs):
+            if spec["weights"]:
+                layer.set_weights([np.load(os.path.join(weights_dir, file_name)) for file_name in spec["weights"]])
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        padded = np.asarray(padded)
+        inputs = np.take(self.embeddings, padded, axis=0) if self.embeddings is not None else padded
+        if self.mask_zero:
+            inputs[padded == 0] = 0.0
+        return self.model.predict(inputs, batch_size=batch_size, verbose=verbose)
@@ -0,0 +1,18 @@
+import os
+from functools import lru_cache
+from typing import FrozenSet
+
+
+STOPWORDS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources")
+
+
+@lru_cache(maxsize=None)
+def load_stopwords(language: str = "english") -> FrozenSet[str]:
+    """
+    Stopwords bundled with the package, the same list as NLTK's ``stopwords.words(language)``.
+
+    Reading them from the package keeps process startup free of network I/O and of the
+    NLTK corpus download, and pins the list the tokenizer was trained with.
+    """
+    with open(os.path.join(STOPWORDS_DIR, f"{language}_stopwords.txt"), encoding="utf-8") as handle:
+        return frozenset(word for word in handle.read().split("\n") if word)
@@ -0,0 +1,54 @@
+import os
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+
+
+class TestMatrix:
+    """
+    The padded test split as two ``.npy`` files, ids and labels, read back memory-mapped so
+    any number of candidate models can be evaluated without tokenizing the test texts again.
+
+    Ids are uint16 while the vocabulary fits, int32 otherwise. The file names carry the
+    fingerprint of the vocabulary that produced the ids, so a matrix is only ever reused
+    with that vocabulary.
+    """
+
+    def __init__(self, directory: str, vocabulary_fingerprint: str):
+        self.ids_path = os.path.join(directory, TEST_MATRIX_FILE_NAME.format(vocabulary_fingerprint))
+        self.labels_path = os.path.join(directory, TEST_LABELS_FILE_NAME.format(vocabulary_fingerprint))
+
+    def exists(self) -> bool:
+        return os.path.exists(self.ids_path) and os.path.exists(self.labels_path)
+
+    def build(self, x_test_path: str, y_test_path: str, vocabulary: Vocabulary, max_len: int = MAX_LEN,
+              chunk_size: int = TRAINING_READ_CHUNK_SIZE) -> "TestMatrix":
+        """
+        Tokenize and pad the test CSVs written by ModelTrainer, a chunk at a time, straight
+        into a memory-mapped file. Missing texts become empty, as in training.
+        """
+        labels = pd.read_csv(y_test_path, index_col=0)[LABEL].to_numpy(dtype=np.int8)
+        dtype = np.uint16 if vocabulary.num_words <= np.iinfo(np.uint16).max + 1 else np.int32
+        # Written under temporary names and renamed, ids last, so exists() never sees a partial matrix
+        tmp_ids_path = f"{self.ids_path}.{os.getpid()}.tmp.npy"
+        tmp_labels_path = f"{self.labels_path}.{os.getpid()}.tmp.npy"
+        ids = np.lib.format.open_memmap(tmp_ids_path, mode="w+", dtype=dtype, shape=(len(labels), max_len))
+        row = 0
+        for chunk in pd.read_csv(x_test_path, index_col=0, chunksize=chunk_size):
+            texts = chunk[TWEET].fillna("").astype(str)
+            ids[row:row + len(texts)] = pad_sequences(vocabulary.texts_to_sequences(texts), maxlen=max_len, dtype=dtype)
+            row += len(texts)
+        if row != len(labels):
+            raise ValueError(f"{x_test_path} has {row} rows but {y_test_path} has {len(labels)}")
+        ids.flush()
+        del ids
+        np.save(tmp_labels_path, labels)
+        os.replace(tmp_labels_path, self.labels_path)
+        os.replace(tmp_ids_path, self.ids_path)
+        return self
+
+    def load(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.load(self.ids_path, mmap_mode="r"), np.load(self.labels_path, mmap_mode="r")
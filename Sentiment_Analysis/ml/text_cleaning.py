@@ -0,0 +1,37 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+
+
+_worker_text_normalizer = None
+
+
+def clean_texts(texts) -> List[str]:
+    """
+    Apply ``TextNormalizer.normalize`` (concat_data_cleaning) to a list of texts, with
+    the character passes vectorized over the list and stemming done per token.
+
+    Module-level so process pools can pickle it; each worker process builds its own
+    TextNormalizer once and reuses it for every chunk it receives.
+    """
+    global _worker_text_normalizer
+    if _worker_text_normalizer is None:
+        _worker_text_normalizer = TextNormalizer()
+    return _worker_text_normalizer.normalize_many(texts)
+
+
+def clean_in_chunks(texts: list, chunk_size: int, workers: int,
+                    text_normalizer: Optional[TextNormalizer] = None) -> List[str]:
+    """
+    Clean ``texts`` in chunks of ``chunk_size`` spread over up to ``workers`` spawned
+    processes, or in this process when there is at most one chunk. Chunks come back in
+    submission order, so the result is the same as cleaning row by row.
+    """
+    workers = min(workers, -(-len(texts) // chunk_size))
+    if workers <= 1:
+        return (text_normalizer or TextNormalizer()).normalize_many(texts)
+
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return [text for chunk in pool.map(clean_texts, chunks) for text in chunk]
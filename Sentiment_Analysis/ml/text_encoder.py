@@ -0,0 +1,87 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+
+
+class TextEncoder:
+    """
+    Raw text to model input in one stage: cleaning, stopword filtering, stemming, the
+    tokenizer's own filtering and the id lookup, written straight into a pre-padded id
+    buffer.
+
+    The cleaned text is split once and every word goes through a memoized
+    word -> id tuple table, so the stemmed text is never joined, re-split by the
+    tokenizer or copied by ``pad_sequences``. Because the tokenizer maps characters and
+    splits on spaces, tokenizing each stem on its own gives exactly the ids of
+    tokenizing the joined text, so rows match
+    ``pad_sequences(vocabulary.texts_to_sequences([normalizer.normalize(text)]))``.
+    """
+
+    def __init__(self, text_normalizer: TextNormalizer, vocabulary: Vocabulary, max_len: int = MAX_LEN,
+                 cache_size: int = STEM_CACHE_SIZE):
+        self.text_normalizer = text_normalizer
+        self.vocabulary = vocabulary
+        self.max_len = max_len
+        # Ids below 65536 fit in half the memory of the int32 pad_sequences default
+        self.dtype = np.uint16 if vocabulary.num_words <= np.iinfo(np.uint16).max + 1 else np.int32
+        self._word_ids = lru_cache(maxsize=cache_size)(self._word_ids_uncached)
+        self._token_ids = lru_cache(maxsize=cache_size)(self._token_ids_uncached)
+
+    def _token_ids_uncached(self, token: str) -> Tuple[int, ...]:
+        """Ids the tokenizer gives one space-free token of normalized text."""
+        return tuple(self.vocabulary.texts_to_sequences([token])[0])
+
+    def _word_ids_uncached(self, word: str) -> Tuple[int, ...]:
+        """Ids of one word of cleaned, not yet stemmed text; empty for stopwords."""
+        if word in self.text_normalizer.stopwords:
+            return ()
+        return self._token_ids(self.text_normalizer.stem(word))
+
+    def ids(self, text) -> List[int]:
+        word_ids = self._word_ids
+        ids = []
+        for word in self.text_normalizer.clean(text).split(' '):
+            ids.extend(word_ids(word))
+        return ids
+
+    def cleaned_ids(self, cleaned_text: str) -> List[int]:
+        """Like ``ids`` for text that already went through ``TextNormalizer.normalize``."""
+        token_ids = self._token_ids
+        ids = []
+        for token in cleaned_text.split(' '):
+            ids.extend(token_ids(token))
+        return ids
+
+    def allocate(self, rows: int) -> np.ndarray:
+        """A zeroed (rows, max_len) buffer to pass as ``out``."""
+        return np.zeros((rows, self.max_len), dtype=self.dtype)
+
+    def _fill(self, id_lists, count: int, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None:
+            out = self.allocate(count)
+        else:
+            out = out[:count]
+            out.fill(0)
+        max_len = self.max_len
+        for row, ids in enumerate(id_lists):
+            if ids:
+                # Pre-truncation and pre-padding, like pad_sequences' defaults
+                tail = ids[-max_len:]
+                out[row, max_len - len(tail):] = tail
+        return out
+
+    def encode_batch(self, texts, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        :param texts: raw texts
+        :param out: optional (>= len(texts), max_len) buffer to reuse across batches
+        :return: (len(texts), max_len) pre-padded ids, a view of ``out`` when given
+        """
+        texts = list(texts)
+        return self._fill(map(self.ids, texts), len(texts), out)
+
+    def encode_cleaned_batch(self, cleaned_texts, out: Optional[np.ndarray] = None) -> np.ndarray:
+        cleaned_texts = list(cleaned_texts)
+        return self._fill(map(self.cleaned_ids, cleaned_texts), len(cleaned_texts), out)
@@ -0,0 +1,118 @@
+import re
+import string
+import hashlib
+from functools import cached_property, lru_cache
+from importlib.metadata import version
+from typing import List
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.stopwords import load_stopwords
+
+
+_BRACKETS = re.compile(r'\[.*?\]')
+_URLS = re.compile(r'https?://\S+|www\.\S+')
+_TAGS = re.compile(r'<.*?>+')
+_DIGIT = re.compile(r'\d')
+_WORDS_WITH_DIGITS = re.compile(r'\w*\d\w*')
+# Punctuation and newlines are single characters deleted outright, so one translate pass
+# removes both and gives the same result as the two re.sub calls it replaces.
+_DELETE_CHARS = str.maketrans('', '', string.punctuation + '\n')
+# The same passes for pandas' pyarrow string kernels. RE2 matches \w, \d and \s in ASCII
+# only, so the classes are spelled out as Python's re matches them in ASCII text; on ASCII
+# text these give exactly the substitutions above.
+_ASCII_WHITESPACE = '\\t\\n\\x0b\\x0c\\r\\x1c-\\x1f '
+_ASCII_PASSES = (
+    r'\[.*?\]',
+    rf'https?://[^{_ASCII_WHITESPACE}]+|www\.[^{_ASCII_WHITESPACE}]+',
+    r'<.*?>+',
+    '[' + ''.join('\\' + char for char in string.punctuation) + '\\n]',
+    r'[A-Za-z0-9_]*[0-9][A-Za-z0-9_]*',
+)
+
+
+class TextNormalizer:
+    """
+    The tweet cleaning of ``DataTransformation.concat_data_cleaning``, set up once.
+
+    Output is byte-identical to the original sequence of substitutions: the regex passes
+    still run in the same order, but each is skipped when the text cannot contain a match,
+    punctuation and newlines go in a single ``str.translate``, stopword filtering and
+    stemming share one split, and stems are memoized per word.
+    """
+
+    def __init__(self, language: str = "english", stem_cache_size: int = STEM_CACHE_SIZE):
+        self.language = language
+        self.stopwords = load_stopwords(language)
+        self.stem = lru_cache(maxsize=stem_cache_size)(self._stem_uncached)
+
+    @cached_property
+    def stemmer(self):
+        # Importing nltk loads scipy and scikit-learn, so it waits for the first word to stem
+        from nltk.stem.snowball import SnowballStemmer
+        return SnowballStemmer(self.language)
+
+    def _stem_uncached(self, word: str) -> str:
+        return self.stemmer.stem(word)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        Changes whenever the output could: with this module's code, the stopword list,
+        the stemmer language or the NLTK release.
+        """
+        digest = hashlib.sha256()
+        with open(__file__, "rb") as handle:
+            digest.update(handle.read())
+        digest.update("\n".join(sorted(self.stopwords)).encode("utf-8"))
+        digest.update(f"{self.language}:{version('nltk')}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def clean(self, text) -> str:
+        """Everything before stopword filtering and stemming: lowercase, regex passes, deletions."""
+        text = str(text).lower()
+        if '[' in text:
+            text = _BRACKETS.sub('', text)
+        if 'http' in text or 'www.' in text:
+            text = _URLS.sub('', text)
+        if '<' in text:
+            text = _TAGS.sub('', text)
+        text = text.translate(_DELETE_CHARS)
+        if _DIGIT.search(text):
+            text = _WORDS_WITH_DIGITS.sub('', text)
+        return text
+
+    def clean_many(self, texts) -> List[str]:
+        """
+        ``clean`` over many texts. ASCII texts go through pandas' pyarrow string kernels,
+        one vectorized pass per substitution; the others are cleaned one by one, since
+        Unicode lowercasing and word characters are only guaranteed to match Python's there.
+        """
+        import numpy as np
+        import pandas as pd
+
+        texts = [str(text) for text in texts]
+        series = pd.Series(texts, dtype="string[pyarrow]")
+        ascii_rows = series.str.isascii().to_numpy(dtype=bool)
+        cleaned = series[ascii_rows].str.lower()
+        for pattern in _ASCII_PASSES:
+            cleaned = cleaned.str.replace(pattern, '', regex=True)
+
+        result = np.empty(len(texts), dtype=object)
+        result[ascii_rows] = cleaned.to_numpy(dtype=object)
+        for row in np.flatnonzero(~ascii_rows).tolist():
+            result[row] = self.clean(texts[row])
+        return result.tolist()
+
+    def normalize_cleaned(self, cleaned_text: str) -> str:
+        """Stopword filtering and stemming of text that went through ``clean``."""
+        stopwords = self.stopwords
+        stem = self.stem
+        return " ".join([stem(word) for word in cleaned_text.split(' ') if word not in stopwords])
+
+    def normalize(self, text) -> str:
+        return self.normalize_cleaned(self.clean(text))
+
+    def normalize_many(self, texts) -> List[str]:
+        """``normalize`` over many texts, with the character passes vectorized."""
+        return [self.normalize_cleaned(cleaned_text) for cleaned_text in self.clean_many(texts)]
+
+    __call__ = normalize
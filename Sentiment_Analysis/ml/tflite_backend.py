@@ -0,0 +1,119 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from Sentiment_Analysis.constants import *
+
+try:
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    Interpreter = None
+
+
+TFLITE_QUANTIZATIONS = ("float32", "float16", "int8")
+
+
+def model_version(model_path: str) -> str:
+    """Short content hash of a model file; the version the registry serves it under."""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def tflite_file_name(version: str, quantization: str) -> str:
+    """Name of the flatbuffer exported from model version ``version``, locally and in the bucket."""
+    return f"{version}_{quantization}.tflite"
+
+
+def _inference_clone(model, max_len: int = MAX_LEN):
+    """
+    Copy of ``model`` with unrolled recurrent layers and their dropout disabled.
+
+    Keras' looped LSTM (always the case with recurrent_dropout) lowers to TensorList
+    ops that the TFLite builtin op set only supports for a static batch size. Unrolled
+    over MAX_LEN it becomes plain fully-connected ops that XNNPACK runs at any batch size.
+    """
+    from tensorflow import keras
+
+    layers = []
+    for layer in model.layers:
+        config = layer.get_config()
+        if isinstance(layer, (keras.layers.LSTM, keras.layers.GRU)):
+            config.update(unroll=True, dropout=0.0, recurrent_dropout=0.0)
+        layers.append(type(layer).from_config(config))
+    clone = keras.Sequential([keras.Input(shape=(max_len,))] + layers)
+    for cloned, original in zip(layers, model.layers):
+        cloned.set_weights(original.get_weights())
+    return clone
+
+
+def convert_to_tflite(model, quantization: str = "float32", max_len: int = MAX_LEN) -> bytes:
+    """
+    Convert a Keras classifier to a TFLite flatbuffer.
+
+    :param quantization: "float32", "float16" (float16 weights) or "int8" (dynamic-range
+        int8 weights, float activations)
+    """
+    import tensorflow as tf
+
+    if quantization not in TFLITE_QUANTIZATIONS:
+        raise ValueError(f"Unknown TFLite quantization '{quantization}', expected one of {TFLITE_QUANTIZATIONS}")
+    converter = tf.lite.TFLiteConverter.from_keras_model(_inference_clone(model, max_len))
+    if quantization != "float32":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    return converter.convert()
+
+
+def save_tflite(model, path: str, quantization: str = "float32") -> str:
+    """Convert and write atomically, so concurrent readers never see a partial file."""
+    content = convert_to_tflite(model, quantization)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
+    return path
+
+
+class TFLiteModel:
+    """
+    Runs a TFLite flatbuffer behind the same ``predict`` call as a Keras model.
+
+    Interpreters are not thread-safe, so every inference thread gets its own, all built
+    from the same in-memory flatbuffer.
+    """
+
+    def __init__(self, model_path: str, num_threads: int = TF_INTRA_OP_THREADS):
+        with open(model_path, "rb") as handle:
+            self.model_content = handle.read()
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self._local = threading.local()
+
+    def _interpreter(self):
+        interpreter = getattr(self._local, "interpreter", None)
+        if interpreter is None:
+            if Interpreter is not None:
+                interpreter = Interpreter(model_content=self.model_content, num_threads=self.num_threads)
+            else:
+                import tensorflow as tf
+                interpreter = tf.lite.Interpreter(model_content=self.model_content, num_threads=self.num_threads)
+            self._local.interpreter = interpreter
+            self._local.shape = None
+        return interpreter
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        interpreter = self._interpreter()
+        input_detail = interpreter.get_input_details()[0]
+        inputs = np.asarray(padded, dtype=input_detail["dtype"])
+        if self._local.shape != inputs.shape:
+            interpreter.resize_tensor_input(input_detail["index"], inputs.shape)
+            interpreter.allocate_tensors()
+            self._local.shape = inputs.shape
+        interpreter.set_tensor(input_detail["index"], inputs)
+        interpreter.invoke()
+        return interpreter.get_tensor(interpreter.get_output_details()[0]["index"]).copy()
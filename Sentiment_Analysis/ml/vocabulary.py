@@ -0,0 +1,182 @@
+import os
+import json
+import pickle
+import hashlib
+from itertools import chain, islice
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+class _PickledTokenizer:
+    """Attribute holder a pickled Keras ``Tokenizer`` is restored into."""
+
+
+class _TokenizerUnpickler(pickle.Unpickler):
+    # Keras 2 pickled the class as keras.preprocessing.text.Tokenizer, Keras 3 as
+    # keras.src.legacy.preprocessing.text.Tokenizer; neither needs to be importable
+    def find_class(self, module, name):
+        if name == "Tokenizer" and module.endswith("preprocessing.text"):
+            return _PickledTokenizer
+        return super().find_class(module, name)
+
+
+class Vocabulary:
+    """
+    The part of a fitted Keras ``Tokenizer`` that inference needs, without TensorFlow.
+
+    Only the words whose index is below ``num_words`` are kept, together with the
+    tokenizer's filters/lower/split settings, so ``texts_to_sequences`` gives the same
+    ids as the Keras tokenizer it was built from.
+
+    Everything lives in one uint8 ``.npy`` file: a JSON header line, the int32 word ids,
+    then the UTF-8 words grouped by byte length, each group a sorted array of
+    fixed-width keys with no padding. Words are looked up with ``np.searchsorted`` in the
+    group of their length. ``load`` memory-maps the file and takes views of these arrays,
+    so loading reads only the header and processes serving the same file share its pages.
+    """
+
+    def __init__(self, words: List[str], filters: str, lower: bool = True, split: str = " ",
+                 oov_token=None):
+        """:param words: the kept words in rank order; the id of a word is its rank, from 1"""
+        encoded = [word.encode("utf-8") for word in words]
+        if not all(encoded):
+            raise ValueError("A vocabulary can't hold an empty word")
+        order = sorted(range(len(encoded)), key=lambda index: (len(encoded[index]), encoded[index]))
+        lengths = [len(encoded[index]) for index in order]
+        settings = {"filters": filters, "lower": lower, "split": split, "oov_token": oov_token, "size": len(order),
+                    "lengths": [[length, lengths.count(length)] for length in sorted(set(lengths))]}
+        ids = np.array(order, dtype="<i4") + 1
+        self._attach(np.frombuffer(self._header(settings) + ids.tobytes() + b"".join(encoded[index] for index in order),
+                                   dtype=np.uint8))
+
+    @staticmethod
+    def _header(settings: dict) -> bytes:
+        # json.dumps escapes newlines, so the first one ends the header; the ids start 4-byte aligned
+        header = json.dumps(settings, ensure_ascii=False).encode("utf-8") + b"\n"
+        return header + b" " * (-len(header) % 4)
+
+    def _attach(self, blob: np.ndarray) -> None:
+        head = bytes(blob[:1 << 16])
+        header_end = head.index(b"\n") + 1
+        settings = json.loads(head[:header_end])
+        self._blob_array = blob
+        self.filters = settings["filters"]
+        self.lower = settings["lower"]
+        self.split = settings["split"]
+        self.oov_token = settings["oov_token"]
+        self.num_words = settings["size"] + 1
+
+        ids_start = header_end + -header_end % 4
+        offset = ids_start + 4 * settings["size"]
+        ids = blob[ids_start:offset].view("<i4")
+        # byte length -> (sorted keys of that length, their ids)
+        self._groups: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        row = 0
+        for length, count in settings["lengths"]:
+            self._groups[length] = (blob[offset:offset + length * count].view(f"S{length}"), ids[row:row + count])
+            offset += length * count
+            row += count
+        if offset != len(blob) or row != settings["size"]:
+            raise ValueError(f"Vocabulary holds {len(blob)} bytes, its header describes {offset}")
+
+        self._oov_index = None
+        if self.oov_token is not None:
+            self._oov_index = int(self._find([self.oov_token])[0]) or None
+        self._translate_map = str.maketrans({char: self.split for char in self.filters})
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer) -> "Vocabulary":
+        num_words = tokenizer.num_words or len(tokenizer.word_index) + 1
+        words = [word for word, index in sorted(tokenizer.word_index.items(), key=lambda item: item[1])
+                 if index < num_words]
+        return cls(words, filters=tokenizer.filters, lower=tokenizer.lower, split=tokenizer.split,
+                   oov_token=tokenizer.oov_token)
+
+    @classmethod
+    def from_tokenizer_pickle(cls, path: str) -> "Vocabulary":
+        """
+        Convert a pickled Keras ``Tokenizer`` without importing Keras, so pickles written
+        by any Keras version convert in any environment.
+        """
+        with open(path, "rb") as handle:
+            return cls.from_tokenizer(_TokenizerUnpickler(handle).load())
+
+    @property
+    def words(self) -> List[str]:
+        """The kept words in rank order."""
+        words = [None] * (self.num_words - 1)
+        for keys, ids in self._groups.values():
+            for key, index in zip(keys.tolist(), ids.tolist()):
+                words[index - 1] = key.decode("utf-8")
+        return words
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of everything that decides the ids, to key data tokenized with this vocabulary."""
+        return hashlib.blake2b(self._blob_array.tobytes(), digest_size=8).hexdigest()
+
+    def save(self, path: str) -> str:
+        """Write atomically, so a serving process never maps a half-written file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, np.asarray(self._blob_array))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Vocabulary":
+        vocabulary = cls.__new__(cls)
+        vocabulary._attach(np.load(path, mmap_mode="r"))
+        return vocabulary
+
+    def _find(self, words: List[str]) -> np.ndarray:
+        """Ids of ``words`` as an int32 array, 0 where a word is not in the vocabulary."""
+        ids = np.zeros(len(words), dtype=np.int32)
+        encoded = [word.encode("utf-8") for word in words]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        for length in np.unique(lengths).tolist():
+            if length not in self._groups:
+                continue
+            keys, group_ids = self._groups[length]
+            rows = np.flatnonzero(lengths == length)
+            queries = np.array([encoded[row] for row in rows.tolist()], dtype=keys.dtype)
+            positions = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+            found = keys[positions] == queries
+            ids[rows[found]] = group_ids[positions[found]]
+        return ids
+
+    def text_to_word_sequence(self, text: str) -> List[str]:
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._translate_map).split(self.split) if word]
+
+    def lookup(self, words: List[str]) -> np.ndarray:
+        """
+        Ids of already split words as an int32 array; words outside the vocabulary are
+        dropped, or mapped to the OOV id when the tokenizer had one.
+        """
+        ids = self._find(words)
+        if self._oov_index is None:
+            return ids[ids != 0]
+        ids[ids == 0] = self._oov_index
+        return ids
+
+    def texts_to_sequences(self, texts, chunk_size: int = 4096) -> List[List[int]]:
+        ids_of = {}
+        oov_index = self._oov_index
+        sequences = []
+        texts = iter(texts)
+        # Chunked, so only one chunk's word lists are alive at a time
+        while True:
+            word_lists = [self.text_to_word_sequence(text) for text in islice(texts, chunk_size)]
+            if not word_lists:
+                return sequences
+            # One search per word length for the words the batch hasn't met yet
+            new_words = [word for word in dict.fromkeys(chain.from_iterable(word_lists)) if word not in ids_of]
+            ids_of.update(zip(new_words, self._find(new_words).tolist()))
+            get = ids_of.get
+            for words in word_lists:
+                if oov_index is None:
+                    sequences.append([index for index in map(get, words) if index])
+                else:
+                    sequences.append([get(word) or oov_index for word in words])
@@ -0,0 +1,120 @@
+import heapq
+import multiprocessing
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import List, Optional
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+
+
+def count_words(texts: List[str], filters: str, lower: bool, split: str) -> Counter:
+    """
+    Word counts of one shard, in order of first occurrence like ``Tokenizer.word_counts``.
+
+    Module-level so process pools can pickle it. Lowercasing and the filter translation
+    work per character, so the shard is split on ``split`` first and each distinct token
+    is lowercased, translated and re-split once, with its words weighted by how often the
+    token occurs. A word first appears inside the first occurrence of some token, so
+    walking the tokens in first-occurrence order keeps the words in that order too.
+    """
+    translate_map = str.maketrans({char: split for char in filters})
+    counts = Counter()
+    for token, occurrences in Counter(split.join(texts).split(split)).items():
+        if lower:
+            token = token.lower()
+        for word in token.translate(translate_map).split(split):
+            if word:
+                counts[word] += occurrences
+    return counts
+
+
+class VocabularyBuilder:
+    """
+    ``Tokenizer(num_words).fit_on_texts`` for large corpora: word frequencies are counted
+    over shards of SHARD_SIZE texts in WORKERS spawned processes and merged.
+
+    Shards are merged in corpus order, so the merged counts keep the first-occurrence
+    order of a single pass, and words are ranked with the same stable sort by descending
+    count; ties therefore break exactly as in Keras and the index is identical.
+    Document frequencies (``word_docs``, only used by ``sequences_to_matrix(mode="tfidf")``)
+    are not counted.
+    """
+
+    def __init__(self, num_words: Optional[int] = MAX_WORDS, workers: int = VOCABULARY_WORKERS,
+                 shard_size: int = VOCABULARY_SHARD_SIZE, filters: str = TOKENIZER_FILTERS,
+                 lower: bool = True, split: str = " "):
+        self.num_words = num_words
+        self.workers = workers
+        self.shard_size = shard_size
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self.word_counts = Counter()
+        self.document_count = 0
+
+    def count(self, texts) -> Counter:
+        texts = list(texts)
+        shards = [texts[start:start + self.shard_size] for start in range(0, len(texts), self.shard_size)]
+        return self.count_shards(shards, workers=min(self.workers, len(shards)))
+
+    def count_shards(self, shards, workers: Optional[int] = None) -> Counter:
+        """
+        Count an iterable of text lists, e.g. chunks streamed from disk. At most two shards
+        per worker are in flight, so memory does not grow with the length of the stream.
+        """
+        workers = self.workers if workers is None else workers
+        counter = partial(count_words, filters=self.filters, lower=self.lower, split=self.split)
+        word_counts = Counter()
+        document_count = 0
+        if workers <= 1:
+            for shard in shards:
+                document_count += len(shard)
+                word_counts.update(counter(shard))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                # Results are merged in submission order, which is what keeps ties in corpus order
+                pending = deque()
+                for shard in shards:
+                    document_count += len(shard)
+                    pending.append(pool.submit(counter, shard))
+                    if len(pending) >= 2 * workers:
+                        word_counts.update(pending.popleft().result())
+                while pending:
+                    word_counts.update(pending.popleft().result())
+        self.word_counts = word_counts
+        self.document_count = document_count
+        return word_counts
+
+    def fit(self, texts) -> Vocabulary:
+        """Count ``texts`` and return the words a ``Tokenizer(num_words)`` would keep."""
+        self.count(texts)
+        return self.vocabulary()
+
+    def fit_shards(self, shards) -> Vocabulary:
+        self.count_shards(shards)
+        return self.vocabulary()
+
+    def vocabulary(self) -> Vocabulary:
+        if self.num_words is None:
+            ranked = self.ranked_words()
+        else:
+            # nlargest is documented to equal sorted(..., reverse=True)[:n], stability included
+            ranked = [word for word, _ in heapq.nlargest(max(self.num_words - 1, 0), self.word_counts.items(),
+                                                        key=itemgetter(1))]
+        return Vocabulary(ranked, filters=self.filters, lower=self.lower, split=self.split)
+
+    def ranked_words(self) -> List[str]:
+        return [word for word, _ in sorted(self.word_counts.items(), key=itemgetter(1), reverse=True)]
+
+    def to_tokenizer(self):
+        """A Keras ``Tokenizer`` holding the same counts and full word index as one fitted on the corpus."""
+        from tensorflow.keras.preprocessing.text import Tokenizer
+
+        tokenizer = Tokenizer(num_words=self.num_words, filters=self.filters, lower=self.lower, split=self.split)
+        tokenizer.word_counts = OrderedDict(self.word_counts)
+        tokenizer.document_count = self.document_count
+        tokenizer.word_index = {word: index for index, word in enumerate(self.ranked_words(), start=1)}
+        tokenizer.index_word = {index: word for word, index in tokenizer.word_index.items()}
+        return tokenizer
@@ -0,0 +1,138 @@
+import sys
+import time
+import asyncio
+from collections import Counter
+from typing import Callable, List, Optional
+from concurrent.futures import Executor
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.exception import CustomException
+
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent single-text predictions into one forward pass.
+
+    A batch is flushed as soon as it holds ``max_batch_size`` texts or ``max_wait_ms``
+    has passed since its first text arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[str]], list],
+                 max_batch_size: int = SCHEDULER_MAX_BATCH_SIZE,
+                 max_wait_ms: float = SCHEDULER_MAX_WAIT_MS,
+                 executor: Optional[Executor] = None):
+        """
+        :param predict_fn: blocking function scoring a list of texts, results in input order
+        :param max_batch_size: upper bound on texts per forward pass
+        :param max_wait_ms: longest time the first text of a batch waits for company
+        :param executor: executor running predict_fn, None uses the loop default
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self._batch_sizes = Counter()
+        self._requests = 0
+        self._batches = 0
+        self._queue_wait_total = 0.0
+        self._inference_total = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logging.info(f"MicroBatchScheduler started with max_batch_size={self.max_batch_size} "
+                     f"max_wait_ms={self.max_wait * 1000}")
+
+    async def stop(self) -> None:
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        logging.info("MicroBatchScheduler stopped")
+
+    async def submit(self, text: str) -> dict:
+        """Queue one text and wait for its prediction."""
+        if not self.is_running:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without yielding to the loop
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            remaining = deadline - time.perf_counter()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            batch = [item for item in batch if not item[1].cancelled()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            texts = [text for text, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.predict_fn, texts)
+            except Exception as e:
+                logging.error(f"MicroBatchScheduler batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(CustomException(e, sys))
+                continue
+            finished = time.perf_counter()
+
+            for (_, future, queued_at), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+            self._batches += 1
+            self._requests += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            self._queue_wait_total += sum(started - queued_at for _, _, queued_at in batch)
+            self._inference_total += finished - started
+
+    def stats(self) -> dict:
+        """Queue depth and batch-size figures for tuning max_batch_size/max_wait_ms."""
+        batches = self._batches or 1
+        requests = self._requests or 1
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "requests": self._requests,
+            "batches": self._batches,
+            "mean_batch_size": self._requests / batches,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "mean_queue_wait_ms": self._queue_wait_total / requests * 1000,
+            "mean_inference_ms": self._inference_total / batches * 1000,
+        }
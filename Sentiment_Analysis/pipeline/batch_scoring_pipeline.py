@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.ml.text_cleaning import clean_texts
+from Sentiment_Analysis.entity.config_entity import BatchScoringConfig
+from Sentiment_Analysis.entity.artifact_entity import BatchScoringArtifacts
+from Sentiment_Analysis.pipeline.prediction_pipeline import PredictionPipeline
+
+
+class BatchScoringPipeline:
+    """
+    Score a CSV/JSONL/Parquet file with the served model and write Parquet part files.
+
+    The input is read in chunks of CHUNK_SIZE rows. Each chunk is cleaned across a
+    process pool, scored in large batches and written as ``part-<chunk>.parquet``. After
+    every part a progress file records the last completed chunk and the model version,
+    so a rerun with the same model resumes from the first chunk that was not written
+    and a rerun with another model scores everything again.
+    """
+
+    STAGES = ("read", "clean", "inference", "write")
+
+    def __init__(self, batch_scoring_config: BatchScoringConfig, prediction_pipeline: PredictionPipeline = None):
+        self.batch_scoring_config = batch_scoring_config
+        self.prediction_pipeline = prediction_pipeline or PredictionPipeline()
+        self.stage_seconds = {stage: 0.0 for stage in self.STAGES}
+        self.stage_rows = {stage: 0 for stage in self.STAGES}
+
+    def read_chunks(self, skip_chunks: int = 0):
+        """
+        Yield DataFrames of at most CHUNK_SIZE rows, whatever the input format, starting
+        after the first ``skip_chunks`` chunks. Skipped rows are never turned into
+        DataFrames: CSV rows are skipped by the parser, JSONL lines before parsing and
+        Parquet row groups before decoding.
+        """
+        path = self.batch_scoring_config.INPUT_PATH
+        chunk_size = self.batch_scoring_config.CHUNK_SIZE
+        extension = os.path.splitext(path)[1].lower()
+        skip_rows = skip_chunks * chunk_size
+
+        if extension == ".csv":
+            # Counted in records rather than lines, so quoted newlines don't shift the chunks
+            for chunk in pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1)):
+                # Skipping every row leaves a header-only chunk
+                if len(chunk):
+                    yield chunk
+        elif extension in (".jsonl", ".ndjson", ".json"):
+            # read_json chunks by lines as well, blank ones included
+            with open(path, encoding="utf-8") as handle:
+                for _ in itertools.islice(handle, skip_rows):
+                    pass
+                yield from pd.read_json(handle, lines=True, chunksize=chunk_size)
+        elif extension == ".parquet":
+            parquet_file = pq.ParquetFile(path)
+            metadata = parquet_file.metadata
+            first_row_group = 0
+            while (first_row_group < metadata.num_row_groups
+                   and metadata.row_group(first_row_group).num_rows <= skip_rows):
+                skip_rows -= metadata.row_group(first_row_group).num_rows
+                first_row_group += 1
+            batches = parquet_file.iter_batches(batch_size=chunk_size,
+                                                row_groups=range(first_row_group, metadata.num_row_groups))
+            for table in self._rebatched(batches, skip_rows, chunk_size):
+                yield table.to_pandas()
+        else:
+            raise ValueError(f"Unsupported input format '{extension}', expected csv, jsonl or parquet")
+
+    @staticmethod
+    def _rebatched(batches, skip_rows: int, chunk_size: int):
+        """Tables of ``chunk_size`` rows from ``batches`` after dropping their first ``skip_rows`` rows."""
+        pending = []
+        pending_rows = 0
+        for batch in batches:
+            if skip_rows:
+                dropped = min(skip_rows, batch.num_rows)
+                batch = batch.slice(dropped)
+                skip_rows -= dropped
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            while pending_rows >= chunk_size:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, chunk_size)
+                rest = table.slice(chunk_size)
+                pending = rest.to_batches()
+                pending_rows = rest.num_rows
+        if pending_rows:
+            yield pa.Table.from_batches(pending)
+
+    def load_progress(self, model_version: str) -> int:
+        """Number of chunks already written by a previous run of the same input with the same model."""
+        progress_path = self.batch_scoring_config.PROGRESS_FILE_PATH
+        if not self.batch_scoring_config.RESUME or not os.path.isfile(progress_path):
+            return 0
+        with open(progress_path) as handle:
+            progress = json.load(handle)
+        same_run = (progress.get("input_path") == os.path.abspath(self.batch_scoring_config.INPUT_PATH)
+                    and progress.get("chunk_size") == self.batch_scoring_config.CHUNK_SIZE)
+        if not same_run:
+            logging.warning("Progress file belongs to a different input or chunk size, starting over")
+            return 0
+        if progress.get("model_version") != model_version:
+            logging.warning(f"Progress file was written with model version {progress.get('model_version')}, "
+                            f"not {model_version}, starting over")
+            return 0
+        return progress["completed_chunks"]
+
+    def save_progress(self, completed_chunks: int, rows_scored: int, model_version: str) -> None:
+        progress_path = self.batch_scoring_config.PROGRESS_FILE_PATH
+        tmp_path = progress_path + ".tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump({
+                "input_path": os.path.abspath(self.batch_scoring_config.INPUT_PATH),
+                "chunk_size": self.batch_scoring_config.CHUNK_SIZE,
+                "model_version": model_version,
+                "completed_chunks": completed_chunks,
+                "rows_scored": rows_scored,
+            }, handle)
+        os.replace(tmp_path, progress_path)
+
+    def _timed(self, stage: str, rows: int, started: float) -> None:
+        self.stage_seconds[stage] += time.perf_counter() - started
+        self.stage_rows[stage] += rows
+
+    def rows_per_second(self) -> dict:
+        return {stage: self.stage_rows[stage] / self.stage_seconds[stage] if self.stage_seconds[stage] else 0.0
+                for stage in self.STAGES}
+
+    def clean_chunk(self, pool: ProcessPoolExecutor, texts: list) -> list:
+        workers = self.batch_scoring_config.CLEAN_WORKERS
+        step = max(1, -(-len(texts) // workers))
+        pieces = [texts[start:start + step] for start in range(0, len(texts), step)]
+        return [text for piece in pool.map(clean_texts, pieces) for text in piece]
+
+    def write_chunk(self, chunk: pd.DataFrame, chunk_index: int) -> str:
+        part_path = os.path.join(self.batch_scoring_config.OUTPUT_DIR, f"part-{chunk_index:05d}.parquet")
+        tmp_path = part_path + ".tmp"
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False), tmp_path)
+        os.replace(tmp_path, part_path)
+        return part_path
+
+    def run_pipeline(self) -> BatchScoringArtifacts:
+        logging.info("Entered the run_pipeline method of BatchScoringPipeline class")
+        try:
+            config = self.batch_scoring_config
+            os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+            # Parts scored by another model version can't be mixed with this run's
+            model_version = self.prediction_pipeline.model_registry.get().version
+            completed_chunks = self.load_progress(model_version)
+            if completed_chunks:
+                logging.info(f"Resuming after {completed_chunks} completed chunks")
+
+            rows_scored = 0
+            chunks_written = 0
+            pool = ProcessPoolExecutor(max_workers=config.CLEAN_WORKERS,
+                                       mp_context=multiprocessing.get_context("spawn"))
+            try:
+                chunks = self.read_chunks(skip_chunks=completed_chunks)
+                chunk_index = completed_chunks
+                while True:
+                    started = time.perf_counter()
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    self._timed("read", len(chunk), started)
+
+                    started = time.perf_counter()
+                    cleaned = self.clean_chunk(pool, chunk[config.TEXT_COLUMN].tolist())
+                    self._timed("clean", len(chunk), started)
+
+                    started = time.perf_counter()
+                    predictions = self.prediction_pipeline.predict_cleaned_batch(
+                        cleaned, batch_size=config.INFERENCE_BATCH_SIZE)
+                    chunk = chunk.assign(label=[p["label"] for p in predictions],
+                                         score=[p["score"] for p in predictions])
+                    self._timed("inference", len(chunk), started)
+
+                    started = time.perf_counter()
+                    self.write_chunk(chunk, chunk_index)
+                    chunk_index += 1
+                    rows_scored += len(chunk)
+                    chunks_written += 1
+                    self.save_progress(chunk_index, rows_scored, model_version)
+                    self._timed("write", len(chunk), started)
+
+                    logging.info(f"Scored chunk {chunk_index - 1} ({len(chunk)} rows), rows/sec per stage: "
+                                 f"{self.rows_per_second()}")
+            finally:
+                pool.shutdown()
+
+            batch_scoring_artifacts = BatchScoringArtifacts(
+                output_dir=config.OUTPUT_DIR,
+                rows_scored=rows_scored,
+                chunks_written=chunks_written,
+                chunks_skipped=completed_chunks,
+                rows_per_second=self.rows_per_second()
+            )
+            logging.info(f"Exited the run_pipeline method of BatchScoringPipeline class: {batch_scoring_artifacts}")
+            return batch_scoring_artifacts
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Score a CSV/JSONL/Parquet file with the current model.")
+    parser.add_argument("input_path")
+    parser.add_argument("output_dir", help="directory receiving part-*.parquet files")
+    parser.add_argument("--text-column", default=TWEET)
+    parser.add_argument("--chunk-size", type=int, default=BATCH_SCORING_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=BATCH_SCORING_CLEAN_WORKERS,
+                        help="processes used for text cleaning")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SCORING_INFERENCE_BATCH_SIZE,
+                        help="texts per model forward pass")
+    parser.add_argument("--no-resume", action="store_true", help="ignore an existing progress file")
+    args = parser.parse_args(argv)
+
+    config = BatchScoringConfig(input_path=args.input_path, output_dir=args.output_dir,
+                                text_column=args.text_column, chunk_size=args.chunk_size,
+                                clean_workers=args.workers, inference_batch_size=args.batch_size,
+                                resume=not args.no_resume)
+    artifacts = BatchScoringPipeline(config).run_pipeline()
+    print(f"Scored {artifacts.rows_scored} rows into {artifacts.output_dir} "
+          f"({artifacts.chunks_skipped} chunks resumed)")
+    for stage, rate in artifacts.rows_per_second.items():
+        print(f"{stage:>10}: {rate:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
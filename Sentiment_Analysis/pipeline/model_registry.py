@@ -0,0 +1,319 @@
+import os
+import sys
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.configuration.gcloud_syncer import GCloudSync
+from Sentiment_Analysis.ml.shared_weights import export_shared_weights, SharedWeightModel
+from Sentiment_Analysis.ml.tflite_backend import TFLiteModel, model_version, save_tflite, tflite_file_name
+from Sentiment_Analysis.ml.numpy_engine import NumpyLSTMClassifier
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.ml.text_encoder import TextEncoder
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything a prediction needs, loaded once and never mutated afterwards."""
+    model: Any
+    tokenizer: Any
+    text_normalizer: TextNormalizer
+    model_path: str
+    version: str
+    bucketed_model: Optional[Any] = None
+    text_encoder: Optional[TextEncoder] = None
+
+
+class ModelRegistry:
+    """
+    Process-wide holder of the served model, tokenizer and cleaning resources.
+
+    Readers call ``get()`` and keep the returned bundle for the whole request, so a
+    concurrent ``reload()`` only swaps the reference and never pulls weights out from
+    under an in-flight prediction.
+    """
+
+    def __init__(self, model_dir: str = PREDICTION_MODEL_DIR, model_name: str = MODEL_NAME,
+                 tokenizer_path: str = TOKENIZER_PATH, bucket_name: str = BUCKET_NAME,
+                 shared_weights_dir: Optional[str] = None, backend: str = INFERENCE_BACKEND,
+                 vocabulary_path: str = VOCABULARY_PATH, version_file: Optional[str] = None):
+        """
+        :param shared_weights_dir: when set, weights are exported there once per model version
+            and attached as read-only memory maps instead of being loaded per process
+        :param backend: "keras", "tflite" or "numpy"; "numpy" serves without importing TensorFlow
+        :param vocabulary_path: compact vocabulary written by training; converted once from
+            the tokenizer pickle when it is missing or older than the pickle
+        :param version_file: when set, the version every reload publishes, so that processes
+            serving the same model directory follow it with ``follow_version_file``
+        """
+        self.model_dir = model_dir
+        self.model_name = model_name
+        self.tokenizer_path = tokenizer_path
+        self.bucket_name = bucket_name
+        self.shared_weights_dir = shared_weights_dir
+        self.backend = backend
+        self.vocabulary_path = vocabulary_path
+        self.version_file = version_file
+        self._followed_version = None
+        self.gcloud = GCloudSync()
+        self._tokenizer = None
+        self._tokenizer_mtime = None
+        self._text_normalizer = None
+        self._bundle: Optional[ModelBundle] = None
+        self._swap_listeners: List[Callable[[ModelBundle], None]] = []
+        self._warm_up_hooks: List[Callable[[ModelBundle], None]] = []
+        # Serialises loads/swaps; readers never take it.
+        self._load_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._bundle is not None
+
+    @property
+    def model_path(self) -> str:
+        return os.path.join(self.model_dir, self.model_name)
+
+    def add_swap_listener(self, listener: Callable[[ModelBundle], None]) -> None:
+        """Call ``listener(new_bundle)`` every time a different model version is published."""
+        self._swap_listeners.append(listener)
+
+    def add_warm_up_hook(self, hook: Callable[[ModelBundle], None]) -> None:
+        """Call ``hook(bundle)`` on every freshly built bundle before it is published."""
+        self._warm_up_hooks.append(hook)
+
+    def get_model_from_gcloud(self, force: bool = False) -> str:
+        """
+        Make sure a model file exists locally and return its path.
+
+        With ``force`` the model is downloaded into a staging directory first and only
+        moved over the served file once the download produced a file, so a failed
+        ``gsutil cp`` never leaves a truncated model.h5 behind.
+        """
+        logging.info("Entered the get_model_from_gcloud method of ModelRegistry class")
+        try:
+            if not force and os.path.isfile(self.model_path):
+                logging.info("Model found locally, skipping download.")
+                return self.model_path
+
+            logging.info("Downloading model from Google Cloud Storage...")
+            staging_dir = os.path.join(self.model_dir, PREDICTION_STAGING_DIR)
+            os.makedirs(staging_dir, exist_ok=True)
+            staged_model_path = os.path.join(staging_dir, self.model_name)
+            if os.path.isfile(staged_model_path):
+                os.remove(staged_model_path)
+
+            self.gcloud.sync_folder_from_gcloud(self.bucket_name, self.model_name, staging_dir)
+            if not os.path.isfile(staged_model_path):
+                raise FileNotFoundError(f"Model file not found after syncing: {staged_model_path}")
+
+            os.replace(staged_model_path, self.model_path)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            logging.info("Exited the get_model_from_gcloud method of ModelRegistry class")
+            return self.model_path
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    @staticmethod
+    def _file_version(path: str) -> str:
+        return model_version(path)
+
+    def _load_tokenizer(self) -> Vocabulary:
+        if os.path.isfile(self.tokenizer_path):
+            pickle_mtime = os.path.getmtime(self.tokenizer_path)
+            if not os.path.isfile(self.vocabulary_path) or os.path.getmtime(self.vocabulary_path) < pickle_mtime:
+                logging.info(f"Writing {self.vocabulary_path} from {self.tokenizer_path}")
+                Vocabulary.from_tokenizer_pickle(self.tokenizer_path).save(self.vocabulary_path)
+
+        mtime = os.path.getmtime(self.vocabulary_path)
+        if self._tokenizer is None or mtime != self._tokenizer_mtime:
+            self._tokenizer = Vocabulary.load(self.vocabulary_path)
+            self._tokenizer_mtime = mtime
+        return self._tokenizer
+
+    def _load_text_normalizer(self) -> TextNormalizer:
+        if self._text_normalizer is None:
+            self._text_normalizer = TextNormalizer()
+        return self._text_normalizer
+
+    def preload(self) -> str:
+        """
+        Fetch the model and load everything that does not start the TensorFlow runtime.
+
+        Used by the pre-fork server: forked workers inherit the tokenizer and cleaning
+        resources and, in shared-weights mode, attach to the exported weights.
+        """
+        try:
+            with self._load_lock:
+                model_path = self.get_model_from_gcloud()
+                self._load_tokenizer()
+                # Stemming once imports nltk here, so forked workers inherit it
+                self._load_text_normalizer().normalize("warm up")
+                version = self._file_version(model_path)
+                if self.shared_weights_dir is not None:
+                    export_shared_weights(model_path, self.shared_weights_dir, version)
+                if self.version_file is not None:
+                    self.publish_version(version)
+            return model_path
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def _load_tflite(self, model_path: str, version: str) -> TFLiteModel:
+        """
+        Serve the flatbuffer the training pipeline exported for this model version, and
+        only convert model.h5 here when that quantization was not pushed.
+        """
+        file_name = tflite_file_name(version, TFLITE_QUANTIZATION)
+        tflite_path = os.path.join(self.model_dir, file_name)
+        if not os.path.isfile(tflite_path):
+            # Staged like the model, so a failed download never leaves a partial flatbuffer
+            staging_dir = os.path.join(self.model_dir, PREDICTION_STAGING_DIR)
+            os.makedirs(staging_dir, exist_ok=True)
+            self.gcloud.sync_folder_from_gcloud(self.bucket_name, file_name, staging_dir)
+            staged_path = os.path.join(staging_dir, file_name)
+            if os.path.isfile(staged_path):
+                os.replace(staged_path, tflite_path)
+                logging.info(f"Downloaded the exported {file_name}")
+        if not os.path.isfile(tflite_path):
+            logging.info(f"No exported {file_name}, converting {model_path} to {TFLITE_QUANTIZATION} TFLite")
+            from tensorflow import keras
+            save_tflite(keras.models.load_model(model_path), tflite_path, TFLITE_QUANTIZATION)
+        return TFLiteModel(tflite_path)
+
+    def _build_bundle(self, model_path: str) -> ModelBundle:
+        logging.info(f"Loading model bundle from {model_path}")
+        version = self._file_version(model_path)
+        bucketed_model = None
+        if self.backend == "numpy":
+            # Skips each row's padding on its own, so it needs no length buckets
+            model = NumpyLSTMClassifier(export_shared_weights(model_path, self.shared_weights_dir or NUMPY_MODEL_DIR,
+                                                              version))
+        else:
+            from tensorflow import keras
+            from Sentiment_Analysis.ml.length_buckets import LengthBucketedPredictor
+
+            if self.backend == "tflite":
+                model = self._load_tflite(model_path, version)
+            elif self.shared_weights_dir is not None:
+                weights_dir = export_shared_weights(model_path, self.shared_weights_dir, version)
+                model = SharedWeightModel(weights_dir)
+            else:
+                model = keras.models.load_model(model_path)
+            if INFERENCE_LENGTH_BUCKETING and LengthBucketedPredictor.supports(model):
+                bucketed_model = LengthBucketedPredictor(model)
+        tokenizer = self._load_tokenizer()
+        text_normalizer = self._load_text_normalizer()
+        return ModelBundle(
+            model=model,
+            bucketed_model=bucketed_model,
+            tokenizer=tokenizer,
+            text_normalizer=text_normalizer,
+            text_encoder=TextEncoder(text_normalizer, tokenizer),
+            model_path=model_path,
+            version=version
+        )
+
+    def _load(self, force_download: bool = False):
+        """Build and publish a bundle; the caller holds ``_load_lock``. Returns (bundle, previous)."""
+        model_path = self.get_model_from_gcloud(force=force_download)
+        bundle = self._build_bundle(model_path)
+        # Readers only ever see a bundle whose shapes are already traced
+        for hook in self._warm_up_hooks:
+            hook(bundle)
+        previous = self._bundle
+        self._bundle = bundle
+        return bundle, previous
+
+    def _published(self, bundle: ModelBundle, previous: Optional[ModelBundle]) -> None:
+        if previous is None:
+            logging.info(f"Model registry loaded version {bundle.version}")
+        else:
+            logging.info(f"Model registry swapped version {previous.version} -> {bundle.version}")
+        if previous is not None and previous.version != bundle.version:
+            for listener in self._swap_listeners:
+                listener(bundle)
+
+    def load(self, force_download: bool = False) -> ModelBundle:
+        """Load (or re-load) the bundle and atomically publish it."""
+        try:
+            with self._load_lock:
+                bundle, previous = self._load(force_download)
+            self._published(bundle, previous)
+            return bundle
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def reload(self) -> ModelBundle:
+        """Fetch the latest pushed model.h5 and hot-swap it in; the old bundle keeps serving on failure."""
+        bundle = self.load(force_download=True)
+        if self.version_file is not None:
+            self.publish_version(bundle.version)
+        return bundle
+
+    def publish_version(self, version: str) -> None:
+        os.makedirs(os.path.dirname(self.version_file) or ".", exist_ok=True)
+        tmp_path = f"{self.version_file}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as handle:
+            handle.write(version)
+        os.replace(tmp_path, self.version_file)
+
+    def follow_version_file(self) -> Optional[ModelBundle]:
+        """
+        Load the local model file when ``version_file`` names a version other than the one
+        served, i.e. another process reloaded it. Each published version is followed once it
+        loaded successfully; a failed load is retried on the next call.
+        """
+        try:
+            if self.version_file is None or not os.path.isfile(self.version_file):
+                return None
+            with open(self.version_file) as handle:
+                version = handle.read().strip()
+            bundle = self._bundle
+            # Still warming up: that load reads the current file anyway
+            if bundle is None or version in (bundle.version, self._followed_version):
+                return None
+            logging.info(f"Model version {version} was published, following it from {bundle.version}")
+            followed = self.load()
+            self._followed_version = version
+            return followed
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+    def get(self) -> ModelBundle:
+        bundle = self._bundle
+        if bundle is not None:
+            return bundle
+        try:
+            # Checked and loaded under one acquisition, so concurrent cold callers load once
+            with self._load_lock:
+                bundle = self._bundle
+                loaded = bundle is None
+                if loaded:
+                    bundle, previous = self._load()
+            if loaded:
+                self._published(bundle, previous)
+            return bundle
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
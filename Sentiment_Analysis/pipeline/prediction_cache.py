@@ -0,0 +1,100 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Hashable, Tuple
+from Sentiment_Analysis.constants import *
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction scores with a time-to-live.
+
+    Keys are expected to carry the model version next to the cleaned text. A key that is
+    being computed is tracked as a pending Future, so concurrent identical requests wait
+    for the first computation instead of running their own.
+    """
+
+    HIT = "hit"
+    WAIT = "wait"
+    OWNER = "owner"
+
+    def __init__(self, max_entries: int = PREDICTION_CACHE_SIZE, ttl_seconds: float = PREDICTION_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def lookup(self, key: Hashable):
+        """
+        Return ``(HIT, score)``, ``(WAIT, future)`` when another caller is computing the key,
+        or ``(OWNER, future)`` when the caller must compute it and call ``set``/``fail``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, score = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self.HIT, score
+                del self._entries[key]
+                self.expirations += 1
+
+            future = self._pending.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return self.WAIT, future
+
+            future = Future()
+            self._pending[key] = future
+            self.misses += 1
+            return self.OWNER, future
+
+    def set(self, key: Hashable, score: float) -> None:
+        with self._lock:
+            future = self._pending.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, score)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        if future is not None:
+            future.set_result(score)
+
+    def fail(self, key: Hashable, error: BaseException) -> None:
+        with self._lock:
+            future = self._pending.pop(key, None)
+        if future is not None:
+            future.set_exception(error)
+
+    def clear(self) -> None:
+        """Drop every cached score, e.g. after the model was hot-swapped."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "pending": len(self._pending),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            }
@@ -1,57 +1,27 @@
-import os
-import io
 import sys
-from tensorflow import keras
-import pickle
-from PIL import Image
+import time
+import numpy as np
 from Sentiment_Analysis.logger import logging
 from Sentiment_Analysis.constants import *
 from Sentiment_Analysis.exception import CustomException
-from tensorflow.keras.preprocessing.sequence import pad_sequences  
-from Sentiment_Analysis.configuration.gcloud_syncer import GCloudSync
-from Sentiment_Analysis.components.data_transforamation import DataTransformation
-from Sentiment_Analysis.entity.config_entity import DataTransformationConfig
-from Sentiment_Analysis.entity.artifact_entity import DataIngestionArtifacts
+from Sentiment_Analysis.pipeline.model_registry import ModelRegistry, get_model_registry
+from Sentiment_Analysis.pipeline.prediction_cache import PredictionCache
 
 
 class PredictionPipeline:
-    def __init__(self):
-        self.bucket_name = BUCKET_NAME
-        self.model_name = MODEL_NAME
-        self.model_path = os.path.join("artifacts", "PredictModel")
-        self.gcloud = GCloudSync()
-
-         # Provide actual paths here
-        imbalance_data_path = os.path.join("artifacts", "data", "imbalance.csv")
-        raw_data_path = os.path.join("artifacts", "data", "raw.csv")
-
-        data_ingestion_artifacts = DataIngestionArtifacts(
-            imbalance_data_file_path=imbalance_data_path,
-            raw_data_file_path=raw_data_path
-        )
-        self.data_transformation = DataTransformation(data_transformation_config= DataTransformationConfig(),data_ingestion_artifacts=data_ingestion_artifacts)
+    def __init__(self, model_registry: ModelRegistry = None, prediction_cache: PredictionCache = None):
+        self.model_registry = model_registry or get_model_registry()
+        self.prediction_cache = prediction_cache or PredictionCache()
+        # Scores of the previous model must not outlive a hot-swap
+        self.model_registry.add_swap_listener(lambda bundle: self.prediction_cache.clear())
+        self.model_registry.add_warm_up_hook(self.warm_up)
 
 
     
     def get_model_from_gcloud(self) -> str:
         logging.info("Entered the get_model_from_gcloud method of PredictionPipeline class")
         try:
-            # Path to model directory
-            model_dir_path = self.model_path  # e.g., 'artifacts/PredictModel'
-            # Full path to model file inside model_dir_path
-            best_model_path = os.path.join(model_dir_path, self.model_name)  # e.g., 'artifacts/PredictModel/model.h5'
-
-            # Check if directory exists and model file exists inside it
-            if not os.path.exists(model_dir_path) or not os.path.isfile(best_model_path):
-                logging.info("Model not found locally, downloading from Google Cloud Storage...")
-                os.makedirs(model_dir_path, exist_ok=True)
-                self.gcloud.sync_folder_from_gcloud(self.bucket_name, self.model_name, model_dir_path)
-                # Check again if file exists after sync
-                if not os.path.isfile(best_model_path):
-                    raise FileNotFoundError(f"Model file not found after syncing: {best_model_path}")
-            else:
-                logging.info("Model found locally, skipping download.")
-
+            best_model_path = self.model_registry.get_model_from_gcloud()
             logging.info("Exited the get_model_from_gcloud method of PredictionPipeline class")
             return best_model_path
 
@@ -61,41 +31,144 @@ class PredictionPipeline:
 
 
     
-    def predict(self,best_model_path,text):
-        """load image, returns cuda tensor"""
+    def predict(self,text):
         logging.info("Running the predict function")
         try:
-            
-            load_model=keras.models.load_model(best_model_path)
-            with open('tokenizer.pickle', 'rb') as handle:
-                load_tokenizer = pickle.load(handle)
-            
-            text=self.data_transformation.concat_data_cleaning(text)
-            text = [text]            
-            print(text)
-            seq = load_tokenizer.texts_to_sequences(text)
-            padded = pad_sequences(seq, maxlen=300)
-            print(seq)
-            pred = load_model.predict(padded)
-            
-            print("pred", pred)
-            if pred>0.5:
-
-                print("hate and abusive")
-                return "hate and abusive"
-            else:
-                print("no hate")
-                return "no hate"
+            prediction = self.predict_batch([text])[0]
+            return prediction["label"]
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+
+    def predict_batch(self, texts, batch_size: int = PREDICTION_BATCH_SIZE):
+        """
+        Score many texts with one model.predict call per chunk. Each chunk is cleaned and
+        looked up in the prediction cache first; only the texts it misses are encoded and
+        run through the model.
+
+        :param texts: iterable of raw texts
+        :param batch_size: number of texts per forward pass
+        :return: list of {"label", "score"} dicts in input order
+        """
+        logging.info("Running the predict_batch function")
+        try:
+            # One bundle per call, so a concurrent hot-swap can't mix model and tokenizer versions
+            bundle = self.model_registry.get()
+            normalize = bundle.text_normalizer.normalize
+            texts = list(texts)
+            predictions = []
+            buffer = bundle.text_encoder.allocate(min(batch_size, len(texts)))
+
+            for start in range(0, len(texts), batch_size):
+                cleaned_texts = [normalize(text) for text in texts[start:start + batch_size]]
+                predictions.extend(self._score_cleaned(bundle, cleaned_texts, buffer))
+
+            logging.info(f"Scored {len(texts)} texts with model version {bundle.version}")
+            return predictions
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+    def predict_cleaned_batch(self, cleaned_texts, batch_size: int = PREDICTION_BATCH_SIZE):
+        """
+        Like predict_batch for texts that already went through concat_data_cleaning.
+
+        :return: list of {"label", "score"} dicts in input order
+        """
+        try:
+            bundle = self.model_registry.get()
+            cleaned_texts = list(cleaned_texts)
+            predictions = []
+            buffer = bundle.text_encoder.allocate(min(batch_size, len(cleaned_texts)))
+            for start in range(0, len(cleaned_texts), batch_size):
+                predictions.extend(self._score_cleaned(bundle, cleaned_texts[start:start + batch_size], buffer))
+            return predictions
         except Exception as e:
             raise CustomException(e, sys) from e
 
+
+    def _score_cleaned(self, bundle, cleaned_texts, buffer):
+        """
+        Scores for cleaned texts, cached by (model version, cleaned text). Only the texts
+        nobody has scored yet are encoded into ``buffer`` and run through the model.
+        """
+        scores = [None] * len(cleaned_texts)
+        owned = {}
+        waiting = []
+        for index, cleaned_text in enumerate(cleaned_texts):
+            key = (bundle.version, cleaned_text)
+            status, value = self.prediction_cache.lookup(key)
+            if status == PredictionCache.HIT:
+                scores[index] = value
+            elif status == PredictionCache.OWNER:
+                owned[key] = [index]
+            elif key in owned:
+                owned[key].append(index)
+            else:
+                waiting.append((index, value))
+
+        if owned:
+            keys = list(owned)
+            try:
+                padded = bundle.text_encoder.encode_cleaned_batch([key[1] for key in keys], out=buffer)
+                computed = self._forward(bundle, padded)
+            except Exception as e:
+                for key in keys:
+                    self.prediction_cache.fail(key, e)
+                raise
+            for key, score in zip(keys, computed):
+                score = float(score)
+                self.prediction_cache.set(key, score)
+                for index in owned[key]:
+                    scores[index] = score
+
+        # Only wait for other callers after our own keys are published, so no two batches block each other
+        for index, future in waiting:
+            scores[index] = future.result()
+
+        return [self.to_prediction(score) for score in scores]
+
+
+    @staticmethod
+    def _forward(bundle, padded):
+        if bundle.bucketed_model is not None:
+            # Runs each length bucket only over its own bound, same scores as MAX_LEN pre-padding
+            return bundle.bucketed_model.predict_padded(padded)
+        return bundle.model.predict(padded.astype(np.int32), batch_size=len(padded), verbose=0)[:, 0]
+
+
+    def warm_up(self, bundle, batch_sizes=WARMUP_BATCH_SIZES) -> float:
+        """
+        Run dummy batches through a bundle at the common batch sizes and, when bucketed, at
+        every bucket length, so TensorFlow traces those shapes before real traffic does.
+        Bypasses the prediction cache.
+
+        :return: seconds spent warming up
+        """
+        started = time.perf_counter()
+        bundle.text_normalizer.normalize("warm up")
+        lengths = bundle.bucketed_model.bounds if bundle.bucketed_model is not None else [MAX_LEN]
+        for batch_size in batch_sizes:
+            for length in lengths:
+                padded = bundle.text_encoder.allocate(batch_size)
+                padded[:, MAX_LEN - length:] = 1
+                self._forward(bundle, padded)
+        seconds = time.perf_counter() - started
+        logging.info(f"Warmed up model version {bundle.version} for batch sizes {list(batch_sizes)} in {seconds:.2f}s")
+        return seconds
+
+
+    @staticmethod
+    def to_prediction(score: float) -> dict:
+        label = HATE_LABEL if score > PREDICTION_THRESHOLD else NO_HATE_LABEL
+        return {"label": label, "score": score}
+
     
     def run_pipeline(self,text):
         logging.info("Entered the run_pipeline method of PredictionPipeline class")
         try:
-
-            best_model_path: str = self.get_model_from_gcloud() 
-            predicted_text = self.predict(best_model_path,text)
+            predicted_text = self.predict(text)
             logging.info("Exited the run_pipeline method of PredictionPipeline class")
             return predicted_text
         except Exception as e:
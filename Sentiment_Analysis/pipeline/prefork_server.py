@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import select
+import asyncio
+import uvicorn
+from typing import Dict, List
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.pipeline.model_registry import ModelRegistry
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """
+    RSS, PSS and USS of a process in MiB, read from /proc (Linux only).
+
+    RSS counts shared pages in full for every process, PSS splits them between the
+    processes mapping them and USS is what the process alone would free on exit.
+    """
+    memory = {"rss_mib": 0.0, "pss_mib": 0.0, "uss_mib": 0.0}
+    with open(f"/proc/{pid}/smaps_rollup") as handle:
+        for line in handle:
+            field, _, value = line.partition(":")
+            if not value.strip().endswith("kB"):
+                continue
+            kib = int(value.split()[0])
+            if field == "Rss":
+                memory["rss_mib"] += kib / 1024
+            elif field == "Pss":
+                memory["pss_mib"] += kib / 1024
+            elif field in ("Private_Clean", "Private_Dirty"):
+                memory["uss_mib"] += kib / 1024
+    return memory
+
+
+class _WorkerServer(uvicorn.Server):
+    """
+    uvicorn server that tells the parent once the app is ready: after its startup hooks
+    and, for apps exposing a ``state.warmed_up`` event, once the model is warmed up.
+    """
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=sockets)
+        warmed_up = getattr(getattr(self.config.app, "state", None), "warmed_up", None)
+        if warmed_up is None:
+            os.write(self.ready_fd, b"1")
+        else:
+            # Keep serving /healthz while waiting
+            self._ready_task = asyncio.ensure_future(self._report_when_warm(warmed_up))
+
+    async def _report_when_warm(self, warmed_up: asyncio.Event) -> None:
+        await warmed_up.wait()
+        os.write(self.ready_fd, b"1")
+
+
+class PreforkServer:
+    """
+    Serve an ASGI app from N forked uvicorn workers sharing one listening socket.
+
+    The parent fetches the model, loads the tokenizer and cleaning resources and exports
+    the weights to a memory-mapped directory before forking, without starting the
+    TensorFlow runtime. Workers inherit everything copy-on-write and attach to the
+    weight files read-only, so resident memory grows sublinearly with worker count.
+
+    A ``/reload`` lands on one worker only. It publishes the new version to
+    ``version_file``, which the other workers poll and follow.
+    """
+
+    def __init__(self, app, model_registry: ModelRegistry, workers: int = SERVING_WORKERS,
+                 host: str = APP_HOST, port: int = APP_PORT,
+                 shared_weights_dir: str = SHARED_WEIGHTS_DIR, version_file: str = SERVED_VERSION_FILE):
+        self.app = app
+        self.model_registry = model_registry
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.shared_weights_dir = shared_weights_dir
+        self.version_file = version_file
+        self.children: List[int] = []
+        self._shutting_down = False
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, sock: socket.socket, ready_fd: int) -> int:
+        pid = os.fork()
+        if pid != 0:
+            return pid
+
+        # Worker process
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            config = uvicorn.Config(self.app, host=self.host, port=self.port)
+            _WorkerServer(config, ready_fd).run(sockets=[sock])
+        except BaseException as e:
+            logging.error(f"Prefork worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _wait_ready(self, ready_fd: int, timeout: float) -> int:
+        ready = 0
+        deadline = time.perf_counter() + timeout
+        while ready < self.workers:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([ready_fd], [], [], remaining)
+            if readable:
+                ready += len(os.read(ready_fd, self.workers))
+        return ready
+
+    def startup_report(self, started_at: float, ready: int) -> dict:
+        """Per-process memory once all workers are serving, logged and written as JSON."""
+        report = {
+            "workers": self.workers,
+            "ready_workers": ready,
+            "startup_seconds": time.perf_counter() - started_at,
+            "parent": {"pid": os.getpid(), **process_memory(os.getpid())},
+            "worker_memory": [{"pid": pid, **process_memory(pid)} for pid in self.children],
+        }
+        worker_rss = [worker["rss_mib"] for worker in report["worker_memory"]]
+        worker_pss = [worker["pss_mib"] for worker in report["worker_memory"]]
+        report["mean_worker_rss_mib"] = sum(worker_rss) / max(len(worker_rss), 1)
+        report["total_pss_mib"] = report["parent"]["pss_mib"] + sum(worker_pss)
+
+        os.makedirs(os.path.dirname(PREFORK_REPORT_PATH), exist_ok=True)
+        with open(PREFORK_REPORT_PATH, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+        logging.info(f"Prefork startup report: {report}")
+        logging.info(f"{'pid':>8} {'rss MiB':>10} {'pss MiB':>10} {'uss MiB':>10}")
+        for row in [report["parent"]] + report["worker_memory"]:
+            logging.info(f"{row['pid']:>8} {row['rss_mib']:>10.1f} {row['pss_mib']:>10.1f} {row['uss_mib']:>10.1f}")
+        logging.info(f"{self.workers} workers ready in {report['startup_seconds']:.2f}s, "
+                     f"total PSS {report['total_pss_mib']:.1f} MiB")
+        return report
+
+    def _terminate(self, signum, frame) -> None:
+        self._shutting_down = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def serve(self) -> None:
+        logging.info("Entered the serve method of PreforkServer class")
+        try:
+            started_at = time.perf_counter()
+            self.model_registry.shared_weights_dir = self.shared_weights_dir
+            # Set before forking, so every worker publishes its reloads and follows the others'
+            self.model_registry.version_file = self.version_file
+            self.model_registry.preload()
+
+            sock = self._bind()
+            ready_read, ready_write = os.pipe()
+            self.children = [self._spawn(sock, ready_write) for _ in range(self.workers)]
+            signal.signal(signal.SIGTERM, self._terminate)
+            signal.signal(signal.SIGINT, self._terminate)
+
+            ready = self._wait_ready(ready_read, PREFORK_STARTUP_TIMEOUT)
+            self.startup_report(started_at, ready)
+
+            while self.children:
+                try:
+                    pid, status = os.wait()
+                except InterruptedError:
+                    continue
+                except ChildProcessError:
+                    break
+                if pid not in self.children:
+                    continue
+                index = self.children.index(pid)
+                if self._shutting_down:
+                    self.children.pop(index)
+                else:
+                    logging.warning(f"Prefork worker {pid} exited with status {status}, respawning")
+                    self.children[index] = self._spawn(sock, ready_write)
+
+            sock.close()
+            logging.info("Exited the serve method of PreforkServer class")
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
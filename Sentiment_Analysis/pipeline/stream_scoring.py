@@ -0,0 +1,107 @@
+import json
+from typing import AsyncIterator, Awaitable, Callable, List
+from starlette.responses import StreamingResponse
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response that writes chunks while the request body is still being read.
+
+    Starlette's StreamingResponse listens for client disconnects by draining
+    ``receive()``, which would swallow the body chunks our generator is reading. This
+    variant only sends. uvicorn's ``send`` blocks while the client's socket buffer is
+    full, which is what gives the upload backpressure.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        async for chunk in self.body_iterator:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode(self.charset)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(byte_stream: AsyncIterator[bytes], max_line_bytes: int = STREAM_MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    """Split an async byte stream into lines without holding more than one partial line."""
+    buffer = b""
+    async for chunk in byte_stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            yield line
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"NDJSON line longer than {max_line_bytes} bytes")
+    if buffer:
+        yield buffer
+
+
+def _parse_line(line: bytes, text_field: str, id_field: str):
+    record = json.loads(line)
+    if isinstance(record, str):
+        return record, None
+    if isinstance(record, dict) and isinstance(record.get(text_field), str):
+        return record[text_field], record.get(id_field)
+    raise ValueError(f"expected a JSON string or an object with a string '{text_field}' field")
+
+
+async def score_ndjson_stream(byte_stream: AsyncIterator[bytes],
+                              score_batch: Callable[[List[str]], Awaitable[list]],
+                              batch_size: int = STREAM_BATCH_SIZE,
+                              text_field: str = "text", id_field: str = "id") -> AsyncIterator[bytes]:
+    """
+    Score an NDJSON request body in fixed-size batches and yield NDJSON results.
+
+    Each input line is either a JSON string or an object holding the text under
+    ``text_field``. Output lines carry the 0-based input line number, the ``id_field``
+    value when present, and label/score, or an ``error`` for lines that did not parse.
+    Only one batch is held in memory at a time.
+    """
+    line_number = -1
+    pending = []
+    scored = 0
+
+    async def flush():
+        texts = [text for _, _, text in pending if text is not None]
+        predictions = iter(await score_batch(texts)) if texts else iter(())
+        out = []
+        for number, record_id, text in pending:
+            if text is None:
+                out.append(record_id)
+                continue
+            result = {"line": number, **next(predictions)}
+            if record_id is not None:
+                result[id_field] = record_id
+            out.append(result)
+        pending.clear()
+        return "".join(json.dumps(result) + "\n" for result in out).encode("utf-8")
+
+    try:
+        async for line in iter_lines(byte_stream):
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                text, record_id = _parse_line(line, text_field, id_field)
+                pending.append((line_number, record_id, text))
+            except ValueError as e:
+                # Keep the error in input order; the text slot stays empty
+                pending.append((line_number, {"line": line_number, "error": str(e)}, None))
+            if len(pending) >= batch_size:
+                scored += len(pending)
+                yield await flush()
+        if pending:
+            scored += len(pending)
+            yield await flush()
+        logging.info(f"Streamed scores for {scored} NDJSON lines")
+
+    except Exception as e:
+        logging.error(f"NDJSON scoring stopped after line {line_number}: {e}")
+        yield (json.dumps({"line": line_number, "error": str(e)}) + "\n").encode("utf-8")
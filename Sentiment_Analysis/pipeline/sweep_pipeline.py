@@ -0,0 +1,290 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from Sentiment_Analysis.logger import logging
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig, SweepConfig
+from Sentiment_Analysis.entity.artifact_entity import SweepArtifacts
+
+
+# The ModelTrainerConfig settings run_trial applies. Everything else either decides the
+# shared train/validation split or is not read by a trial at all.
+_SWEEPABLE_SETTINGS = ("MAX_WORDS", "MAX_LEN", "BATCH_SIZE", "EMBEDDING_DIM", "UNITS", "ARCHITECTURE")
+
+
+class SweepData:
+    """
+    The training split tokenized once for every trial of a sweep.
+
+    Sequences are stored unpadded, as one flat array of ids plus row offsets per split, with
+    the vocabulary of the largest MAX_WORDS in the search space. Word ids are ranks, so the
+    vocabulary of a smaller MAX_WORDS is a prefix of it, and ``padded`` derives any trial's
+    (MAX_WORDS, MAX_LEN) matrix by dropping the ids past it, exactly as a tokenizer fitted
+    with that MAX_WORDS would, and pre-padding.
+    """
+
+    SPLITS = ("train", "validation")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, split: str, name: str) -> str:
+        return os.path.join(self.directory, f"{split}_{name}.npy")
+
+    def build(self, csv_path: str, trainer_config: ModelTrainerConfig, max_words: int) -> Dict[str, int]:
+        """Split and tokenize ``csv_path`` the way ModelTrainer does. Returns the rows per split."""
+        from Sentiment_Analysis.components.model_trainer import ModelTrainer
+        from Sentiment_Analysis.entity.artifact_entity import DataTransformationArtifacts
+
+        trainer_config.MAX_WORDS = max_words
+        trainer = ModelTrainer(DataTransformationArtifacts(transformed_data_path=csv_path), trainer_config)
+        x_train, _, y_train, _ = trainer.spliting_data(csv_path)
+        texts = x_train.fillna("").astype(str)
+        vocabulary, _ = trainer.fit_vocabulary(texts)
+        sequences = vocabulary.texts_to_sequences(texts)
+        labels = y_train.to_numpy(dtype=np.int8)
+
+        # The same tail validation_split holds out in ModelTrainer.train_in_memory
+        split_at = int(len(sequences) * (1.0 - trainer_config.VALIDATION_SPLIT))
+        dtype = np.uint16 if max_words <= np.iinfo(np.uint16).max + 1 else np.int32
+        os.makedirs(self.directory, exist_ok=True)
+        rows = {}
+        for split, part in (("train", slice(None, split_at)), ("validation", slice(split_at, None))):
+            split_sequences = sequences[part]
+            lengths = np.fromiter(map(len, split_sequences), dtype=np.int64, count=len(split_sequences))
+            np.save(self._path(split, "ids"), np.fromiter(itertools.chain.from_iterable(split_sequences),
+                                                           dtype=dtype, count=int(lengths.sum())))
+            np.save(self._path(split, "offsets"), np.concatenate([[0], np.cumsum(lengths)]))
+            np.save(self._path(split, "labels"), labels[part])
+            rows[split] = len(split_sequences)
+        return rows
+
+    def padded(self, split: str, max_words: int, max_len: int) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.load(self._path(split, "ids"), mmap_mode="r")
+        offsets = np.load(self._path(split, "offsets"))
+        labels = np.load(self._path(split, "labels"))
+
+        keep = ids < max_words
+        kept_ids = ids[keep]
+        kept_offsets = np.concatenate([[0], np.cumsum(keep)])[offsets]
+        # Pre-truncation keeps the last max_len ids of a row, pre-padding right-aligns them
+        take = np.minimum(np.diff(kept_offsets), max_len)
+        before = np.concatenate([[0], np.cumsum(take)[:-1]])
+        position = np.arange(int(take.sum())) - np.repeat(before, take)
+        matrix = np.zeros((len(take), max_len), dtype=np.int32)
+        matrix[np.repeat(np.arange(len(take)), take), np.repeat(max_len - take, take) + position] = \
+            kept_ids[np.repeat(kept_offsets[1:] - take, take) + position]
+        return matrix, labels
+
+
+def init_worker(threads_per_trial: int) -> None:
+    from Sentiment_Analysis.configuration.tf_runtime import configure_tf_threads
+
+    configure_tf_threads(intra_op_threads=threads_per_trial, inter_op_threads=1)
+
+
+def run_trial(data_dir: str, model_path: str, settings: dict, initial_epoch: int, epochs: int) -> dict:
+    """
+    Train one trial from ``initial_epoch`` to ``epochs`` in a worker process, continuing from
+    the model it saved at the previous rung. Returns the metrics of its last epoch.
+    """
+    from tensorflow import keras
+    from Sentiment_Analysis.ml.model import ModelArchitecture
+
+    config = ModelTrainerConfig()
+    for name, value in settings.items():
+        setattr(config, name, value)
+    data = SweepData(data_dir)
+    x_train, y_train = data.padded("train", config.MAX_WORDS, config.MAX_LEN)
+    validation = data.padded("validation", config.MAX_WORDS, config.MAX_LEN)
+
+    if initial_epoch:
+        model = keras.models.load_model(model_path)
+    else:
+        keras.utils.set_random_seed(config.RANDOM_STATE)
+        model = ModelArchitecture(config.ARCHITECTURE, max_words=config.MAX_WORDS, embedding_dim=config.EMBEDDING_DIM,
+                                  units=config.UNITS).get_model(input_length=config.MAX_LEN)
+    started = time.perf_counter()
+    history = model.fit(x_train, y_train, batch_size=config.BATCH_SIZE, epochs=epochs, initial_epoch=initial_epoch,
+                        validation_data=validation, verbose=0)
+    seconds = time.perf_counter() - started
+    model.save(model_path)
+
+    metrics = {name: float(values[-1]) for name, values in history.history.items()}
+    metrics.update(train_seconds=seconds, rows_per_second=len(x_train) * (epochs - initial_epoch) / seconds)
+    return metrics
+
+
+class SweepPipeline:
+    """
+    Hyperparameter sweep over ModelTrainerConfig settings with successive halving.
+
+    Trials are drawn from the grid of the search space and trained in parallel worker
+    processes, each with its own TensorFlow thread budget. The data is transformed (if no
+    transformed CSV is given), split and tokenized once, then shared by every trial. After
+    each rung only the best 1 / REDUCTION_FACTOR trials by val_loss carry on, training
+    further from where they stopped. One row per trial and rung goes to the results table.
+    """
+
+    def __init__(self, sweep_config: SweepConfig):
+        self.sweep_config = sweep_config
+        self.rows: List[dict] = []
+
+    def sample_trials(self) -> List[dict]:
+        search_space = self.sweep_config.SEARCH_SPACE
+        for name in search_space:
+            if name not in _SWEEPABLE_SETTINGS:
+                raise ValueError(f"Can't sweep {name!r}, expected one of {list(_SWEEPABLE_SETTINGS)}")
+        names = sorted(search_space)
+        grid = [dict(zip(names, values)) for values in itertools.product(*(search_space[name] for name in names))]
+        if self.sweep_config.TRIALS and self.sweep_config.TRIALS < len(grid):
+            grid = random.Random(RANDOM_STATE).sample(grid, self.sweep_config.TRIALS)
+        return grid
+
+    def transformed_data_path(self) -> str:
+        if self.sweep_config.TRANSFORMED_DATA_PATH:
+            return self.sweep_config.TRANSFORMED_DATA_PATH
+        from Sentiment_Analysis.pipeline.train_pipeline import TrainPipeline
+
+        train_pipeline = TrainPipeline()
+        data_ingestion_artifacts = train_pipeline.start_data_ingestion()
+        data_validation_artifacts = train_pipeline.start_data_validation(data_ingestion_artifacts)
+        return train_pipeline.start_data_transformation(data_validation_artifacts).transformed_data_path
+
+    def make_pool(self, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(self.sweep_config.THREADS_PER_TRIAL,))
+
+    def run_alone(self, *trial_args) -> dict:
+        """
+        Retry a trial whose pool broke in a pool of its own. A worker that dies takes every
+        trial still queued or running in its pool down with it, and which one crashed is
+        unknown; run alone, only the trial that crashes its worker fails again.
+        """
+        pool = self.make_pool(1)
+        try:
+            return pool.submit(run_trial, *trial_args).result()
+        finally:
+            pool.shutdown()
+
+    def write_results(self) -> None:
+        tmp_path = f"{self.sweep_config.RESULTS_PATH}.tmp"
+        pd.DataFrame(self.rows).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.sweep_config.RESULTS_PATH)
+
+    def run_pipeline(self) -> SweepArtifacts:
+        logging.info("Entered the run_pipeline method of SweepPipeline class")
+        try:
+            config = self.sweep_config
+            trials = self.sample_trials()
+            os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+            with open(os.path.join(config.OUTPUT_DIR, "search_space.json"), "w") as handle:
+                json.dump({"search_space": config.SEARCH_SPACE, "trials": trials}, handle, indent=2)
+
+            max_words = max(trial.get("MAX_WORDS", MAX_WORDS) for trial in trials)
+            rows = SweepData(config.DATA_DIR).build(self.transformed_data_path(), ModelTrainerConfig(), max_words)
+            logging.info(f"Shared sweep data in {config.DATA_DIR}: {rows}")
+            if not rows["validation"]:
+                raise ValueError("The validation split is empty, so trials can't be ranked by val_loss; "
+                                 "raise VALIDATION_SPLIT or use more data")
+
+            active = list(range(len(trials)))
+            trained_epochs = [0] * len(trials)
+            final = []
+            pool = self.make_pool(config.WORKERS)
+            try:
+                for rung in range(config.RUNGS):
+                    epochs = config.MIN_EPOCHS * config.REDUCTION_FACTOR ** rung
+                    logging.info(f"Sweep rung {rung}: {len(active)} trials to {epochs} epochs")
+                    trial_args = {trial: (config.DATA_DIR, os.path.join(config.OUTPUT_DIR, f"trial_{trial:03d}.keras"),
+                                          trials[trial], trained_epochs[trial], epochs) for trial in active}
+                    futures = {pool.submit(run_trial, *args): trial for trial, args in trial_args.items()}
+                    results = {}
+                    pool_broken = False
+                    for future in as_completed(futures):
+                        trial = futures[future]
+                        row = {"trial": trial, "rung": rung, "epochs": epochs, **trials[trial]}
+                        try:
+                            try:
+                                metrics = future.result()
+                            except BrokenProcessPool:
+                                pool_broken = True
+                                logging.warning(f"Sweep worker died during trial {trial} rung {rung}, retrying it alone")
+                                metrics = self.run_alone(*trial_args[trial])
+                            row.update(metrics, status="trained")
+                            results[trial] = row
+                            trained_epochs[trial] = epochs
+                        except Exception as e:
+                            logging.warning(f"Sweep trial {trial} failed at rung {rung}: {e!r}")
+                            row.update(status="failed", error=repr(e))
+                        self.rows.append(row)
+                        logging.info(f"Sweep trial {trial} rung {rung}: {row}")
+                    if pool_broken:
+                        pool.shutdown(wait=False)
+                        pool = self.make_pool(config.WORKERS)
+
+                    # A trial that diverged has a NaN val_loss and ranks last
+                    ranked = sorted(results, key=lambda trial: (not math.isfinite(results[trial]["val_loss"]),
+                                                                results[trial]["val_loss"]))
+                    final = [results[trial] for trial in ranked]
+                    if rung + 1 < config.RUNGS:
+                        active = ranked[:max(1, len(ranked) // config.REDUCTION_FACTOR)]
+                        for trial, row in results.items():
+                            row["status"] = "promoted" if trial in active else "pruned"
+                    self.write_results()
+                    if not active or not ranked:
+                        break
+            finally:
+                pool.shutdown()
+
+            sweep_artifacts = SweepArtifacts(results_path=config.RESULTS_PATH,
+                                             best_trial=final[0] if final else None,
+                                             trials_run=len(trials))
+            logging.info(f"Exited the run_pipeline method of SweepPipeline class: {sweep_artifacts}")
+            return sweep_artifacts
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Sweep model training settings with successive halving.")
+    parser.add_argument("--search-space", help="JSON file mapping ModelTrainerConfig settings to lists of values")
+    parser.add_argument("--transformed-csv", help="final.csv from DataTransformation; the data pipeline runs once "
+                                                  "if omitted")
+    parser.add_argument("--output-dir")
+    parser.add_argument("--trials", type=int, default=SWEEP_TRIALS, help="trials drawn from the grid, 0 for all")
+    parser.add_argument("--workers", type=int, default=SWEEP_WORKERS, help="trials trained at once")
+    parser.add_argument("--threads-per-trial", type=int, default=SWEEP_THREADS_PER_TRIAL)
+    parser.add_argument("--min-epochs", type=int, default=SWEEP_MIN_EPOCHS)
+    parser.add_argument("--reduction-factor", type=int, default=SWEEP_REDUCTION_FACTOR)
+    parser.add_argument("--rungs", type=int, default=SWEEP_RUNGS)
+    args = parser.parse_args(argv)
+
+    search_space = None
+    if args.search_space:
+        with open(args.search_space) as handle:
+            search_space = json.load(handle)
+    config = SweepConfig(search_space=search_space, transformed_data_path=args.transformed_csv,
+                         output_dir=args.output_dir, trials=args.trials, workers=args.workers,
+                         threads_per_trial=args.threads_per_trial, min_epochs=args.min_epochs,
+                         reduction_factor=args.reduction_factor, rungs=args.rungs)
+    artifacts = SweepPipeline(config).run_pipeline()
+    print(f"Ran {artifacts.trials_run} trials, results in {artifacts.results_path}")
+    print(f"Best trial: {artifacts.best_trial}")
+
+
+if __name__ == "__main__":
+    main()
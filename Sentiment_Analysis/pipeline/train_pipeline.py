@@ -5,14 +5,15 @@ from Sentiment_Analysis.components.data_ingestion import DataIngestion
 from Sentiment_Analysis.components.data_validation import DataValidation
 from Sentiment_Analysis.components.data_transforamation import DataTransformation
 from Sentiment_Analysis.components.model_trainer import ModelTrainer
+from Sentiment_Analysis.components.model_exporter import ModelExporter
 from Sentiment_Analysis.components.model_evaluation import ModelEvaluation
 from Sentiment_Analysis.components.model_pusher import ModelPusher
 
 
 
 
-from Sentiment_Analysis.entity.config_entity import DataIngestionConfig,DataValidationConfig,DataTransformationConfig,ModelTrainerConfig,ModelEvaluationConfig,ModelPusherConfig
-from Sentiment_Analysis.entity.artifact_entity import DataIngestionArtifacts,DataValidationArtifact,DataTransformationArtifacts,ModelTrainerArtifacts,ModelEvaluationArtifacts,ModelPusherArtifacts
+from Sentiment_Analysis.entity.config_entity import DataIngestionConfig,DataValidationConfig,DataTransformationConfig,ModelTrainerConfig,ModelExporterConfig,ModelEvaluationConfig,ModelPusherConfig
+from Sentiment_Analysis.entity.artifact_entity import DataIngestionArtifacts,DataValidationArtifact,DataTransformationArtifacts,ModelTrainerArtifacts,ModelExporterArtifacts,ModelEvaluationArtifacts,ModelPusherArtifacts
 
 
 
@@ -22,6 +23,7 @@ class TrainPipeline:
         self.data_validation_config = None
         self.data_transformation_config = DataTransformationConfig()
         self.model_trainer_config = ModelTrainerConfig()
+        self.model_exporter_config = ModelExporterConfig()
         self.model_evaluation_config = ModelEvaluationConfig()
         self.model_pusher_config = ModelPusherConfig()
 
@@ -90,6 +92,18 @@ class TrainPipeline:
         except Exception as e:
             raise CustomException(e, sys) 
         
+    def start_model_exporter(self, model_trainer_artifacts: ModelTrainerArtifacts) -> ModelExporterArtifacts:
+        logging.info("Entered the start_model_exporter method of TrainPipeline class")
+        try:
+            model_exporter = ModelExporter(model_exporter_config=self.model_exporter_config,
+                                           model_trainer_artifacts=model_trainer_artifacts)
+            model_exporter_artifacts = model_exporter.initiate_model_exporter()
+            logging.info("Exited the start_model_exporter method of TrainPipeline class")
+            return model_exporter_artifacts
+
+        except Exception as e:
+            raise CustomException(e, sys) from e
+
     def start_model_evaluation(self, model_trainer_artifacts: ModelTrainerArtifacts, data_transformation_artifacts: DataTransformationArtifacts) -> ModelEvaluationArtifacts:
         logging.info("Entered the start_model_evaluation method of TrainPipeline class")
         try:
@@ -105,11 +119,12 @@ class TrainPipeline:
             raise CustomException(e, sys) from e
         
     
-    def start_model_pusher(self,) -> ModelPusherArtifacts:
+    def start_model_pusher(self, model_exporter_artifacts: ModelExporterArtifacts) -> ModelPusherArtifacts:
         logging.info("Entered the start_model_pusher method of TrainPipeline class")
         try:
             model_pusher = ModelPusher(
                 model_pusher_config=self.model_pusher_config,
+                model_exporter_artifacts=model_exporter_artifacts
             )
             model_pusher_artifact = model_pusher.initiate_model_pusher()
             logging.info("Initiated the model pusher")
@@ -141,9 +156,11 @@ class TrainPipeline:
             )
             if not model_evaluation_artifacts.is_model_accepted:
                 raise Exception("Trained model is not better than the best model")
-            
-            model_pusher_artifacts = self.start_model_pusher()
+
+            model_exporter_artifacts = self.start_model_exporter(
+                model_trainer_artifacts=model_trainer_artifacts
+            )
+            model_pusher_artifacts = self.start_model_pusher(model_exporter_artifacts=model_exporter_artifacts)
         
         except Exception as e:
             raise CustomException(e, sys) from e
-        
\ No newline at end of file
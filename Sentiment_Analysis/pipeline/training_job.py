@@ -0,0 +1,15 @@
+def run_training() -> None:
+    """
+    Run the training pipeline; meant as the target of a separate training process.
+
+    TrainPipeline is imported here rather than at module level, so the serving process
+    can hand this function to a process pool without loading TensorFlow and the
+    training components itself.
+    """
+    from Sentiment_Analysis.pipeline.train_pipeline import TrainPipeline
+
+    try:
+        TrainPipeline().run_pipeline()
+    except Exception as e:
+        # CustomException can't be rebuilt by pickle in the parent process
+        raise RuntimeError(str(e)) from None
@@ -1,37 +1,133 @@
-from Sentiment_Analysis.pipeline.train_pipeline import TrainPipeline
-from fastapi import FastAPI
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from Sentiment_Analysis.pipeline.training_job import run_training
+from typing import List
+from fastapi import FastAPI, Body, Request
 import uvicorn
 import sys
 from fastapi.templating import Jinja2Templates
 from starlette.responses import RedirectResponse
-from fastapi.responses import Response
+from fastapi.responses import Response, JSONResponse
 from Sentiment_Analysis.pipeline.prediction_pipeline import PredictionPipeline
+from Sentiment_Analysis.pipeline.model_registry import get_model_registry
+from Sentiment_Analysis.pipeline.batch_scheduler import MicroBatchScheduler
+from Sentiment_Analysis.pipeline.stream_scoring import NDJSONStreamingResponse, score_ndjson_stream
+from Sentiment_Analysis.configuration.tf_runtime import configure_tf_threads
 from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.logger import logging
 from Sentiment_Analysis.constants import *
 
 
 text:str = "What is machine learing?"
 
 app = FastAPI()
+model_registry = get_model_registry()
+prediction_pipeline = PredictionPipeline(model_registry=model_registry)
+# Keras/NLTK work runs here so a forward pass never blocks the event loop
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+batch_scheduler = MicroBatchScheduler(prediction_pipeline.predict_batch, executor=inference_executor)
+# Training gets its own process so it competes with serving only for CPU, not for the GIL
+training_executor = None
+training_in_progress = False
+warm_up_task = None
+follow_version_task = None
+
+
+async def warm_up_model():
+    """Fetch, load and warm up the model in the background, retrying until it succeeds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            # The registry runs PredictionPipeline.warm_up on the bundle before publishing it
+            await loop.run_in_executor(inference_executor, model_registry.load)
+            app.state.warmed_up.set()
+            return
+        except Exception as e:
+            logging.error(f"Model warm-up failed, retrying in {WARMUP_RETRY_SECONDS}s: {e}")
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+
+
+async def follow_model_version():
+    """Pick up a model another pre-forked worker reloaded, so /reload reaches every worker."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(MODEL_VERSION_POLL_SECONDS)
+        try:
+            await loop.run_in_executor(inference_executor, model_registry.follow_version_file)
+        except Exception as e:
+            logging.error(f"Following the published model version failed: {e}")
+
+
+@app.on_event("startup")
+async def load_model_registry():
+    global warm_up_task, follow_version_task
+    # Pay the model/tokenizer deserialization once per process instead of per request
+    if model_registry.backend != "numpy":
+        configure_tf_threads()
+    # Created here so it belongs to the server's event loop; /readyz reports it
+    app.state.warmed_up = asyncio.Event()
+    await batch_scheduler.start()
+    # Warm up without holding back startup, so /healthz answers while the model loads
+    warm_up_task = asyncio.ensure_future(warm_up_model())
+    if model_registry.version_file is not None:
+        follow_version_task = asyncio.ensure_future(follow_model_version())
+
+
+@app.on_event("shutdown")
+async def stop_batch_scheduler():
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    if follow_version_task is not None:
+        follow_version_task.cancel()
+    await batch_scheduler.stop()
+    inference_executor.shutdown(wait=False)
+    if training_executor is not None:
+        training_executor.shutdown(wait=False)
 
 @app.get("/", tags=["authentication"])
 async def index():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/healthz")
+async def healthz():
+    # Liveness: the event loop answers, whether or not the model is loaded yet
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    # Readiness: only once the model is loaded and warmed up
+    warmed_up = getattr(app.state, "warmed_up", None)
+    if warmed_up is None or not warmed_up.is_set():
+        return JSONResponse({"status": "warming up"}, status_code=503)
+    return {"status": "ready", "model_version": model_registry.get().version}
+
+
 
 
 @app.get("/train")
 async def training():
+    global training_executor, training_in_progress
+    if training_in_progress:
+        return Response("Training already in progress")
+    training_in_progress = True
     try:
-        train_pipeline = TrainPipeline()
-
-        train_pipeline.run_pipeline()
+        if training_executor is None:
+            training_executor = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(training_executor, run_training)
+        await loop.run_in_executor(inference_executor, model_registry.reload)
 
         return Response("Training successful !!")
 
     except Exception as e:
         return Response(f"Error Occurred! {e}")
+    finally:
+        training_in_progress = False
     
 
 
@@ -39,9 +135,44 @@ async def training():
 async def predict_route(text):
     try:
 
-        obj = PredictionPipeline()
-        text = obj.run_pipeline(text)
-        return text
+        # Concurrent single-text requests share one forward pass
+        prediction = await batch_scheduler.submit(text)
+        return prediction["label"]
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+@app.post("/predict/batch")
+async def predict_batch_route(texts: List[str] = Body(...)):
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(inference_executor, prediction_pipeline.predict_batch, texts)
+    except Exception as e:
+        raise CustomException(e, sys) from e
+
+
+@app.post("/predict/stream")
+async def predict_stream_route(request: Request, field: str = "text", id_field: str = "id"):
+    loop = asyncio.get_running_loop()
+
+    async def score_batch(texts):
+        return await loop.run_in_executor(inference_executor, prediction_pipeline.predict_batch, texts)
+
+    return NDJSONStreamingResponse(
+        score_ndjson_stream(request.stream(), score_batch, text_field=field, id_field=id_field))
+
+
+@app.get("/predict/stats")
+async def predict_stats():
+    return {**batch_scheduler.stats(), "cache": prediction_pipeline.prediction_cache.stats()}
+
+
+@app.post("/reload")
+async def reload_model():
+    try:
+        loop = asyncio.get_running_loop()
+        bundle = await loop.run_in_executor(inference_executor, model_registry.reload)
+        return {"model_version": bundle.version}
     except Exception as e:
         raise CustomException(e, sys) from e
     
@@ -49,7 +180,16 @@ async def predict_route(text):
 
 
 if __name__=="__main__":
-    uvicorn.run(app, host=APP_HOST, port=APP_PORT)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=SERVING_WORKERS,
+                        help="fork this many workers sharing read-only model weights")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from Sentiment_Analysis.pipeline.prefork_server import PreforkServer
+        PreforkServer(app, model_registry, workers=args.workers).serve()
+    else:
+        uvicorn.run(app, host=APP_HOST, port=APP_PORT)
 
 
     
@@ -0,0 +1,89 @@
+"""
+Training throughput, inference latency and accuracy of every registered architecture.
+
+    python -m benchmarks.bench_architectures --dataset data/dataset.zip --epochs 1
+
+Each architecture is trained from the same seed with ModelTrainer.train_in_memory on the
+transformed dataset (built as in bench_bucketed_training), then scored on the MAX_LEN
+pre-padded test split the way ModelEvaluation does. Latency is the median of single-row
+predict_on_batch calls; batch throughput is the best of five PREDICTION_BATCH_SIZE-row
+calls.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from tensorflow import keras
+from Sentiment_Analysis.constants import *
+from benchmarks.bench_bucketed_training import EpochTimer, scratch_trainer, transformed_csv
+
+
+def run(architecture, csv_path, work_dir, epochs, latency_repeat):
+    from Sentiment_Analysis.ml.model import ModelArchitecture
+    from Sentiment_Analysis.ml.vocabulary import Vocabulary
+    from Sentiment_Analysis.ml.test_matrix import TestMatrix
+
+    trainer = scratch_trainer(csv_path, os.path.join(work_dir, architecture), epochs)
+    config = trainer.model_trainer_config
+    config.ARCHITECTURE = architecture
+    keras.utils.set_random_seed(config.RANDOM_STATE)
+    model = ModelArchitecture(architecture, max_words=config.MAX_WORDS, embedding_dim=config.EMBEDDING_DIM,
+                              units=config.UNITS).get_model(input_length=config.MAX_LEN)
+    timer = EpochTimer()
+    tokenizer = trainer.train_in_memory(model, callbacks=[timer])
+    train_rows = int(len(pd.read_csv(config.X_TRAIN_DATA_PATH, index_col=0)) * (1.0 - config.VALIDATION_SPLIT))
+
+    vocabulary = Vocabulary.from_tokenizer(tokenizer)
+    ids, labels = TestMatrix(config.TRAINED_MODEL_DIR, vocabulary.fingerprint).build(
+        config.X_TEST_DATA_PATH, config.Y_TEST_DATA_PATH, vocabulary).load()
+    test_accuracy = model.evaluate(ids, labels, verbose=0)[1]
+
+    single = np.asarray(ids[:1], dtype=np.int32)
+    batch = np.asarray(ids[:PREDICTION_BATCH_SIZE], dtype=np.int32)
+    model.predict_on_batch(single)
+    model.predict_on_batch(batch)
+    latencies = []
+    for _ in range(latency_repeat):
+        started = time.perf_counter()
+        model.predict_on_batch(single)
+        latencies.append(time.perf_counter() - started)
+    batch_seconds = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        model.predict_on_batch(batch)
+        batch_seconds = min(batch_seconds, time.perf_counter() - started)
+
+    return {"params": model.count_params(), "train_rows_per_second": train_rows / timer.seconds[-1],
+            "latency_ms": float(np.median(latencies)) * 1000, "batch_rows_per_second": len(batch) / batch_seconds,
+            "val_accuracy": timer.history[-1].get("val_accuracy"), "test_accuracy": test_accuracy}
+
+
+def main():
+    from Sentiment_Analysis.ml.model import ARCHITECTURES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--transformed-csv", help="final.csv from DataTransformation; built from --dataset if omitted")
+    parser.add_argument("--architectures", nargs="+", default=list(ARCHITECTURES))
+    parser.add_argument("--epochs", type=int, default=EPOCH)
+    parser.add_argument("--latency-repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="architectures-bench-")
+    csv_path = args.transformed_csv or transformed_csv(args.dataset, work_dir)
+    results = {architecture: run(architecture, csv_path, work_dir, args.epochs, args.latency_repeat)
+               for architecture in args.architectures}
+
+    print(f"{'architecture':>17} {'params':>10} {'train rows/s':>13} {'1-row ms':>9} "
+          f"{f'{PREDICTION_BATCH_SIZE}-row rows/s':>16} {'val acc':>8} {'test acc':>9}")
+    for architecture, result in results.items():
+        print(f"{architecture:>17} {result['params']:>10} {result['train_rows_per_second']:>13.0f} "
+              f"{result['latency_ms']:>9.2f} {result['batch_rows_per_second']:>16.0f} "
+              f"{result['val_accuracy']:>8.4f} {result['test_accuracy']:>9.4f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
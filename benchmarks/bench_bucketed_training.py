@@ -0,0 +1,128 @@
+"""
+Epoch wall time and accuracy of the fixed-length and length-bucketed training inputs.
+
+    python -m benchmarks.bench_bucketed_training --dataset data/dataset.zip --epochs 1
+
+The dataset is transformed the way DataTransformation does it (or --transformed-csv is
+used as is), then a fresh model is trained from the same seed with ModelTrainer's
+in_memory and bucketed modes. Test accuracy is measured on MAX_LEN pre-padded rows,
+which is how ModelEvaluation scores and the full-length backends serve; for the bucketed
+model, which masks the padding, it is also reported on bucket-padded rows and through
+LengthBucketedPredictor, and all three agree.
+"""
+import os
+import sys
+import time
+import types
+import zipfile
+import argparse
+import tempfile
+import numpy as np
+from tensorflow import keras
+from Sentiment_Analysis.constants import *
+
+
+class EpochTimer(keras.callbacks.Callback):
+    def on_train_begin(self, logs=None):
+        self.seconds, self.history = [], []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.seconds.append(time.perf_counter() - self._started)
+        self.history.append(dict(logs or {}))
+
+
+def transformed_csv(dataset_path, work_dir):
+    from Sentiment_Analysis.components.data_transforamation import DataTransformation
+    from Sentiment_Analysis.entity.config_entity import DataTransformationConfig
+
+    with zipfile.ZipFile(dataset_path) as archive:
+        archive.extractall(work_dir)
+    paths = types.SimpleNamespace(raw_data_file_path=os.path.join(work_dir, "raw_data.csv"),
+                                  imbalance_data_file_path=os.path.join(work_dir, "imbalanced_data.csv"))
+    data_transformation = DataTransformation(DataTransformationConfig(), paths)
+    df = data_transformation.concat_dataframe()
+    df[TWEET] = data_transformation.clean_tweets(df[TWEET])
+    csv_path = os.path.join(work_dir, "final.csv")
+    df.to_csv(csv_path, index=False, header=True)
+    return csv_path
+
+
+def scratch_trainer(csv_path, directory, epochs):
+    """A ModelTrainer on ``csv_path`` that writes its split CSVs to ``directory``."""
+    from Sentiment_Analysis.components.model_trainer import ModelTrainer
+    from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig
+    from Sentiment_Analysis.entity.artifact_entity import DataTransformationArtifacts
+
+    config = ModelTrainerConfig()
+    config.EPOCH = epochs
+    config.TRAINED_MODEL_DIR = directory
+    config.X_TEST_DATA_PATH = os.path.join(directory, X_TEST_FILE_NAME)
+    config.Y_TEST_DATA_PATH = os.path.join(directory, Y_TEST_FILE_NAME)
+    config.X_TRAIN_DATA_PATH = os.path.join(directory, X_TRAIN_FILE_NAME)
+    os.makedirs(directory, exist_ok=True)
+    return ModelTrainer(DataTransformationArtifacts(transformed_data_path=csv_path), config)
+
+
+def run(mode, csv_path, work_dir, epochs):
+    from Sentiment_Analysis.ml.model import ModelArchitecture
+    from Sentiment_Analysis.ml.vocabulary import Vocabulary
+    from Sentiment_Analysis.ml.test_matrix import TestMatrix
+    from Sentiment_Analysis.ml.length_buckets import LengthBucketedPredictor, LengthBucketedSequence
+
+    trainer = scratch_trainer(csv_path, os.path.join(work_dir, mode), epochs)
+    config = trainer.model_trainer_config
+    keras.utils.set_random_seed(config.RANDOM_STATE)
+    timer = EpochTimer()
+    if mode == "bucketed":
+        tokenizer = trainer.train_bucketed(ModelArchitecture().get_model(input_length=None, mask_zero=True),
+                                           callbacks=[timer])
+    else:
+        tokenizer = trainer.train_in_memory(ModelArchitecture().get_model(), callbacks=[timer])
+    model = timer.model
+
+    vocabulary = Vocabulary.from_tokenizer(tokenizer)
+    ids, labels = TestMatrix(config.TRAINED_MODEL_DIR, vocabulary.fingerprint).build(
+        config.X_TEST_DATA_PATH, config.Y_TEST_DATA_PATH, vocabulary).load()
+    result = {"epoch_seconds": timer.seconds, "val_accuracy": [logs.get("val_accuracy") for logs in timer.history],
+              "test_accuracy": model.evaluate(ids, labels, verbose=0)[1], "bucketed_test_accuracy": None,
+              "served_test_accuracy": None}
+    if mode == "bucketed":
+        import pandas as pd
+        texts = pd.read_csv(config.X_TEST_DATA_PATH, index_col=0)[TWEET].fillna("").astype(str)
+        test = LengthBucketedSequence(vocabulary.texts_to_sequences(texts), labels, buckets=config.LENGTH_BUCKETS,
+                                      max_len=config.MAX_LEN, shuffle=False)
+        result["bucketed_test_accuracy"] = model.evaluate(test.dataset(), verbose=0)[1]
+        scores = LengthBucketedPredictor(model, max_len=config.MAX_LEN).predict_padded(ids)
+        result["served_test_accuracy"] = float(np.mean((scores > 0.5) == (labels > 0.5)))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--transformed-csv", help="final.csv from DataTransformation; built from --dataset if omitted")
+    parser.add_argument("--epochs", type=int, default=EPOCH)
+    parser.add_argument("--modes", nargs="+", default=["in_memory", "bucketed"])
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bucketed-training-bench-")
+    csv_path = args.transformed_csv or transformed_csv(args.dataset, work_dir)
+    results = {mode: run(mode, csv_path, work_dir, args.epochs) for mode in args.modes}
+
+    print(f"{'mode':>10} {'epoch s':>24} {'val acc':>8} {'test acc':>9} {'bucket-padded test acc':>23} "
+          f"{'served test acc':>16}")
+    for mode, result in results.items():
+        epochs = " ".join(f"{seconds:.1f}" for seconds in result["epoch_seconds"])
+        bucketed, served = result["bucketed_test_accuracy"], result["served_test_accuracy"]
+        print(f"{mode:>10} {epochs:>24} {result['val_accuracy'][-1]:>8.4f} {result['test_accuracy']:>9.4f} "
+              f"{'' if bucketed is None else f'{bucketed:.4f}':>23} {'' if served is None else f'{served:.4f}':>16}")
+    if "in_memory" in results and "bucketed" in results:
+        speedup = sum(results["in_memory"]["epoch_seconds"]) / sum(results["bucketed"]["epoch_seconds"])
+        print(f"bucketed epochs are {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
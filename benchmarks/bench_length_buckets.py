@@ -0,0 +1,86 @@
+"""
+Parity check and benchmark of length-bucketed inference against full MAX_LEN padding.
+
+    python -m benchmarks.bench_length_buckets --x-test artifacts/<ts>/ModelTrainerArtifacts/x_test.csv
+
+Exits non-zero when any score differs by more than --tolerance.
+"""
+import os
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+import pandas as pd
+from tensorflow import keras
+from tensorflow.keras.utils import pad_sequences
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.length_buckets import LengthBucketedPredictor
+
+
+def load_sequences(args):
+    if args.x_test:
+        with open(args.tokenizer, "rb") as handle:
+            tokenizer = pickle.load(handle)
+        texts = pd.read_csv(args.x_test, index_col=0)[TWEET].fillna("").astype(str).tolist()[:args.samples]
+        return tokenizer.texts_to_sequences(texts)
+    # Tweet-like lengths: mostly short, a long tail up to MAX_LEN
+    rng = np.random.default_rng(RANDOM_STATE)
+    lengths = np.minimum(rng.geometric(1 / 12, size=args.samples), MAX_LEN + 20)
+    return [rng.integers(1, MAX_WORDS, size=length).tolist() for length in lengths]
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=os.path.join(PREDICTION_MODEL_DIR, MODEL_NAME))
+    parser.add_argument("--tokenizer", default=TOKENIZER_PATH)
+    parser.add_argument("--x-test", help="x_test.csv written by ModelTrainer; synthetic lengths if omitted")
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=PREDICTION_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    model = keras.models.load_model(args.model)
+    if not LengthBucketedPredictor.supports(model):
+        sys.exit(f"{args.model} has no Embedding -> LSTM/GRU stack to bucket")
+    bucketed = LengthBucketedPredictor(model)
+    sequences = load_sequences(args)
+    chunks = [sequences[start:start + args.batch_size] for start in range(0, len(sequences), args.batch_size)]
+
+    def full():
+        return np.concatenate([model.predict(pad_sequences(chunk, maxlen=MAX_LEN), batch_size=len(chunk), verbose=0)[:, 0]
+                               for chunk in chunks])
+
+    def by_bucket():
+        return np.concatenate([bucketed.predict_sequences(chunk) for chunk in chunks])
+
+    full(), by_bucket()  # trace both paths before timing
+    full_scores, full_seconds = timed(full, args.repeat)
+    bucket_scores, bucket_seconds = timed(by_bucket, args.repeat)
+
+    lengths = np.array([min(len(sequence), MAX_LEN) for sequence in sequences])
+    max_diff = float(np.abs(full_scores - bucket_scores).max())
+    label_agreement = float(np.mean((full_scores > PREDICTION_THRESHOLD) == (bucket_scores > PREDICTION_THRESHOLD)))
+
+    print(f"sequences: {len(sequences)}  median length: {np.median(lengths):.0f}  buckets: {bucketed.bounds}")
+    print(f"full padding : {len(sequences) / full_seconds:10.1f} texts/sec")
+    print(f"bucketed     : {len(sequences) / bucket_seconds:10.1f} texts/sec  ({full_seconds / bucket_seconds:.2f}x)")
+    print(f"max |score diff|: {max_diff:.3e}  label agreement: {label_agreement:.4f}")
+
+    if max_diff > args.tolerance:
+        sys.exit(f"parity check failed: {max_diff:.3e} > {args.tolerance:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Parity check of the NumPy engine against ``keras.models.load_model``, plus cold-start
+time and peak RSS of a serving process on each backend.
+
+    python -m benchmarks.bench_numpy_engine --x-test artifacts/<ts>/ModelTrainerArtifacts/x_test.csv
+
+Every backend is started in a fresh interpreter that imports the prediction pipeline,
+loads the bundle and scores one batch. Exits non-zero when any score differs by more
+than --tolerance.
+"""
+import os
+import sys
+import json
+import pickle
+import argparse
+import subprocess
+import numpy as np
+import pandas as pd
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.sequence import pad_sequences
+
+
+COLD_START_SCRIPT = """
+import sys, json, time, resource
+started = time.perf_counter()
+from Sentiment_Analysis.pipeline.model_registry import ModelRegistry
+from Sentiment_Analysis.pipeline.prediction_pipeline import PredictionPipeline
+imported = time.perf_counter()
+pipeline = PredictionPipeline(model_registry=ModelRegistry(model_dir=sys.argv[1], model_name=sys.argv[2],
+                                                           tokenizer_path=sys.argv[3], backend=sys.argv[4]))
+pipeline.model_registry.load()
+loaded = time.perf_counter()
+pipeline.predict_cleaned_batch(["warm up text"] * 32)
+print(json.dumps({
+    "import_s": imported - started,
+    "load_s": loaded - imported,
+    "first_batch_s": time.perf_counter() - loaded,
+    "total_s": time.perf_counter() - started,
+    "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow_imported": "tensorflow" in sys.modules,
+}))
+"""
+
+
+def load_sequences(args):
+    if args.x_test:
+        with open(args.tokenizer, "rb") as handle:
+            tokenizer = pickle.load(handle)
+        texts = pd.read_csv(args.x_test, index_col=0)[TWEET].fillna("").astype(str).tolist()[:args.samples]
+        return tokenizer.texts_to_sequences(texts)
+    rng = np.random.default_rng(RANDOM_STATE)
+    lengths = np.minimum(rng.geometric(1 / 12, size=args.samples), MAX_LEN + 20)
+    return [rng.integers(1, MAX_WORDS, size=length).tolist() for length in lengths]
+
+
+def parity(args) -> float:
+    from tensorflow import keras
+    from Sentiment_Analysis.ml.numpy_engine import NumpyLSTMClassifier
+    from Sentiment_Analysis.ml.shared_weights import export_shared_weights
+    from Sentiment_Analysis.pipeline.model_registry import ModelRegistry
+
+    version = ModelRegistry._file_version(args.model)
+    numpy_model = NumpyLSTMClassifier(export_shared_weights(args.model, NUMPY_MODEL_DIR, version))
+    keras_model = keras.models.load_model(args.model)
+
+    matrix = pad_sequences(load_sequences(args), maxlen=MAX_LEN)
+    keras_scores = keras_model.predict(matrix, batch_size=args.batch_size, verbose=0)[:, 0]
+    numpy_scores = np.concatenate([numpy_model.predict(matrix[start:start + args.batch_size])[:, 0]
+                                   for start in range(0, len(matrix), args.batch_size)])
+    max_diff = float(np.abs(keras_scores - numpy_scores).max())
+    agreement = float(np.mean((keras_scores > PREDICTION_THRESHOLD) == (numpy_scores > PREDICTION_THRESHOLD)))
+    print(f"parity on {len(matrix)} sequences: max |score diff| {max_diff:.3e}  label agreement {agreement:.4f}")
+    return max_diff
+
+
+def cold_start(args, backend: str) -> dict:
+    model_dir, model_name = os.path.split(os.path.abspath(args.model))
+    output = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT, model_dir, model_name, args.tokenizer, backend],
+                            check=True, capture_output=True, text=True).stdout
+    return {"backend": backend, **json.loads(output.strip().splitlines()[-1])}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=os.path.join(PREDICTION_MODEL_DIR, MODEL_NAME))
+    parser.add_argument("--tokenizer", default=TOKENIZER_PATH)
+    parser.add_argument("--x-test", help="x_test.csv written by ModelTrainer; synthetic sequences if omitted")
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=PREDICTION_BATCH_SIZE)
+    parser.add_argument("--tolerance", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    # Export the vocabulary and weights once, so the numpy cold start below is the steady state
+    cold_start(args, "numpy")
+    results = [cold_start(args, backend) for backend in ("keras", "numpy")]
+    print(pd.DataFrame(results).to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+    max_diff = parity(args)
+    if max_diff > args.tolerance:
+        sys.exit(f"parity check failed: {max_diff:.3e} > {args.tolerance:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Scaling benchmark of DataTransformation.clean_tweets over 1..N worker processes.
+
+    python -m benchmarks.bench_parallel_cleaning --dataset data/dataset.zip --repeat 4
+
+The dataset tweets are repeated --repeat times. Every worker count must produce exactly
+the output of the sequential path, otherwise the script exits non-zero.
+"""
+import os
+import sys
+import time
+import argparse
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.entity.config_entity import DataTransformationConfig
+from Sentiment_Analysis.components.data_transforamation import DataTransformation
+from benchmarks.bench_text_normalizer import load_tweets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--repeat", type=int, default=4, help="times the dataset is repeated")
+    parser.add_argument("--max-workers", type=int, default=DATA_TRANSFORMATION_CLEAN_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=DATA_TRANSFORMATION_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    tweets = load_tweets(args.dataset) * args.repeat
+    worker_counts = sorted({1, args.max_workers} | {2 ** power for power in range(1, 8) if 2 ** power < args.max_workers})
+
+    reference = None
+    sequential_seconds = None
+    print(f"tweets: {len(tweets)}  chunk size: {args.chunk_size}")
+    print(f"{'workers':>8} {'seconds':>9} {'tweets/sec':>12} {'speedup':>8} {'efficiency':>11}")
+    for workers in worker_counts:
+        config = DataTransformationConfig()
+        config.CLEAN_WORKERS = workers
+        config.CHUNK_SIZE = args.chunk_size
+        config.CLEANED_TEXT_CACHE_PATH = None
+        # A fresh instance per run, so the sequential path doesn't start with a warm stem cache
+        data_transformation = DataTransformation(data_transformation_config=config, data_validation_artifacts=None)
+
+        started = time.perf_counter()
+        cleaned = data_transformation.clean_tweets(tweets)
+        seconds = time.perf_counter() - started
+
+        if reference is None:
+            reference, sequential_seconds = cleaned, seconds
+        elif cleaned != reference:
+            sys.exit(f"{workers} workers produced different output than the sequential path")
+        speedup = sequential_seconds / seconds
+        print(f"{workers:>8} {seconds:>9.2f} {len(tweets) / seconds:>12,.0f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
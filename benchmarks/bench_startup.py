@@ -0,0 +1,101 @@
+"""
+Startup-time benchmark of the serving app: from ``import app`` to the first successful /predict.
+
+    python -m benchmarks.bench_startup --runs 3
+
+Each run is a fresh interpreter, so the numbers include every import the app pulls in.
+Results are appended to benchmarks/startup_history.csv, which is committed, together with
+the commit they were measured on. A run slower than the median of the previous --window
+runs on the same backend by more than --threshold is a regression and makes the script
+exit non-zero, unless --warn-only is given.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from Sentiment_Analysis.constants import *
+
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_history.csv")
+
+STARTUP_SCRIPT = """
+import sys, json, time, resource
+started = time.perf_counter()
+import app
+from fastapi.testclient import TestClient
+imported = time.perf_counter()
+# The bundle is built by the startup handler, so the backend can still be switched here
+app.model_registry.backend = sys.argv[1]
+with TestClient(app.app) as client:
+    ready = time.perf_counter()
+    response = client.post("/predict", params={"text": "startup benchmark"})
+    response.raise_for_status()
+    predicted = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "startup_s": ready - imported,
+    "first_predict_s": predicted - ready,
+    "total_s": predicted - started,
+    "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "tensorflow_imported": "tensorflow" in sys.modules,
+    "sklearn_imported": "sklearn" in sys.modules,
+    "pandas_imported": "pandas" in sys.modules,
+}))
+"""
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(backend: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, backend],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default=INFERENCE_BACKEND, choices=["keras", "tflite", "numpy"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--window", type=int, default=10, help="previous runs the baseline is taken from")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown over the baseline")
+    parser.add_argument("--warn-only", action="store_true", help="report a regression without failing")
+    args = parser.parse_args()
+
+    history = pd.read_csv(HISTORY_PATH) if os.path.isfile(HISTORY_PATH) else pd.DataFrame()
+    previous = history[history["backend"] == args.backend].tail(args.window) if len(history) else history
+    baseline = float(previous["total_s"].median()) if len(previous) else None
+
+    commit = git_commit()
+    runs = [{"timestamp": datetime.now().isoformat(timespec="seconds"), "commit": commit,
+             "backend": args.backend, **measure(args.backend)} for _ in range(args.runs)]
+    results = pd.DataFrame(runs)
+    print(results.drop(columns=["timestamp"]).to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+
+    results.to_csv(HISTORY_PATH, mode="a", header=not os.path.isfile(HISTORY_PATH), index=False)
+
+    current = float(np.median(results["total_s"]))
+    if baseline is None:
+        print(f"median import -> first /predict: {current:.3f}s (first recorded run for {args.backend})")
+        return
+    change = current / baseline - 1
+    print(f"median import -> first /predict: {current:.3f}s, baseline {baseline:.3f}s ({change:+.1%})")
+    if change > args.threshold:
+        message = f"startup regression: {current:.3f}s is {change:.1%} slower than the baseline {baseline:.3f}s"
+        if args.warn_only:
+            print(message)
+        else:
+            sys.exit(message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Parity and timing of the fused TextEncoder against normalize -> texts_to_sequences -> pad_sequences.
+
+    python -m benchmarks.bench_text_encoder --dataset data/dataset.zip
+
+Without --tokenizer, a Tokenizer(num_words=MAX_WORDS) is fitted on the cleaned dataset
+tweets. Exits non-zero if any row of the id matrix differs.
+"""
+import os
+import sys
+import time
+import pickle
+import argparse
+import numpy as np
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.ml.text_encoder import TextEncoder
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from benchmarks.bench_text_normalizer import load_tweets, EDGE_CASES
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--tokenizer", help="existing tokenizer.pickle; fitted on the dataset if omitted")
+    parser.add_argument("--batch-size", type=int, default=PREDICTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    texts = load_tweets(args.dataset) + EDGE_CASES
+    if args.tokenizer is None:
+        from tensorflow.keras.preprocessing.text import Tokenizer
+        tokenizer = Tokenizer(num_words=MAX_WORDS)
+        tokenizer.fit_on_texts([TextNormalizer().normalize(text) for text in texts])
+    else:
+        with open(args.tokenizer, "rb") as handle:
+            tokenizer = pickle.load(handle)
+    vocabulary = Vocabulary.from_tokenizer(tokenizer)
+
+    def separate():
+        normalizer = TextNormalizer()
+        return pad_sequences(vocabulary.texts_to_sequences([normalizer.normalize(text) for text in texts]),
+                             maxlen=MAX_LEN)
+
+    def fused(encoder, expected=None):
+        """Batches share one buffer, as in serving, so each is checked before the next overwrites it."""
+        buffer = encoder.allocate(args.batch_size)
+        mismatches = []
+        for start in range(0, len(texts), args.batch_size):
+            padded = encoder.encode_batch(texts[start:start + args.batch_size], out=buffer)
+            if expected is not None:
+                rows = np.flatnonzero((expected[start:start + len(padded)] != padded).any(axis=1))
+                mismatches.extend(start + rows)
+        return mismatches
+
+    expected, separate_seconds = timed(separate)
+    encoder = TextEncoder(TextNormalizer(), vocabulary)
+    _, cold_seconds = timed(lambda: fused(encoder))
+    _, warm_seconds = timed(lambda: fused(encoder))
+    mismatches = fused(encoder, expected)
+
+    print(f"texts: {len(texts)}  batch size: {args.batch_size}  dtype: {np.dtype(encoder.dtype).name}  "
+          f"word cache: {encoder._word_ids.cache_info()}")
+    print(f"separate stages : {separate_seconds:6.2f}s  matrix {expected.nbytes / 2 ** 20:7.1f} MiB")
+    print(f"fused cold      : {cold_seconds:6.2f}s  buffer {encoder.allocate(args.batch_size).nbytes / 2 ** 10:7.1f} KiB"
+          f"  ({separate_seconds / cold_seconds:.1f}x)")
+    print(f"fused warm      : {warm_seconds:6.2f}s  ({separate_seconds / warm_seconds:.1f}x)")
+
+    if len(mismatches):
+        for row in mismatches[:10]:
+            print(f"MISMATCH {texts[row]!r}")
+        sys.exit(f"{len(mismatches)} rows differ from the separate stages")
+
+
+if __name__ == "__main__":
+    main()
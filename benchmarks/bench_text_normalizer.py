@@ -0,0 +1,85 @@
+"""
+Microbenchmark of TextNormalizer against the original per-call cleaning code.
+
+    python -m benchmarks.bench_text_normalizer --dataset data/dataset.zip
+
+Both implementations clean every tweet of the dataset; the script exits non-zero if a
+single output differs and prints the time per text for each.
+"""
+import os
+import re
+import sys
+import time
+import string
+import zipfile
+import argparse
+import nltk
+import pandas as pd
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.stopwords import load_stopwords
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+
+
+EDGE_CASES = [
+    "", "   ", "\n", "a\nb", "[link]x", "[a\nb]", "ht[x]tp://a.b c", "<<b>>bold</b>>", "<a\nb>",
+    "www.x.com/y?z=1 ok", "HTTPS://X.COM", "abc123 4you u2 ٣٤", "don't stop!!", "\t tab\tbetween ",
+    "I I me me the THE", "running runs ran", "ünïcödé  naïve café", 12345, None, float("nan"),
+]
+
+
+def legacy_clean(words):
+    """concat_data_cleaning as it was before TextNormalizer."""
+    stemmer = nltk.SnowballStemmer("english")
+    stopword = load_stopwords("english")
+    words = str(words).lower()
+    words = re.sub(r'\[.*?\]', '', words)
+    words = re.sub(r'https?://\S+|www\.\S+', '', words)
+    words = re.sub(r'<.*?>+', '', words)
+    words = re.sub(r'[%s]' % re.escape(string.punctuation), '', words)
+    words = re.sub(r'\n', '', words)
+    words = re.sub(r'\w*\d\w*', '', words)
+    words = [word for word in words.split(' ') if word not in stopword]
+    words = " ".join(words)
+    words = [stemmer.stem(word) for word in words.split(' ')]
+    return " ".join(words)
+
+
+def load_tweets(dataset_path: str) -> list:
+    with zipfile.ZipFile(dataset_path) as archive:
+        frames = [pd.read_csv(archive.open(name)) for name in archive.namelist() if name.endswith(".csv")]
+    return [tweet for frame in frames for tweet in frame[TWEET].tolist()]
+
+
+def timed(fn, texts):
+    started = time.perf_counter()
+    outputs = [fn(text) for text in texts]
+    return outputs, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--limit", type=int, default=None, help="clean only the first N tweets")
+    args = parser.parse_args()
+
+    texts = load_tweets(args.dataset)[:args.limit] + EDGE_CASES
+    legacy, legacy_seconds = timed(legacy_clean, texts)
+    normalizer = TextNormalizer()
+    _, cold_seconds = timed(normalizer.normalize, texts)
+    normalized, warm_seconds = timed(normalizer.normalize, texts)
+
+    mismatches = [(text, old, new) for text, old, new in zip(texts, legacy, normalized) if old != new]
+    per_text = lambda seconds: seconds / len(texts) * 1e6
+    print(f"texts: {len(texts)}  stem cache: {normalizer.stem.cache_info()}")
+    print(f"legacy          : {per_text(legacy_seconds):8.2f} us/text")
+    print(f"normalizer cold : {per_text(cold_seconds):8.2f} us/text  ({legacy_seconds / cold_seconds:.1f}x)")
+    print(f"normalizer warm : {per_text(warm_seconds):8.2f} us/text  ({legacy_seconds / warm_seconds:.1f}x)")
+
+    if mismatches:
+        for text, old, new in mismatches[:10]:
+            print(f"MISMATCH {text!r}: {old!r} != {new!r}")
+        sys.exit(f"{len(mismatches)} outputs differ from the legacy cleaning")
+
+
+if __name__ == "__main__":
+    main()
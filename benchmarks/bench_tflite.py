@@ -0,0 +1,90 @@
+"""
+Latency/throughput benchmark and accuracy-parity report of the TFLite variants against the h5 model.
+
+    python -m benchmarks.bench_tflite --model artifacts/<ts>/ModelTrainerArtifacts/model.h5 \
+        --x-test artifacts/<ts>/ModelTrainerArtifacts/x_test.csv \
+        --y-test artifacts/<ts>/ModelTrainerArtifacts/y_test.csv
+
+The report is printed and written to artifacts/reports/tflite_parity.json.
+"""
+import os
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+from tensorflow import keras
+from tensorflow.keras.utils import pad_sequences
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.tflite_backend import TFLITE_QUANTIZATIONS, TFLiteModel, save_tflite
+
+
+REPORT_PATH = os.path.join("artifacts", "reports", "tflite_parity.json")
+
+
+def latency_ms(model, matrix, batch_size, repeat):
+    batch = matrix[:batch_size]
+    model.predict(batch, batch_size=batch_size, verbose=0)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        model.predict(batch, batch_size=batch_size, verbose=0)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def score_all(model, matrix, batch_size):
+    return np.concatenate([model.predict(matrix[start:start + batch_size], batch_size=batch_size, verbose=0)[:, 0]
+                           for start in range(0, len(matrix), batch_size)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=os.path.join(PREDICTION_MODEL_DIR, MODEL_NAME))
+    parser.add_argument("--tokenizer", default=TOKENIZER_PATH)
+    parser.add_argument("--x-test", required=True)
+    parser.add_argument("--y-test", required=True)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.tokenizer, "rb") as handle:
+        tokenizer = pickle.load(handle)
+    texts = pd.read_csv(args.x_test, index_col=0)[TWEET].fillna("").astype(str).tolist()[:args.samples]
+    labels = pd.read_csv(args.y_test, index_col=0)[LABEL].to_numpy()[:args.samples]
+    matrix = pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=MAX_LEN)
+
+    keras_model = keras.models.load_model(args.model)
+    backends = {"h5": (keras_model, os.path.getsize(args.model))}
+    export_dir = tempfile.mkdtemp(prefix="tflite-bench-")
+    for quantization in TFLITE_QUANTIZATIONS:
+        path = save_tflite(keras_model, os.path.join(export_dir, f"model_{quantization}.tflite"), quantization)
+        backends[f"tflite-{quantization}"] = (TFLiteModel(path), os.path.getsize(path))
+
+    reference = score_all(keras_model, matrix, args.batch_size)
+    report = []
+    for name, (model, size) in backends.items():
+        started = time.perf_counter()
+        scores = score_all(model, matrix, args.batch_size)
+        seconds = time.perf_counter() - started
+        predicted = (scores > PREDICTION_THRESHOLD).astype(int)
+        report.append({
+            "backend": name,
+            "size_mib": size / 2 ** 20,
+            "latency_ms_batch_1": latency_ms(model, matrix, 1, args.repeat),
+            f"latency_ms_batch_{args.batch_size}": latency_ms(model, matrix, args.batch_size, max(1, args.repeat // 4)),
+            "throughput_texts_per_sec": len(matrix) / seconds,
+            "accuracy": float(np.mean(predicted == labels)),
+            "max_abs_score_diff_vs_h5": float(np.abs(scores - reference).max()),
+            "label_agreement_vs_h5": float(np.mean(predicted == (reference > PREDICTION_THRESHOLD))),
+        })
+
+    print(pd.DataFrame(report).to_string(index=False, float_format=lambda value: f"{value:.5g}"))
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+    with open(REPORT_PATH, "w") as handle:
+        json.dump({"samples": len(matrix), "results": report}, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
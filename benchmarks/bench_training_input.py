@@ -0,0 +1,95 @@
+"""
+Peak memory and time of the training input modes, without the model step.
+
+    python -m benchmarks.bench_training_input --dataset data/dataset.zip --rows 200000 1000000
+
+A transformed CSV of each size is built from the cleaned dataset tweets (repeated as
+needed, random labels). Each mode runs in a fresh process that prepares the input the
+way ModelTrainer does and walks one epoch of batches:
+
+    in_memory   spliting_data + tokenizing, then slices of the padded matrix
+    tf_data     build_sequence_cache, then one epoch of the streamed dataset
+    tf_data hit the same with the cache already built
+
+Peak RSS is reported above the process's RSS after imports.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from Sentiment_Analysis.constants import *
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(mode, csv_path, cache_dir):
+    from Sentiment_Analysis.components.model_trainer import ModelTrainer
+    from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig
+    from Sentiment_Analysis.entity.artifact_entity import DataTransformationArtifacts
+
+    config = ModelTrainerConfig()
+    config.SEQUENCE_CACHE_DIR = cache_dir
+    trainer = ModelTrainer(DataTransformationArtifacts(transformed_data_path=csv_path), config)
+    baseline = peak_rss_mib()
+    started = time.perf_counter()
+    batches = 0
+    if mode == "in_memory":
+        x_train, _, y_train, _ = trainer.spliting_data(csv_path)
+        matrix, _ = trainer.tokenizing(x_train)
+        labels = y_train.to_numpy()
+        # fit holds out the tail for validation_split and only iterates the rest
+        for start in range(0, int(len(matrix) * (1.0 - config.VALIDATION_SPLIT)), config.BATCH_SIZE):
+            matrix[start:start + config.BATCH_SIZE], labels[start:start + config.BATCH_SIZE]
+            batches += 1
+    else:
+        cache = trainer.sequence_cache(csv_path)
+        if cache.manifest is None:
+            trainer.build_sequence_cache(csv_path, cache)
+        for _ in cache.dataset("train", config.BATCH_SIZE, shuffle_buffer=config.SHUFFLE_BUFFER):
+            batches += 1
+    print(json.dumps({"seconds": time.perf_counter() - started, "peak_mib": peak_rss_mib() - baseline,
+                      "batches": batches}))
+
+
+def measure(mode, csv_path, cache_dir):
+    result = subprocess.run([sys.executable, "-m", "benchmarks.bench_training_input", "--child", mode, csv_path,
+                             cache_dir], check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--rows", type=int, nargs="+", default=[200000, 1000000])
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "CSV", "CACHE_DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+    from benchmarks.bench_text_normalizer import load_tweets
+
+    normalizer = TextNormalizer()
+    tweets = [normalizer.normalize(tweet) for tweet in load_tweets(args.dataset)]
+    work_dir = tempfile.mkdtemp(prefix="training-input-bench-")
+    print(f"{'rows':>9} {'mode':>12} {'seconds':>8} {'peak MiB':>9} {'batches':>8}")
+    for rows in args.rows:
+        csv_path = os.path.join(work_dir, f"final_{rows}.csv")
+        pd.DataFrame({LABEL: np.random.default_rng(0).integers(0, 2, rows),
+                      TWEET: [tweets[row % len(tweets)] for row in range(rows)]}).to_csv(csv_path, index=False)
+        cache_dir = os.path.join(work_dir, f"cache_{rows}")
+        for mode, label in (("in_memory", "in_memory"), ("tf_data", "tf_data"), ("tf_data", "tf_data hit")):
+            result = measure(mode, csv_path, cache_dir)
+            print(f"{rows:>9} {label:>12} {result['seconds']:>8.2f} {result['peak_mib']:>9.0f} {result['batches']:>8}")
+
+
+if __name__ == "__main__":
+    main()
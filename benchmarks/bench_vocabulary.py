@@ -0,0 +1,94 @@
+"""
+Parity, size and load-time comparison of the vocabulary artifact and the pickled Keras Tokenizer.
+
+    python -m benchmarks.bench_vocabulary --dataset data/dataset.zip
+
+Without --tokenizer, a Tokenizer(num_words=MAX_WORDS) is fitted on the cleaned dataset
+tweets. Exits non-zero if any text maps to different ids.
+"""
+import os
+import sys
+import time
+import pickle
+import argparse
+import tempfile
+import subprocess
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from benchmarks.bench_text_normalizer import load_tweets, EDGE_CASES
+
+
+COLD_LOAD_SCRIPTS = {
+    "pickle": "import pickle, sys; pickle.load(open(sys.argv[1], 'rb'))",
+    "vocabulary": "import sys; from Sentiment_Analysis.ml.vocabulary import Vocabulary; Vocabulary.load(sys.argv[1])",
+}
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def cold_load_seconds(kind, path):
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", COLD_LOAD_SCRIPTS[kind], path], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--tokenizer", help="existing tokenizer.pickle; fitted on the dataset if omitted")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    normalizer = TextNormalizer()
+    texts = [normalizer.normalize(tweet) for tweet in load_tweets(args.dataset)]
+    texts += [str(text) for text in EDGE_CASES] + ["Mixed CASE words!", "tab\tand\nnewline", "a,b;c"]
+
+    work_dir = tempfile.mkdtemp(prefix="vocabulary-bench-")
+    tokenizer_path = args.tokenizer
+    if tokenizer_path is None:
+        from tensorflow.keras.preprocessing.text import Tokenizer
+        tokenizer = Tokenizer(num_words=MAX_WORDS)
+        tokenizer.fit_on_texts(texts)
+        tokenizer_path = os.path.join(work_dir, TOKENIZER_PATH)
+        with open(tokenizer_path, "wb") as handle:
+            pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(tokenizer_path, "rb") as handle:
+        tokenizer = pickle.load(handle)
+    vocabulary_path = Vocabulary.from_tokenizer(tokenizer).save(os.path.join(work_dir, VOCABULARY_PATH))
+    vocabulary = Vocabulary.load(vocabulary_path)
+
+    expected = tokenizer.texts_to_sequences(texts)
+    actual = vocabulary.texts_to_sequences(texts)
+    mismatches = [text for text, old, new in zip(texts, expected, actual) if old != new]
+    lookup_mismatches = sum(vocabulary.lookup(vocabulary.text_to_word_sequence(text)).tolist() != ids
+                            for text, ids in zip(texts, expected))
+
+    def load_pickle():
+        with open(tokenizer_path, "rb") as handle:
+            pickle.load(handle)
+
+    print(f"words in tokenizer: {len(tokenizer.word_index)}  kept: {len(vocabulary.words)}  texts: {len(texts)}")
+    print(f"{'artifact':>12} {'size KiB':>10} {'load ms':>9} {'cold load s':>12}")
+    for kind, path, load in (("pickle", tokenizer_path, load_pickle),
+                             ("vocabulary", vocabulary_path, lambda: Vocabulary.load(vocabulary_path))):
+        print(f"{kind:>12} {os.path.getsize(path) / 1024:>10.1f} {best_of(load, args.repeat) * 1000:>9.2f} "
+              f"{cold_load_seconds(kind, path):>12.2f}")
+    print(f"texts_to_sequences: keras {best_of(lambda: tokenizer.texts_to_sequences(texts), args.repeat):.3f}s, "
+          f"vocabulary {best_of(lambda: vocabulary.texts_to_sequences(texts), args.repeat):.3f}s")
+
+    if mismatches or lookup_mismatches:
+        for text in mismatches[:10]:
+            print(f"MISMATCH {text!r}")
+        sys.exit(f"{len(mismatches)} texts_to_sequences and {lookup_mismatches} lookup results differ from Keras")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+VocabularyBuilder against Tokenizer.fit_on_texts at several corpus sizes.
+
+    python -m benchmarks.bench_vocabulary_builder --dataset data/dataset.zip --sizes 50000 500000 2000000
+
+Corpora of each size are built by repeating the cleaned dataset tweets, with every
+repetition after the first tagging a rotating share of its words so the vocabulary keeps
+growing and there are plenty of count ties. Exits non-zero if any word index differs
+import os
+from the Keras one.
+"""
+import sys
+import time
+import argparse
+from Sentiment_Analysis.constants import *
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.vocabulary_builder import VocabularyBuilder
+from benchmarks.bench_text_normalizer import load_tweets
+
+
+def make_corpus(tweets, size):
+    corpus = []
+    repetition = 0
+    while len(corpus) < size:
+        for row, tweet in enumerate(tweets[:size - len(corpus)]):
+            if repetition and row % 7 == repetition % 7:
+                tweet = " ".join(f"{word}{repetition}" for word in tweet.split(" "))
+            corpus.append(tweet)
+        repetition += 1
+    return corpus
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, ZIP_FILE_NAME))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50000, 500000, 2000000])
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, VOCABULARY_WORKERS}))
+    parser.add_argument("--shard-size", type=int, default=VOCABULARY_SHARD_SIZE)
+    args = parser.parse_args()
+
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    normalizer = TextNormalizer()
+    tweets = [normalizer.normalize(tweet) for tweet in load_tweets(args.dataset)]
+    failures = 0
+    print(f"{'texts':>9} {'words':>9} {'keras s':>8} " + " ".join(f"{f'{n} worker(s) s':>15}" for n in args.workers))
+    for size in args.sizes:
+        corpus = make_corpus(tweets, size)
+        tokenizer = Tokenizer(num_words=MAX_WORDS)
+        _, keras_seconds = timed(lambda: tokenizer.fit_on_texts(corpus))
+        expected_top = [word for word, index in sorted(tokenizer.word_index.items(), key=lambda item: item[1])
+                        if index < MAX_WORDS]
+
+        timings = []
+        for workers in args.workers:
+            builder = VocabularyBuilder(num_words=MAX_WORDS, workers=workers, shard_size=args.shard_size)
+            vocabulary, seconds = timed(lambda: builder.fit(corpus))
+            timings.append(seconds)
+            rebuilt = builder.to_tokenizer()
+            if (vocabulary.words != expected_top or rebuilt.word_index != tokenizer.word_index
+                    or list(rebuilt.word_counts.items()) != list(tokenizer.word_counts.items())):
+                failures += 1
+                print(f"MISMATCH at {size} texts with {workers} worker(s)")
+        print(f"{size:>9} {len(tokenizer.word_index):>9} {keras_seconds:>8.2f} "
+              + " ".join(f"{seconds:>9.2f} ({keras_seconds / seconds:3.0f}x)" for seconds in timings))
+
+    if failures:
+        sys.exit(f"{failures} vocabularies differ from Keras")
+
+
+if __name__ == "__main__":
+    main()
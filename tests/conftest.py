@@ -0,0 +1,52 @@
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Sentiment_Analysis.constants import TWEET
+
+
+MAX_LEN = 12
+VOCABULARY_SIZE = 30
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "dataset.zip")
+
+
+def random_sequences(count: int, seed: int = 0):
+    """Token id lists from empty to longer than MAX_LEN, without the padding id."""
+    rng = np.random.default_rng(seed)
+    return [rng.integers(1, VOCABULARY_SIZE, size=rng.integers(0, MAX_LEN + 6)).tolist() for _ in range(count)]
+
+
+@pytest.fixture(scope="session")
+def dataset_tweets():
+    """Every 20th raw tweet of the bundled dataset, from both of its CSV files."""
+    with zipfile.ZipFile(DATASET_PATH) as archive:
+        frames = [pd.read_csv(archive.open(name)) for name in sorted(archive.namelist()) if name.endswith(".csv")]
+    return [tweet for frame in frames for tweet in frame[TWEET].tolist()[::20]]
+
+
+@pytest.fixture(scope="session", params=[False, True], ids=["unmasked", "masked"])
+def tiny_model(request, tmp_path_factory):
+    """
+    (model, path to its .h5) for a random Embedding -> SpatialDropout1D -> LSTM -> Dense
+    classifier, with and without a masked embedding.
+    """
+    from tensorflow import keras
+
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(None,)),
+        keras.layers.Embedding(VOCABULARY_SIZE, 8, mask_zero=request.param),
+        keras.layers.SpatialDropout1D(0.2),
+        keras.layers.LSTM(6, dropout=0.2, recurrent_dropout=0.2),
+        keras.layers.Dense(1, activation="sigmoid"),
+    ])
+    # Larger than the initializers' weights, so the padding steps move the state noticeably
+    rng = np.random.default_rng(1)
+    model.set_weights([rng.normal(scale=0.7, size=weight.shape).astype(np.float32) for weight in model.get_weights()])
+
+    path = tmp_path_factory.mktemp("model") / "model.h5"
+    model.save(path)
+    return model, str(path)
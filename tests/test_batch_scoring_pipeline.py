@@ -0,0 +1,105 @@
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from Sentiment_Analysis.constants import BATCH_SCORING_PROGRESS_FILE_NAME, TWEET
+from Sentiment_Analysis.entity.config_entity import BatchScoringConfig
+from Sentiment_Analysis.pipeline.batch_scoring_pipeline import BatchScoringPipeline
+
+
+CHUNK_SIZE = 3
+FRAME = pd.DataFrame({TWEET: ["i love cats", "a quoted\nnewline, with a comma", "", "you idiot", "ünïcode café",
+                              "rt user love", "seven", "eight", "nine", "ten", "eleven"],
+                      "id": range(11)})
+
+
+class StaticRegistry:
+    def __init__(self, version):
+        self.version = version
+
+    def get(self):
+        return self
+
+
+class LengthScorer:
+    """Scores a cleaned text by its length, and counts the texts it scored."""
+
+    def __init__(self, version="v1"):
+        self.model_registry = StaticRegistry(version)
+        self.rows = 0
+
+    def predict_cleaned_batch(self, cleaned_texts, batch_size=None):
+        self.rows += len(cleaned_texts)
+        return [{"label": len(text) % 2, "score": len(text) / 100} for text in cleaned_texts]
+
+
+def write_input(tmp_path, extension):
+    path = tmp_path / f"tweets{extension}"
+    if extension == ".csv":
+        FRAME.to_csv(path, index=False)
+    elif extension == ".jsonl":
+        FRAME.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        # Row groups that don't line up with the chunks
+        pq.write_table(pa.Table.from_pandas(FRAME, preserve_index=False), path, row_group_size=4)
+    return str(path)
+
+
+def scoring(input_path, output_dir, prediction_pipeline):
+    config = BatchScoringConfig(input_path=input_path, output_dir=str(output_dir), chunk_size=CHUNK_SIZE,
+                                clean_workers=1)
+    return BatchScoringPipeline(config, prediction_pipeline=prediction_pipeline)
+
+
+def read_parts(output_dir):
+    return pd.concat([pd.read_parquet(path) for path in sorted(output_dir.glob("part-*.parquet"))],
+                     ignore_index=True)
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl", ".parquet"])
+def test_skipped_chunks_are_the_leading_chunks(tmp_path, extension):
+    pipeline = scoring(write_input(tmp_path, extension), tmp_path / "out", LengthScorer())
+    chunks = list(pipeline.read_chunks())
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 2]
+
+    for skip_chunks in range(len(chunks) + 1):
+        resumed = list(pipeline.read_chunks(skip_chunks=skip_chunks))
+        assert len(resumed) == len(chunks) - skip_chunks
+        for chunk, expected in zip(resumed, chunks[skip_chunks:]):
+            pd.testing.assert_frame_equal(chunk.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_resume_scores_only_the_missing_chunks(tmp_path):
+    input_path = write_input(tmp_path, ".csv")
+    output_dir = tmp_path / "out"
+    scoring(input_path, output_dir, LengthScorer()).run_pipeline()
+    expected = read_parts(output_dir)
+
+    # Interrupted after two chunks
+    progress_path = output_dir / BATCH_SCORING_PROGRESS_FILE_NAME
+    progress = json.loads(progress_path.read_text())
+    progress_path.write_text(json.dumps(dict(progress, completed_chunks=2)))
+    for part in sorted(output_dir.glob("part-*.parquet"))[2:]:
+        part.unlink()
+
+    scorer = LengthScorer()
+    artifacts = scoring(input_path, output_dir, scorer).run_pipeline()
+
+    assert artifacts.chunks_skipped == 2 and artifacts.chunks_written == 2
+    assert scorer.rows == len(FRAME) - 2 * CHUNK_SIZE
+    pd.testing.assert_frame_equal(read_parts(output_dir), expected)
+
+
+def test_another_model_version_starts_over(tmp_path):
+    input_path = write_input(tmp_path, ".csv")
+    output_dir = tmp_path / "out"
+    scoring(input_path, output_dir, LengthScorer("v1")).run_pipeline()
+
+    scorer = LengthScorer("v2")
+    artifacts = scoring(input_path, output_dir, scorer).run_pipeline()
+
+    assert artifacts.chunks_skipped == 0 and scorer.rows == len(FRAME)
+    assert json.loads((output_dir / BATCH_SCORING_PROGRESS_FILE_NAME).read_text())["model_version"] == "v2"
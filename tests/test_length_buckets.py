@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.ml.length_buckets import LengthBucketedPredictor
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.shared_weights import SharedWeightModel, export_shared_weights
+from conftest import MAX_LEN, random_sequences
+
+
+BOUNDS = (3, 6, 9)
+
+
+@pytest.fixture
+def shared_weight_model(tiny_model, tmp_path):
+    _, model_path = tiny_model
+    return SharedWeightModel(export_shared_weights(model_path, str(tmp_path), "v1"))
+
+
+def test_supports_the_served_architecture(tiny_model, shared_weight_model):
+    model, _ = tiny_model
+    assert LengthBucketedPredictor.supports(model)
+    assert LengthBucketedPredictor.supports(shared_weight_model)
+
+
+def test_predict_padded_matches_keras(tiny_model):
+    model, _ = tiny_model
+    padded = pad_sequences(random_sequences(64), maxlen=MAX_LEN)
+
+    scores = LengthBucketedPredictor(model, max_len=MAX_LEN, bounds=BOUNDS).predict_padded(padded)
+
+    np.testing.assert_allclose(scores, model.predict(padded, verbose=0)[:, 0], atol=1e-5)
+
+
+def test_predict_sequences_matches_keras(tiny_model):
+    model, _ = tiny_model
+    sequences = random_sequences(64, seed=3)
+
+    scores = LengthBucketedPredictor(model, max_len=MAX_LEN, bounds=BOUNDS).predict_sequences(sequences)
+
+    expected = model.predict(pad_sequences(sequences, maxlen=MAX_LEN), verbose=0)[:, 0]
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+
+def test_shared_weight_model_matches_keras(tiny_model, shared_weight_model):
+    model, _ = tiny_model
+    padded = pad_sequences(random_sequences(64, seed=4), maxlen=MAX_LEN)
+    expected = model.predict(padded, verbose=0)[:, 0]
+
+    np.testing.assert_allclose(shared_weight_model.predict(padded)[:, 0], expected, atol=1e-5)
+    scores = LengthBucketedPredictor(shared_weight_model, max_len=MAX_LEN, bounds=BOUNDS).predict_padded(padded)
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
@@ -0,0 +1,16 @@
+import warnings
+
+import pytest
+
+from Sentiment_Analysis.ml.model import ARCHITECTURES, ModelArchitecture
+
+
+@pytest.mark.parametrize("architecture", sorted(ARCHITECTURES))
+@pytest.mark.parametrize("input_length", [12, None])
+def test_get_model_builds_for_the_input_length(architecture, input_length):
+    with warnings.catch_warnings():
+        warnings.filterwarnings("error", message=".*input_length.*")
+        model = ModelArchitecture(architecture, max_words=30, embedding_dim=4, units=3).get_model(input_length)
+
+    assert model.input_shape == (None, input_length)
+    assert model.output_shape == (None, 1)
@@ -0,0 +1,44 @@
+import pytest
+
+from Sentiment_Analysis.exception import CustomException
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.pipeline.model_registry import ModelBundle, ModelRegistry
+
+
+class FakeRegistry(ModelRegistry):
+    """Builds a bundle of whatever version the model file currently holds, or fails."""
+
+    def __init__(self, version_file):
+        super().__init__(version_file=str(version_file))
+        self.file_version = "v1"
+        self.fail = False
+        self.loads = 0
+
+    def get_model_from_gcloud(self, force=False):
+        return self.model_path
+
+    def _build_bundle(self, model_path):
+        self.loads += 1
+        if self.fail:
+            raise OSError("model file is still being written")
+        return ModelBundle(model=None, tokenizer=None, text_normalizer=TextNormalizer(), model_path=model_path,
+                           version=self.file_version)
+
+
+def test_a_failed_follow_is_retried(tmp_path):
+    version_file = tmp_path / "version"
+    registry = FakeRegistry(version_file)
+    registry.load()
+    registry.file_version = "v2"
+    version_file.write_text("v2")
+
+    registry.fail = True
+    with pytest.raises(CustomException):
+        registry.follow_version_file()
+    assert registry.get().version == "v1"
+
+    registry.fail = False
+    assert registry.follow_version_file().version == "v2"
+    # Followed once: polling again does not reload
+    assert registry.follow_version_file() is None
+    assert registry.loads == 3
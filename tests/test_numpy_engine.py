@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.ml.numpy_engine import NumpyLSTMClassifier
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.shared_weights import export_shared_weights
+from conftest import MAX_LEN, random_sequences
+
+
+@pytest.fixture
+def classifier(tiny_model, tmp_path):
+    _, model_path = tiny_model
+    return NumpyLSTMClassifier(export_shared_weights(model_path, str(tmp_path), "v1"))
+
+
+@pytest.mark.parametrize("max_len", [MAX_LEN, 2 * MAX_LEN])
+def test_predict_matches_keras(tiny_model, classifier, max_len):
+    model, _ = tiny_model
+    padded = pad_sequences(random_sequences(64), maxlen=max_len)
+
+    expected = model.predict(padded, verbose=0)
+    scores = classifier.predict(padded)
+
+    assert scores.shape == (len(padded), 1)
+    np.testing.assert_allclose(scores, expected, atol=1e-5)
+
+
+def test_concurrent_predictions_at_growing_lengths(tiny_model, classifier):
+    model, _ = tiny_model
+    sequences = random_sequences(16, seed=2)
+    batches = [pad_sequences(sequences, maxlen=max_len) for max_len in range(1, 4 * MAX_LEN)]
+    expected = [model.predict(padded, verbose=0) for padded in batches]
+
+    # Every batch is longer than the pad states computed so far, so the threads extend them concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scores = list(executor.map(classifier.predict, batches))
+
+    for batch_scores, batch_expected in zip(scores, expected):
+        np.testing.assert_allclose(batch_scores, batch_expected, atol=1e-5)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.constants import MAX_LEN
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.text_encoder import TextEncoder
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+from Sentiment_Analysis.pipeline.model_registry import ModelBundle
+from Sentiment_Analysis.pipeline.prediction_cache import PredictionCache
+from Sentiment_Analysis.pipeline.prediction_pipeline import PredictionPipeline
+
+
+TEXTS = ["RT @user: I love these cats!!", "rt USER i love these cats", "you are a dumb idiot http://t.co/x", "",
+         "cats loving love"]
+
+
+class CountingModel:
+    """Scores a padded row by its ids, and counts the rows it was asked to score."""
+
+    def __init__(self):
+        self.rows = 0
+
+    def predict(self, padded, batch_size=None, verbose=0):
+        self.rows += len(padded)
+        weights = np.arange(1, padded.shape[1] + 1)
+        return (1 / (1 + (padded * weights).sum(axis=1, keepdims=True) % 7)).astype(np.float32)
+
+
+class StaticRegistry:
+    def __init__(self, bundle):
+        self.bundle = bundle
+
+    def get(self):
+        return self.bundle
+
+    def add_swap_listener(self, listener):
+        pass
+
+    def add_warm_up_hook(self, hook):
+        pass
+
+
+@pytest.fixture
+def bundle():
+    normalizer = TextNormalizer()
+    vocabulary = Vocabulary(["love", "cat", "dumb", "idiot", "rt", "user"], filters="")
+    return ModelBundle(model=CountingModel(), tokenizer=vocabulary, text_normalizer=normalizer, model_path="",
+                       version="v1", text_encoder=TextEncoder(normalizer, vocabulary))
+
+
+def test_scores_match_encoding_every_text(bundle):
+    pipeline = PredictionPipeline(model_registry=StaticRegistry(bundle), prediction_cache=PredictionCache())
+    cleaned = [bundle.text_normalizer.normalize(text) for text in TEXTS]
+    expected = CountingModel().predict(pad_sequences(bundle.tokenizer.texts_to_sequences(cleaned), maxlen=MAX_LEN))[:, 0]
+
+    scores = [prediction["score"] for prediction in pipeline.predict_batch(TEXTS, batch_size=2)]
+
+    np.testing.assert_allclose(scores, expected)
+    assert pipeline.predict_cleaned_batch(cleaned) == pipeline.predict_batch(TEXTS)
+
+
+def test_cache_hits_skip_encoding_and_the_model(bundle, monkeypatch):
+    pipeline = PredictionPipeline(model_registry=StaticRegistry(bundle), prediction_cache=PredictionCache())
+    first = pipeline.predict_batch(TEXTS)
+    # The second tweet cleans to the same text as the first, so it was scored once
+    assert bundle.model.rows == len(TEXTS) - 1
+
+    def encode_cleaned_batch(*args, **kwargs):
+        raise AssertionError("a cached text was encoded again")
+
+    monkeypatch.setattr(bundle.text_encoder, "encode_cleaned_batch", encode_cleaned_batch)
+    assert pipeline.predict_batch(TEXTS) == first
+    assert bundle.model.rows == len(TEXTS) - 1
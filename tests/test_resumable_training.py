@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.ml.resumable_training import ResumableTraining
+
+
+EPOCHS = 5
+
+
+def training_data():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(64, 4)).astype(np.float32)
+    return x, (x.sum(axis=1) > 0).astype(np.float32)
+
+
+def compiled_model():
+    from tensorflow import keras
+
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([keras.Input(shape=(4,)), keras.layers.Dense(1, activation="sigmoid")])
+    model.compile(optimizer="adam", loss="binary_crossentropy")
+    return model
+
+
+def fit(model, resumable_training, extra_callbacks=()):
+    x, y = training_data()
+    return model.fit(x, y, epochs=EPOCHS, initial_epoch=resumable_training.initial_epoch(EPOCHS), batch_size=16,
+                     validation_split=0.25, callbacks=resumable_training.callbacks() + list(extra_callbacks),
+                     verbose=0)
+
+
+def test_resumes_after_the_last_finished_epoch(tmp_path):
+    from tensorflow import keras
+
+    class Crash(keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            if epoch == 1:
+                raise RuntimeError("evicted")
+
+    with pytest.raises(RuntimeError):
+        fit(compiled_model(), ResumableTraining(str(tmp_path)), [Crash()])
+
+    resumed = ResumableTraining(str(tmp_path))
+    assert resumed.initial_epoch(EPOCHS) == 2
+    history = fit(compiled_model(), resumed)
+
+    assert history.epoch == [2, 3, 4]
+    assert resumed.report(EPOCHS)["epochs_completed"] == EPOCHS
+
+
+def test_a_run_that_stopped_early_trains_no_further(tmp_path):
+    # No epoch can improve val_loss by min_delta, so the run stops after epoch 2 of 5
+    first = ResumableTraining(str(tmp_path), patience=1, min_delta=1e9)
+    model = compiled_model()
+    fit(model, first)
+    assert first.stopped_early and len(first.epoch_seconds) == 2
+    best_weights = [weight.copy() for weight in model.get_weights()]
+
+    resumed = ResumableTraining(str(tmp_path), patience=1, min_delta=1e9)
+    assert resumed.initial_epoch(EPOCHS) == EPOCHS
+    model = compiled_model()
+    history = fit(model, resumed)
+
+    assert history.epoch == []
+    for weight, best in zip(model.get_weights(), best_weights):
+        np.testing.assert_array_equal(weight, best)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Sentiment_Analysis.constants import LABEL, TWEET
+from Sentiment_Analysis.entity.config_entity import ModelTrainerConfig
+from Sentiment_Analysis.ml.sequence import pad_sequences
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.vocabulary_builder import VocabularyBuilder
+from Sentiment_Analysis.pipeline.sweep_pipeline import SweepData
+
+
+LARGEST_MAX_WORDS = 400
+
+
+@pytest.fixture(scope="module")
+def sweep(tmp_path_factory, dataset_tweets):
+    directory = tmp_path_factory.mktemp("sweep")
+    normalizer = TextNormalizer()
+    # Every fifth row is empty, some as NaN once written to the CSV
+    tweets = ["" if row % 5 == 0 else normalizer.normalize(tweet) for row, tweet in enumerate(dataset_tweets)]
+    csv_path = str(directory / "transformed.csv")
+    pd.DataFrame({TWEET: tweets, LABEL: np.arange(len(tweets)) % 2}).to_csv(csv_path, index=False)
+
+    config = ModelTrainerConfig()
+    config.VOCABULARY_WORKERS = 1
+    data = SweepData(str(directory / "data"))
+    data.build(csv_path, config, max_words=LARGEST_MAX_WORDS)
+    return data, csv_path, config
+
+
+def expected_padded(csv_path, config, max_words, max_len):
+    from Sentiment_Analysis.components.model_trainer import ModelTrainer
+
+    x_train, _, y_train, _ = ModelTrainer(None, config).spliting_data(csv_path)
+    texts = x_train.fillna("").astype(str)
+    vocabulary = VocabularyBuilder(num_words=max_words, workers=1).fit(texts)
+    padded = pad_sequences(vocabulary.texts_to_sequences(texts), maxlen=max_len)
+    split_at = int(len(padded) * (1.0 - config.VALIDATION_SPLIT))
+    labels = y_train.to_numpy(dtype=np.int8)
+    return {"train": (padded[:split_at], labels[:split_at]), "validation": (padded[split_at:], labels[split_at:])}
+
+
+@pytest.mark.parametrize("max_words,max_len", [(LARGEST_MAX_WORDS, 30), (LARGEST_MAX_WORDS, 4), (50, 12), (2, 3)])
+def test_padded_matches_a_vocabulary_of_that_size(sweep, max_words, max_len):
+    data, csv_path, config = sweep
+    expected = expected_padded(csv_path, config, max_words, max_len)
+
+    for split in SweepData.SPLITS:
+        matrix, labels = data.padded(split, max_words, max_len)
+        expected_matrix, expected_labels = expected[split]
+        assert not expected_matrix.any(axis=1).all()
+        np.testing.assert_array_equal(matrix, expected_matrix)
+        np.testing.assert_array_equal(labels, expected_labels)
@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from Sentiment_Analysis.ml.text_cleaning import clean_in_chunks
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+
+
+TWEETS = [
+    "RT @user: Running to the [store] <b>NOW</b> http://t.co/abc www.example.com!!",
+    "",
+    math.nan,
+    None,
+    "   ",
+    "tab\tseparated\nnew line 4ever h3llo 2017",
+    "naïve café Ünïcode İstanbul ǅ â\x80¦ #2017in3words",
+    "http://a\x0bb www.x\x1cy a\x1fb x_1 _9_ a__b",
+    "'quoted' \"double\" {braces} ~tilde~ back\\slash",
+    12345,
+    "the the the and of",
+]
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+def test_normalize_many_matches_normalize(normalizer):
+    assert normalizer.normalize_many(TWEETS) == [normalizer.normalize(tweet) for tweet in TWEETS]
+    assert normalizer.clean_many(TWEETS) == [normalizer.clean(tweet) for tweet in TWEETS]
+    assert normalizer.normalize_many([]) == []
+
+
+def test_parallel_cleaning_matches_sequential(normalizer):
+    tweets = TWEETS * 3
+    sequential = [normalizer.normalize(tweet) for tweet in tweets]
+
+    # Chunks of 4 rows over 2 spawned workers, so NaN and empty rows land in every position
+    assert clean_in_chunks(tweets, chunk_size=4, workers=2) == sequential
+    assert clean_in_chunks(tweets, chunk_size=len(tweets), workers=2, text_normalizer=normalizer) == sequential
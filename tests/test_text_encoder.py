@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.ml.text_encoder import TextEncoder
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+
+
+MAX_LEN = 8
+TEXTS = [
+    "RT @user: Running to the [store] <b>NOW</b> http://t.co/abc!!",
+    "naïve café Ünïcode â\x80¦ #love #loving #lovely",
+    "zzzunseen qqqwords only",
+    "",
+    None,
+    "one two three four five six seven eight nine ten eleven twelve thirteen",
+]
+
+
+@pytest.fixture(scope="module")
+def normalizer():
+    return TextNormalizer()
+
+
+@pytest.fixture(scope="module", params=[None, "<unk>"], ids=["no_oov", "oov"])
+def fitted(request, normalizer, dataset_tweets):
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    # Few enough words that most tweets hold out-of-vocabulary words
+    tokenizer = Tokenizer(num_words=200, oov_token=request.param)
+    tokenizer.fit_on_texts([normalizer.normalize(tweet) for tweet in dataset_tweets])
+    return tokenizer, TextEncoder(normalizer, Vocabulary.from_tokenizer(tokenizer), max_len=MAX_LEN)
+
+
+def keras_encode(tokenizer, cleaned_texts):
+    from tensorflow.keras.utils import pad_sequences
+
+    return pad_sequences(tokenizer.texts_to_sequences(cleaned_texts), maxlen=MAX_LEN)
+
+
+def test_encode_batch_matches_keras(fitted, normalizer, dataset_tweets):
+    tokenizer, encoder = fitted
+    texts = TEXTS + dataset_tweets
+    cleaned_texts = [normalizer.normalize(text) for text in texts]
+    expected = keras_encode(tokenizer, cleaned_texts)
+    lengths = [len(ids) for ids in tokenizer.texts_to_sequences(cleaned_texts)]
+    assert max(lengths) > MAX_LEN and min(lengths) == 0
+
+    np.testing.assert_array_equal(encoder.encode_batch(texts), expected)
+    np.testing.assert_array_equal(encoder.encode_cleaned_batch(cleaned_texts), expected)
+
+
+def test_reused_buffer_is_cleared_between_batches(fitted, normalizer):
+    tokenizer, encoder = fitted
+    buffer = encoder.allocate(len(TEXTS))
+    encoder.encode_batch(TEXTS[::-1], out=buffer)
+
+    padded = encoder.encode_batch(TEXTS[:3], out=buffer)
+
+    np.testing.assert_array_equal(padded, keras_encode(tokenizer, [normalizer.normalize(text) for text in TEXTS[:3]]))
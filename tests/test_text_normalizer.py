@@ -0,0 +1,54 @@
+import re
+import math
+import string
+
+import pytest
+
+from Sentiment_Analysis.ml.stopwords import load_stopwords
+from Sentiment_Analysis.ml.text_normalizer import TextNormalizer
+
+
+EDGE_CASES = [
+    "", "   ", "\n", "a\nb", "[link]x", "[a\nb]", "ht[x]tp://a.b c", "<<b>>bold</b>>", "<a\nb>",
+    "www.x.com/y?z=1 ok", "HTTPS://X.COM", "http://a\x0bb www.x\x1cy", "abc123 4you u2 ٣٤ x_1 _9_",
+    "don't stop!! \"quoted\" {braces} back\\slash ~tilde~", "\t tab\tbetween ", "I I me me the THE",
+    "running runs ran generously", "ünïcödé  naïve café İstanbul ǅ â\x80¦ ð\x9f\x98©", 12345, None, math.nan,
+]
+
+
+def legacy_clean(words):
+    """concat_data_cleaning as it was before TextNormalizer."""
+    import nltk
+
+    stemmer = nltk.SnowballStemmer("english")
+    stopword = load_stopwords("english")
+    words = str(words).lower()
+    words = re.sub(r'\[.*?\]', '', words)
+    words = re.sub(r'https?://\S+|www\.\S+', '', words)
+    words = re.sub(r'<.*?>+', '', words)
+    words = re.sub(r'[%s]' % re.escape(string.punctuation), '', words)
+    words = re.sub(r'\n', '', words)
+    words = re.sub(r'\w*\d\w*', '', words)
+    words = [word for word in words.split(' ') if word not in stopword]
+    words = " ".join(words)
+    words = [stemmer.stem(word) for word in words.split(' ')]
+    return " ".join(words)
+
+
+def test_normalize_matches_legacy_cleaning(dataset_tweets):
+    normalizer = TextNormalizer()
+    texts = EDGE_CASES + dataset_tweets
+
+    assert [normalizer.normalize(text) for text in texts] == [legacy_clean(text) for text in texts]
+    # Memoized stems give the same output the second time round
+    assert [normalizer.normalize(text) for text in EDGE_CASES] == [legacy_clean(text) for text in EDGE_CASES]
+
+
+def test_bundled_stopwords_are_nltks():
+    from nltk.corpus import stopwords
+
+    try:
+        nltk_stopwords = set(stopwords.words("english"))
+    except LookupError:
+        pytest.skip("NLTK stopwords corpus is not downloaded")
+    assert load_stopwords("english") == nltk_stopwords
@@ -0,0 +1,96 @@
+import os
+import sys
+import types
+import pickle
+
+import numpy as np
+import pytest
+
+from Sentiment_Analysis.ml.vocabulary import Vocabulary
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Ties in the word counts ("b"/"c", "apple"/"zebra"/...) must break the way Keras breaks them
+CORPUS = [
+    "the cat sat on the mat",
+    "The dog ate the cat's food!",
+    "zebra apple zebra apple b c",
+    "c b mango Ünïcode naïve café",
+    "tab\tseparated and\nnew lines, commas;semicolons",
+    "",
+    "the the the",
+]
+QUERIES = CORPUS + ["unseen words only", "Cat MAT zebra", "a-very-long-word-that-is-wider-than-every-key-in-the-vocabulary",
+                    "café naïve unseen", "mat\0",
+                    # Longer than a key, but with a key as prefix: must not match after truncation
+                    "theory catalogue zebras applesauce"]
+
+
+def fitted_tokenizer(num_words=None, oov_token=None):
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    tokenizer = Tokenizer(num_words=num_words, oov_token=oov_token)
+    tokenizer.fit_on_texts(CORPUS)
+    return tokenizer
+
+
+@pytest.mark.parametrize("num_words", [None, 8])
+@pytest.mark.parametrize("oov_token", [None, "<unk>"])
+def test_texts_to_sequences_matches_keras(num_words, oov_token, tmp_path):
+    tokenizer = fitted_tokenizer(num_words, oov_token)
+    vocabulary = Vocabulary.from_tokenizer(tokenizer)
+    loaded = Vocabulary.load(vocabulary.save(str(tmp_path / "vocabulary.npy")))
+
+    expected = tokenizer.texts_to_sequences(QUERIES)
+    assert vocabulary.texts_to_sequences(QUERIES) == expected
+    assert loaded.texts_to_sequences(QUERIES) == expected
+    for text, ids in zip(QUERIES, expected):
+        assert loaded.lookup(loaded.text_to_word_sequence(text)).tolist() == ids
+
+
+def test_save_load_roundtrip(tmp_path):
+    tokenizer = fitted_tokenizer(num_words=8)
+    vocabulary = Vocabulary.from_tokenizer(tokenizer)
+    loaded = Vocabulary.load(vocabulary.save(str(tmp_path / "vocabulary.npy")))
+
+    ranked = [word for word, index in sorted(tokenizer.word_index.items(), key=lambda item: item[1]) if index < 8]
+    assert loaded.words == vocabulary.words == ranked
+    assert loaded.num_words == vocabulary.num_words == 8
+    assert loaded.fingerprint == vocabulary.fingerprint
+    # The lookup arrays are views of the mapped file, not copies
+    for keys, ids in loaded._groups.values():
+        assert isinstance(keys, np.memmap) and isinstance(ids, np.memmap)
+
+
+def test_load_rejects_a_truncated_file(tmp_path):
+    path = Vocabulary.from_tokenizer(fitted_tokenizer()).save(str(tmp_path / "vocabulary.npy"))
+    np.save(path, np.load(path)[:-3])
+
+    with pytest.raises(ValueError):
+        Vocabulary.load(path)
+
+
+def test_converts_a_keras_2_pickle_without_keras(tmp_path, monkeypatch):
+    tokenizer = fitted_tokenizer(num_words=8, oov_token="<unk>")
+    # Pickled under the Keras 2 module path, which Keras 3 no longer has
+    keras_2_text = types.ModuleType("keras.preprocessing.text")
+    keras_2_text.Tokenizer = type("Tokenizer", (), {"__module__": "keras.preprocessing.text"})
+    monkeypatch.setitem(sys.modules, "keras.preprocessing.text", keras_2_text)
+    pickled = keras_2_text.Tokenizer()
+    pickled.__dict__.update(tokenizer.__dict__)
+    path = tmp_path / "tokenizer.pickle"
+    path.write_bytes(pickle.dumps(pickled))
+    monkeypatch.delitem(sys.modules, "keras.preprocessing.text")
+
+    converted = Vocabulary.from_tokenizer_pickle(str(path))
+
+    assert converted.fingerprint == Vocabulary.from_tokenizer(tokenizer).fingerprint
+
+
+def test_shipped_vocabulary_matches_the_shipped_tokenizer():
+    shipped = Vocabulary.load(os.path.join(REPO_DIR, "vocabulary.npy"))
+    converted = Vocabulary.from_tokenizer_pickle(os.path.join(REPO_DIR, "tokenizer.pickle"))
+
+    assert shipped.fingerprint == converted.fingerprint
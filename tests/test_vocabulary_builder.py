@@ -0,0 +1,48 @@
+import pytest
+
+from Sentiment_Analysis.ml.vocabulary_builder import VocabularyBuilder
+
+
+# Every word occurs twice, and each pair of shards (shard_size=2) holds first occurrences
+# that tie with words first seen in an earlier or later shard
+CORPUS = [
+    "zebra apple",
+    "mango kiwi",
+    "kiwi Apple, zebra!",
+    "mango café",
+    "",
+    "naïve CAFÉ naïve",
+    "pear pear plum",
+    "plum fig fig",
+]
+QUERIES = CORPUS + ["unseen zebra words", "fig pear plum kiwi mango apple zebra café naïve"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("num_words", [None, 4])
+def test_sharded_counts_match_keras(workers, num_words):
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    keras_tokenizer = Tokenizer(num_words=num_words)
+    keras_tokenizer.fit_on_texts(CORPUS)
+    builder = VocabularyBuilder(num_words=num_words, workers=workers, shard_size=2)
+
+    vocabulary = builder.fit(CORPUS)
+
+    assert list(builder.word_counts.items()) == list(keras_tokenizer.word_counts.items())
+    assert builder.ranked_words() == list(keras_tokenizer.word_index)
+    assert vocabulary.texts_to_sequences(QUERIES) == keras_tokenizer.texts_to_sequences(QUERIES)
+    tokenizer = builder.to_tokenizer()
+    assert tokenizer.word_index == keras_tokenizer.word_index
+    assert tokenizer.texts_to_sequences(QUERIES) == keras_tokenizer.texts_to_sequences(QUERIES)
+
+
+def test_dataset_vocabulary_matches_keras(dataset_tweets):
+    from tensorflow.keras.preprocessing.text import Tokenizer
+
+    keras_tokenizer = Tokenizer(num_words=500)
+    keras_tokenizer.fit_on_texts(dataset_tweets)
+
+    vocabulary = VocabularyBuilder(num_words=500, workers=2, shard_size=97).fit(dataset_tweets)
+
+    assert vocabulary.texts_to_sequences(dataset_tweets) == keras_tokenizer.texts_to_sequences(dataset_tweets)